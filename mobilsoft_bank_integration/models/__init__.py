@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from . import bank_connector
+from . import bank_connector_token
 from . import bank_connector_garanti
 from . import bank_connector_ziraat
 from . import bank_connector_qnb
@@ -1,10 +1,50 @@
 # -*- coding: utf-8 -*-
 
-from odoo import fields, models
+from collections import defaultdict
+import logging
+import re
+
+from odoo import _, fields, models
+from odoo.exceptions import UserError
+
+_logger = logging.getLogger(__name__)
+
+# Reference-like chunks of free text: invoice numbers, move names, ETTNs
+REFERENCE_RE = re.compile(r'[A-Za-z0-9][A-Za-z0-9/_.\-]{4,}[A-Za-z0-9]')
+
+# Open item fields whose references are matched against payment_ref
+# (qnb_ettn only exists when the QNB e-invoice module is installed)
+MATCH_REFERENCE_FIELDS = ('name', 'ref', 'payment_reference', 'qnb_ettn')
+
+# Score weights of the match criteria (sum = 1.0)
+MATCH_WEIGHT_REFERENCE = 0.5
+MATCH_WEIGHT_AMOUNT = 0.35
+MATCH_WEIGHT_PARTNER = 0.15
+
+
+def _reference_tokens(*texts):
+    """Normalized reference tokens: alphanumerics only, upper-cased.
+
+    ``INV/2026/00012`` becomes ``INV202600012`` and an ETTN loses its
+    dashes, so the same reference matches however it was typed. Pure
+    numbers shorter than 10 digits (dates, amounts) are ignored.
+    """
+    tokens = set()
+    for text in texts:
+        if not text:
+            continue
+        for chunk in REFERENCE_RE.findall(text):
+            token = re.sub(r'[^A-Za-z0-9]', '', chunk).upper()
+            if len(token) < 6 or not any(c.isdigit() for c in token):
+                continue
+            if token.isdigit() and len(token) < 10:
+                continue
+            tokens.add(token)
+    return tokens
 
 
 class AccountBankStatementLine(models.Model):
-    """Extend statement line with bank import reference for deduplication."""
+    """Extend statement line with bank import reference and batch matching."""
 
     _inherit = 'account.bank.statement.line'
 
@@ -14,8 +54,217 @@ class AccountBankStatementLine(models.Model):
         copy=False,
         help='Mükerrer önleme için benzersiz banka işlem referansı',
     )
+    bank_match_line_id = fields.Many2one(
+        'account.move.line',
+        string='Önerilen Eşleşme',
+        copy=False,
+        help='Otomatik eşleştiricinin eşik altında kalan en iyi adayı',
+    )
+    bank_match_score = fields.Float(
+        string='Eşleşme Skoru', copy=False, digits=(3, 2),
+    )
 
     _unique_bank_import_ref = models.Constraint(
         'UNIQUE(bank_import_ref)',
         'Bu banka işlemi zaten içeri aktarılmış!',
     )
+
+    # -------------------------------------------------------------------------
+    # Batch Matching
+    # -------------------------------------------------------------------------
+
+    def _bank_auto_match(self, threshold, match_cache=None):
+        """Match unreconciled lines against open receivables/payables.
+
+        Open items of the lines' companies are loaded once and indexed by
+        partner, residual amount and reference tokens. A sync run passes
+        the same ``match_cache`` dict for all its accounts: the index is
+        built on the first call and reused, and items reconciled by an
+        earlier batch are skipped. Each line only
+        scores the candidates found through those indexes: reference token
+        in ``payment_ref`` (0.5), equal residual (0.35), same partner
+        (0.15). A unique best candidate scoring at least ``threshold`` is
+        reconciled; otherwise the best candidate is stored as a suggestion.
+
+        Returns:
+            dict: ``{'reconciled': int, 'suggested': int}``
+        """
+        lines = self.filtered(lambda l: not l.is_reconciled and l.amount)
+        result = {'reconciled': 0, 'suggested': 0}
+        if not lines:
+            return result
+
+        if match_cache is None:
+            match_cache = {}
+        index_key = tuple(sorted(lines.company_id.ids))
+        if index_key not in match_cache:
+            match_cache[index_key] = self._bank_match_index(lines.company_id)
+        items, by_token, by_partner, by_amount = match_cache[index_key]
+        consumed = match_cache.setdefault('consumed', set())
+
+        for line in lines:
+            line_tokens = _reference_tokens(line.payment_ref, line.ref)
+            amount_key = (line.company_id.id, round(abs(line.amount), 2))
+            candidate_ids = set(by_amount.get(amount_key, ()))
+            if line.partner_id:
+                candidate_ids.update(
+                    by_partner.get((line.company_id.id, line.partner_id.id), ()),
+                )
+            for token in line_tokens:
+                candidate_ids.update(by_token.get(token, ()))
+
+            scored = []
+            for item_id in candidate_ids - consumed:
+                item = items[item_id]
+                if item['company_id'] != line.company_id.id:
+                    continue
+                residual = self._bank_match_residual(line, item)
+                # Money in settles receivables, money out settles payables
+                if residual is None or residual * line.amount <= 0:
+                    continue
+                score = 0.0
+                if line_tokens & item['tokens']:
+                    score += MATCH_WEIGHT_REFERENCE
+                if line.currency_id.is_zero(abs(residual) - abs(line.amount)):
+                    score += MATCH_WEIGHT_AMOUNT
+                if line.partner_id and line.partner_id.id == item['partner_id']:
+                    score += MATCH_WEIGHT_PARTNER
+                scored.append((score, item_id))
+
+            if not scored:
+                continue
+            scored.sort(reverse=True)
+            best_score, best_id = scored[0]
+            unique = len(scored) == 1 or scored[1][0] < best_score
+            counterpart = self.env['account.move.line'].browse(best_id)
+
+            if unique and best_score >= threshold:
+                try:
+                    with self.env.cr.savepoint():
+                        reconciled = line._bank_reconcile_with(counterpart)
+                except Exception as e:
+                    _logger.warning(
+                        'Auto-reconcile failed [%s]: %s',
+                        line.bank_import_ref or line.id, e,
+                    )
+                    reconciled = False
+                if reconciled:
+                    consumed.add(best_id)
+                    result['reconciled'] += 1
+                    continue
+
+            if (line.bank_match_line_id.id, line.bank_match_score) != (
+                best_id, best_score,
+            ):
+                line.write({
+                    'bank_match_line_id': best_id,
+                    'bank_match_score': best_score,
+                })
+                result['suggested'] += 1
+
+        _logger.info(
+            'Bank auto-match: %d reconciled, %d suggested (%d lines)',
+            result['reconciled'], result['suggested'], len(lines),
+        )
+        return result
+
+    def _bank_match_index(self, companies):
+        """Load open receivable/payable items once and index them.
+
+        Returns:
+            tuple: ``(items, by_token, by_partner, by_amount)`` where
+            ``items`` maps id to a plain dict and the indexes map a token,
+            ``(company, partner)`` or ``(company, abs residual)`` to ids.
+        """
+        MoveLine = self.env['account.move.line']
+        Move = self.env['account.move']
+        ref_fields = [f for f in MATCH_REFERENCE_FIELDS if f in Move._fields]
+
+        open_items = MoveLine.search_fetch(
+            [
+                ('company_id', 'in', companies.ids),
+                ('account_type', 'in', ('asset_receivable', 'liability_payable')),
+                ('parent_state', '=', 'posted'),
+                ('reconciled', '=', False),
+                ('amount_residual', '!=', 0),
+            ],
+            [
+                'company_id', 'partner_id', 'move_id', 'currency_id',
+                'amount_residual', 'amount_residual_currency',
+            ],
+        )
+        open_items.move_id.fetch(ref_fields)
+
+        items = {}
+        by_token = defaultdict(list)
+        by_partner = defaultdict(list)
+        by_amount = defaultdict(list)
+        for item in open_items:
+            move = item.move_id
+            tokens = _reference_tokens(*(move[f] for f in ref_fields))
+            items[item.id] = {
+                'company_id': item.company_id.id,
+                'partner_id': item.partner_id.id,
+                'currency_id': item.currency_id.id,
+                'amount_residual': item.amount_residual,
+                'amount_residual_currency': item.amount_residual_currency,
+                'tokens': tokens,
+            }
+            for token in tokens:
+                by_token[token].append(item.id)
+            if item.partner_id:
+                by_partner[(item.company_id.id, item.partner_id.id)].append(item.id)
+            by_amount[(item.company_id.id, round(abs(item.amount_residual), 2))].append(item.id)
+            if item.currency_id != item.company_id.currency_id:
+                by_amount[
+                    (item.company_id.id, round(abs(item.amount_residual_currency), 2))
+                ].append(item.id)
+        return items, by_token, by_partner, by_amount
+
+    def _bank_match_residual(self, line, item):
+        """Residual of ``item`` in the currency of the statement line."""
+        if item['currency_id'] == line.currency_id.id:
+            return item['amount_residual_currency']
+        if line.currency_id == line.company_id.currency_id:
+            return item['amount_residual']
+        return None
+
+    def _bank_reconcile_with(self, counterpart):
+        """Post the suspense amount to ``counterpart``'s account and reconcile.
+
+        Returns:
+            bool: False when the line is already (partially) processed
+        """
+        self.ensure_one()
+        _liquidity_lines, suspense_lines, other_lines = self._seek_for_lines()
+        if other_lines or len(suspense_lines) != 1:
+            return False
+
+        move = self.move_id
+        move.button_draft()
+        suspense_lines.with_context(skip_account_move_synchronization=True).write({
+            'account_id': counterpart.account_id.id,
+            'partner_id': counterpart.partner_id.id,
+        })
+        move.action_post()
+        self.with_context(skip_account_move_synchronization=True).write({
+            'partner_id': self.partner_id.id or counterpart.partner_id.id,
+            'bank_match_line_id': False,
+            'bank_match_score': 0.0,
+        })
+        (suspense_lines | counterpart).reconcile()
+        return True
+
+    def action_apply_bank_match(self):
+        """Reconcile the lines with their suggested open items."""
+        for line in self.filtered('bank_match_line_id'):
+            if line.bank_match_line_id.reconciled:
+                raise UserError(
+                    _('Önerilen kalem zaten kapatılmış: %s')
+                    % line.bank_match_line_id.display_name
+                )
+            if not line._bank_reconcile_with(line.bank_match_line_id):
+                raise UserError(
+                    _('Satır zaten eşleştirilmiş: %s') % line.payment_ref
+                )
+        return True
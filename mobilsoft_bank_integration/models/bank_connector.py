@@ -1,15 +1,56 @@
 # -*- coding: utf-8 -*-
 
-from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta, timezone
 import logging
+import threading
 
+import psycopg2
 import requests
+from requests.adapters import HTTPAdapter
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+from . import bank_connector_token as token_cache
+from .bank_connector_token import (
+    BankTokenError, TOKEN_DROPPED_KEY, TOKEN_LOCK_NAMESPACE,
+)
 
 _logger = logging.getLogger(__name__)
 
+# How far back an account without a transaction cursor is fetched
+TX_INITIAL_SYNC_DAYS = 30
+
+# Concurrent downloads of the cron sync (all banks and accounts together)
+BANK_SYNC_WORKERS = 8
+
+# Per-process keep-alive sessions: (dbname, connector id) -> requests.Session
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_session(key):
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=BANK_SYNC_WORKERS)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _sessions[key] = session
+        return session
+
+
+def _fetch_json(session, method, url, headers, params=None):
+    """HTTP call of the parallel fetch phase; runs in a worker, no ORM."""
+    response = session.request(
+        method=method, url=url, headers=headers, params=params, timeout=30,
+    )
+    response.raise_for_status()
+    return response.json()
+
 
 class BankConnector(models.Model):
     """Turkish Banks Open Banking API Connector.
@@ -48,14 +89,8 @@ class BankConnector(models.Model):
         string='Redirect URI',
         default='https://www.jokergrubu.com/bank/callback',
     )
-    access_token = fields.Char(
-        string='Access Token', copy=False, groups='base.group_system',
-    )
-    refresh_token = fields.Char(
-        string='Refresh Token', copy=False, groups='base.group_system',
-    )
     token_expires_at = fields.Datetime(
-        string='Token Bitiş', copy=False, readonly=True,
+        string='Token Bitiş', compute='_compute_token_expires_at',
     )
 
     # Configuration
@@ -66,6 +101,25 @@ class BankConnector(models.Model):
     sync_interval = fields.Integer(
         string='Senkronizasyon Aralığı (dk)', default=60,
     )
+    sync_overlap_days = fields.Integer(
+        string='İşlem Çakışma Penceresi (gün)', default=2,
+        help='Geç valörlenen işlemleri kaçırmamak için her hesabın '
+             'imlecinden bu kadar gün öncesinden başlanır',
+    )
+    reconcile_days = fields.Integer(
+        string='Mutabakat Taraması (gün)', default=90,
+        help='Tam mutabakat taramasında geriye doğru çekilecek gün sayısı',
+    )
+    auto_reconcile_enabled = fields.Boolean(
+        string='Otomatik Eşleştirme', default=True,
+        help='İçeri aktarılan işlemleri açık alacak/borç kalemleriyle eşleştir',
+    )
+    auto_reconcile_threshold = fields.Float(
+        string='Eşleştirme Eşiği', default=0.85, digits=(3, 2),
+        help='Bu skorun üzerindeki tekil eşleşmeler otomatik kapatılır, '
+             'diğerleri öneri olarak bırakılır (referans 0.5, tutar 0.35, '
+             'partner 0.15)',
+    )
 
     # Status
     state = fields.Selection(
@@ -111,6 +165,39 @@ class BankConnector(models.Model):
         for rec in self:
             rec.total_accounts = len(rec.account_ids)
 
+    def _compute_token_expires_at(self):
+        tokens = {
+            token.connector_id.id: token.expires_at
+            for token in self.env['bank.connector.token'].sudo().search(
+                [('connector_id', 'in', self.ids)],
+            )
+        }
+        for rec in self:
+            rec.token_expires_at = tokens.get(rec.id, False)
+
+    # Fields whose change invalidates the stored token
+    _TOKEN_FIELDS = (
+        'bank_type', 'client_id', 'client_secret', 'sandbox_mode',
+        'garantibbva_scope', 'is_corporate',
+    )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if any(f in vals for f in self._TOKEN_FIELDS):
+            self._drop_tokens()
+        return res
+
+    def _drop_tokens(self):
+        for rec in self:
+            token_cache.cache_discard((self.env.cr.dbname, rec.id))
+        self.env['bank.connector.token'].sudo().search(
+            [('connector_id', 'in', self.ids)],
+        ).unlink()
+        # The deleted rows stay locked until this transaction ends
+        self.env.cr.precommit.data.setdefault(
+            TOKEN_DROPPED_KEY, set(),
+        ).update(self.ids)
+
     # -------------------------------------------------------------------------
     # OAuth & HTTP
     # -------------------------------------------------------------------------
@@ -122,73 +209,233 @@ class BankConnector(models.Model):
             return method()
         raise UserError(_("'%s' için API URL tanımlı değil.") % self.bank_type)
 
-    def _get_headers(self):
+    def _get_headers(self, force_refresh=False, rejected_token=None):
         self.ensure_one()
-        if not self.access_token or self._is_token_expired():
-            self._refresh_access_token()
+        access_token = self._get_access_token(
+            force=force_refresh, rejected_token=rejected_token,
+        )
         return {
-            'Authorization': f'Bearer {self.access_token}',
+            'Authorization': f'Bearer {access_token}',
             'Content-Type': 'application/json',
             'Accept': 'application/json',
         }
 
     def _is_token_expired(self):
+        """True when this process holds no token valid beyond the margin."""
         self.ensure_one()
-        if not self.token_expires_at:
-            return True
-        return (
-            fields.Datetime.now() + timedelta(minutes=5)
-        ) >= self.token_expires_at
+        return token_cache.cache_get((self.env.cr.dbname, self.id)) is None
 
     def _refresh_access_token(self):
         self.ensure_one()
-        method = getattr(self, f'_refresh_token_{self.bank_type}', None)
-        if method:
-            return method()
-        raise UserError(
-            _("'%s' için token yenileme tanımlı değil.") % self.bank_type
+        return self._get_access_token(force=True)
+
+    def _get_access_token(self, force=False, rejected_token=None):
+        """Return a valid access token, refreshing it ahead of expiry.
+
+        The token is served from the per-process cache while valid. A
+        refresh runs on its own short transaction under a DB advisory lock
+        per connector: the first process to take the lock calls the bank,
+        the others find the new token when they get it. The main (ORM)
+        transaction never waits on the bank or locks the connector row.
+
+        Args:
+            force: ignore the cache, e.g. after a 401
+            rejected_token: the token the bank refused; a stored token
+                different from it was refreshed meanwhile and is reused
+        """
+        self.ensure_one()
+        key = (self.env.cr.dbname, self.id)
+        if not force:
+            cached = token_cache.cache_get(key)
+            if cached:
+                return cached
+
+        method = getattr(self, f'_request_token_{self.bank_type}', None)
+        if not method:
+            raise UserError(
+                _("'%s' için token yenileme tanımlı değil.") % self.bank_type
+            )
+
+        try:
+            access_token, expires_at = self._obtain_token(
+                force, rejected_token,
+            )
+        except BankTokenError as e:
+            if e.auth_failed:
+                self.write({'state': 'error', 'last_error': str(e)})
+            raise
+
+        token_cache.cache_set(
+            key, access_token,
+            expires_at.replace(tzinfo=timezone.utc).timestamp(),
+        )
+        self.invalidate_recordset(['token_expires_at'])
+        return access_token
+
+    def _obtain_token(self, force, rejected_token):
+        """Read or refresh the stored token under the advisory lock.
+
+        When the current transaction has deleted the connector's token
+        rows (credentials changed), a side cursor would wait on their row
+        locks forever; the token is then refreshed in this transaction,
+        under a transaction-level advisory lock.
+
+        Returns:
+            tuple: (access token, expiry as naive UTC datetime)
+        """
+        if self.id in self.env.cr.precommit.data.get(TOKEN_DROPPED_KEY, ()):
+            self.env.cr.execute(SQL(
+                'SELECT pg_advisory_xact_lock(%s, %s)',
+                TOKEN_LOCK_NAMESPACE, self.id,
+            ))
+            return self.sudo()._store_token(force, rejected_token)
+
+        with self.env.registry.cursor() as cr:
+            lock = SQL(
+                'SELECT pg_advisory_lock(%s, %s)',
+                TOKEN_LOCK_NAMESPACE, self.id,
+            )
+            cr.execute(lock)
+            try:
+                # New snapshot, taken after the lock holder committed
+                cr.commit()
+                connector = self.with_env(self.env(cr=cr)).sudo()
+                result = connector._store_token(force, rejected_token)
+                cr.commit()
+                return result
+            finally:
+                cr.rollback()
+                cr.execute(SQL(
+                    'SELECT pg_advisory_unlock(%s, %s)',
+                    TOKEN_LOCK_NAMESPACE, self.id,
+                ))
+
+    def _store_token(self, force, rejected_token):
+        """Reuse the stored token or request and store a new one.
+
+        Runs with the advisory lock held, in the transaction of ``self``.
+        Only 400, 401 and 403 answers count as refused credentials.
+
+        Returns:
+            tuple: (access token, expiry as naive UTC datetime)
+        """
+        self.ensure_one()
+        Token = self.env['bank.connector.token']
+        token = Token.search([('connector_id', '=', self.id)], limit=1)
+        reusable = token and token._is_valid() and (
+            not force
+            or (rejected_token and token.access_token != rejected_token)
+        )
+        if reusable:
+            return token.access_token, token.expires_at
+
+        try:
+            result = getattr(self, f'_request_token_{self.bank_type}')()
+        except requests.exceptions.RequestException as e:
+            status = (
+                e.response.status_code
+                if getattr(e, 'response', None) is not None else None
+            )
+            raise BankTokenError(
+                _('%s token hatası: %s')
+                % (self._get_bank_label(), self._format_request_error(e)),
+                auth_failed=status in (400, 401, 403),
+            ) from e
+
+        expires_at = fields.Datetime.now() + timedelta(
+            seconds=result.get('expires_in', 3600),
         )
+        vals = {
+            'access_token': result['access_token'],
+            'refresh_token': result.get('refresh_token'),
+            'expires_at': expires_at,
+        }
+        if token:
+            token.write(vals)
+        else:
+            Token.create(dict(vals, connector_id=self.id))
+        _logger.info('Bank token refreshed [%s]', self.name)
+        return vals['access_token'], expires_at
+
+    def _get_session(self):
+        """Keep-alive HTTP session of this connector, shared per process."""
+        self.ensure_one()
+        return _get_session((self.env.cr.dbname, self.id))
 
     def _make_api_request(self, method, endpoint, data=None, params=None):
+        """Call the bank API; a 401 is retried once with a forced refresh.
+
+        Only a refused authorization marks the connector as ``error``;
+        network and server errors are raised without changing its state.
+        """
         self.ensure_one()
         url = f'{self._get_base_url()}{endpoint}'
         headers = self._get_headers()
         try:
-            response = requests.request(
+            response = self._get_session().request(
                 method=method, url=url, headers=headers,
                 json=data, params=params, timeout=30,
             )
+            if response.status_code == 401:
+                rejected = headers['Authorization'].split(' ', 1)[1]
+                _logger.info(
+                    'Bank API 401 [%s], retrying with a new token', self.name,
+                )
+                headers = self._get_headers(
+                    force_refresh=True, rejected_token=rejected,
+                )
+                response = self._get_session().request(
+                    method=method, url=url, headers=headers,
+                    json=data, params=params, timeout=30,
+                )
             response.raise_for_status()
             return response.json()
-        except requests.exceptions.HTTPError as e:
-            error_msg = f'HTTP {e.response.status_code}: {e.response.text[:500]}'
-            _logger.error('Bank API error [%s]: %s', self.name, error_msg)
-            self.write({'state': 'error', 'last_error': error_msg})
-            raise UserError(error_msg)
         except requests.exceptions.RequestException as e:
-            error_msg = str(e)
+            error_msg = self._format_request_error(e)
             _logger.error('Bank API error [%s]: %s', self.name, error_msg)
-            self.write({'state': 'error', 'last_error': error_msg})
+            vals = {'last_error': error_msg}
+            if self._is_auth_error(e):
+                vals['state'] = 'error'
+            self.write(vals)
             raise UserError(error_msg)
 
+    @staticmethod
+    def _is_auth_error(error):
+        """True for refused credentials (not for network/server errors)."""
+        if isinstance(error, BankTokenError):
+            return error.auth_failed
+        return (
+            isinstance(error, requests.exceptions.HTTPError)
+            and error.response is not None
+            and error.response.status_code in (401, 403)
+        )
+
+    @staticmethod
+    def _format_request_error(error):
+        if (
+            isinstance(error, requests.exceptions.HTTPError)
+            and error.response is not None
+        ):
+            return (
+                f'HTTP {error.response.status_code}: '
+                f'{error.response.text[:500]}'
+            )
+        return str(error)
+
     # -------------------------------------------------------------------------
     # Actions
     # -------------------------------------------------------------------------
 
     def action_connect(self):
         self.ensure_one()
-        self._refresh_access_token()
+        self._get_access_token(force=True)
         self.write({'state': 'connected', 'last_error': False})
         return self._notify(_('Bağlantı başarılı.'), 'success')
 
     def action_disconnect(self):
         self.ensure_one()
-        self.write({
-            'state': 'disconnected',
-            'access_token': False,
-            'refresh_token': False,
-            'token_expires_at': False,
-        })
+        self.write({'state': 'disconnected'})
+        self._drop_tokens()
         return self._notify(_('Bağlantı kesildi.'), 'info')
 
     def action_test_connection(self):
@@ -221,18 +468,133 @@ class BankConnector(models.Model):
         )
 
     def sync_transactions(self, date_from=None, date_to=None):
+        """Import the new transactions of every linked account.
+
+        Without ``date_from`` each account resumes from its own cursor (the
+        latest imported value date minus ``sync_overlap_days``); accounts
+        never synced start ``TX_INITIAL_SYNC_DAYS`` back. An explicit
+        ``date_from`` rescans that whole window for every account.
+        """
         self.ensure_one()
         self._check_connected()
-        if not date_from:
-            date_from = fields.Date.today() - timedelta(days=30)
+        if not hasattr(self, f'_parse_transactions_{self.bank_type}'):
+            raise UserError(
+                _("'%s' işlem senkronizasyonu desteklenmiyor.")
+                % self.bank_type
+            )
         if not date_to:
             date_to = fields.Date.today()
-        method = getattr(self, f'_sync_transactions_{self.bank_type}', None)
-        if method:
-            return method(date_from, date_to)
-        raise UserError(
-            _("'%s' işlem senkronizasyonu desteklenmiyor.") % self.bank_type
+
+        total = 0
+        match_cache = {}
+        for account in self._get_sync_accounts():
+            window_from = date_from or account._get_transaction_sync_start(
+                self.sync_overlap_days, TX_INITIAL_SYNC_DAYS,
+            )
+            try:
+                total += self._sync_account_transactions(
+                    account, window_from, date_to, match_cache=match_cache,
+                )
+            except Exception as e:
+                _logger.error(
+                    '%s işlem hatası [%s]: %s',
+                    self._get_bank_label(), account.acc_number, e,
+                )
+
+        self.last_sync = fields.Datetime.now()
+        return self._notify(
+            _('%d işlem senkronize edildi.') % total, 'success',
+        )
+
+    def _get_sync_accounts(self):
+        self.ensure_one()
+        return self.account_ids.filtered(
+            lambda a: a.bank_external_account_id,
+        )
+
+    def _prepare_transactions_request(self, account, date_from, date_to):
+        """Return ``(endpoint, params)`` of an account's transaction call."""
+        self.ensure_one()
+        method = getattr(
+            self, f'_prepare_transactions_request_{self.bank_type}',
+        )
+        return method(account, date_from, date_to)
+
+    def _parse_transactions(self, response):
+        """Normalize a transaction response to ``_create_statement_lines`` input."""
+        self.ensure_one()
+        return getattr(self, f'_parse_transactions_{self.bank_type}')(response)
+
+    def _fetch_transactions(self, account, date_from, date_to):
+        endpoint, params = self._prepare_transactions_request(
+            account, date_from, date_to,
         )
+        response = self._make_api_request('GET', endpoint, params=params)
+        return self._parse_transactions(response)
+
+    def _sync_account_transactions(
+        self, account, date_from, date_to, transactions=None,
+        match_cache=None,
+    ):
+        """Import one account's window and advance its cursor.
+
+        The cursor only moves over transactions that are now stored (newly
+        created or already imported) and stops at the oldest one that
+        failed; it does not move when the account has no journal.
+
+        Args:
+            transactions: already downloaded transactions; fetched from
+                the bank when omitted
+            match_cache: auto-match state shared by the accounts of one
+                run (see ``_bank_auto_match``)
+        Returns:
+            int: number of lines created
+        """
+        if transactions is None:
+            transactions = self._fetch_transactions(
+                account, date_from, date_to,
+            )
+        count, stored, failed = self._create_statement_lines(
+            account, transactions, match_cache=match_cache,
+        )
+        account._advance_transaction_cursor(stored, date_to, failed)
+        _logger.info(
+            '%s %s: %d işlem (%s - %s)', self._get_bank_label(),
+            account.acc_number, count, date_from, date_to,
+        )
+        return count
+
+    def action_auto_match(self):
+        """Run the batch matcher on all open lines imported by this connector."""
+        self.ensure_one()
+        journals = self.env['account.journal'].search([
+            ('type', '=', 'bank'),
+            ('bank_account_id', 'in', self.account_ids.ids),
+            ('company_id', '=', self.company_id.id),
+        ])
+        lines = self.env['account.bank.statement.line'].search([
+            ('journal_id', 'in', journals.ids),
+            ('bank_import_ref', '!=', False),
+            ('is_reconciled', '=', False),
+        ])
+        result = lines._bank_auto_match(self.auto_reconcile_threshold)
+        return self._notify(
+            _('%(reconciled)d satır eşleştirildi, %(suggested)d öneri oluşturuldu.')
+            % result,
+            'success',
+        )
+
+    def action_reconcile_transactions(self):
+        """Rescan the last ``reconcile_days`` of every account.
+
+        Regular syncs only fetch new activity from the account cursors;
+        this full-window pass picks up anything a bank reported late.
+        """
+        self.ensure_one()
+        date_from = fields.Date.today() - timedelta(
+            days=self.reconcile_days or TX_INITIAL_SYNC_DAYS,
+        )
+        return self.sync_transactions(date_from=date_from)
 
     def sync_exchange_rates(self):
         self.ensure_one()
@@ -255,33 +617,131 @@ class BankConnector(models.Model):
 
     @api.model
     def cron_sync_all_connectors(self):
+        """Sync all auto-sync connectors, overlapping the bank latencies.
+
+        1. Per connector: sync the account list and refresh the token if
+           it is about to expire. A failing account sync no longer skips
+           the connector's transactions.
+        2. The transaction downloads of all accounts of all banks run
+           concurrently on pooled keep-alive sessions; workers only do
+           HTTP, no ORM.
+        3. Each account's download is imported and committed on its own
+           as soon as it arrives.
+        """
         connectors = self.search([
             ('state', '=', 'connected'),
             ('auto_sync_enabled', '=', True),
         ])
+        date_to = fields.Date.today()
+        match_cache = {}
+        jobs = []
         for connector in connectors:
             try:
                 connector.sync_accounts()
-                connector.sync_transactions()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error(
+                    'Auto-sync accounts FAIL [%s]: %s', connector.name, e,
+                )
+            try:
+                headers = connector._get_headers()
+                base_url = connector._get_base_url()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                connector._set_sync_error(e)
+                continue
+            session = connector._get_session()
+            for account in connector._get_sync_accounts():
+                date_from = account._get_transaction_sync_start(
+                    connector.sync_overlap_days, TX_INITIAL_SYNC_DAYS,
+                )
+                endpoint, params = connector._prepare_transactions_request(
+                    account, date_from, date_to,
+                )
+                jobs.append((
+                    (connector, account, date_from, endpoint, params),
+                    (session, 'GET', f'{base_url}{endpoint}', headers, params),
+                ))
+
+        failed = self.browse()
+        with ThreadPoolExecutor(max_workers=BANK_SYNC_WORKERS) as executor:
+            futures = {
+                executor.submit(_fetch_json, *request): job
+                for job, request in jobs
+            }
+            for future in as_completed(futures):
+                connector, account, date_from, endpoint, params = futures[future]
+                try:
+                    try:
+                        payload = future.result()
+                    except requests.exceptions.HTTPError as e:
+                        if e.response is None or e.response.status_code != 401:
+                            raise
+                        # Token revoked early: retry with a refreshed one
+                        payload = connector._make_api_request(
+                            'GET', endpoint, params=params,
+                        )
+                    transactions = connector._parse_transactions(payload)
+                    connector._sync_account_transactions(
+                        account, date_from, date_to, transactions,
+                        match_cache=match_cache,
+                    )
+                    self.env.cr.commit()
+                except Exception as e:
+                    self.env.cr.rollback()
+                    failed |= connector
+                    connector._set_sync_error(e, account)
+
+        for connector in connectors - failed:
+            if connector.state == 'connected':
                 connector.last_sync = fields.Datetime.now()
                 _logger.info('Auto-sync OK: %s', connector.name)
-            except Exception as e:
-                _logger.error('Auto-sync FAIL [%s]: %s', connector.name, e)
+        self.env.cr.commit()
+
+    def _set_sync_error(self, error, account=None):
+        """Record a cron sync failure on the connector and commit it."""
+        self.ensure_one()
+        if isinstance(error, requests.exceptions.RequestException):
+            error_msg = self._format_request_error(error)
+        else:
+            error_msg = str(error)
+        if account:
+            error_msg = f'{account.acc_number}: {error_msg}'
+        _logger.error('Auto-sync FAIL [%s]: %s', self.name, error_msg)
+        vals = {'last_error': error_msg}
+        if self._is_auth_error(error):
+            vals['state'] = 'error'
+        self.write(vals)
+        self.env.cr.commit()
 
     # -------------------------------------------------------------------------
     # Statement Line Creation (Odoo Standard)
     # -------------------------------------------------------------------------
 
-    def _create_statement_lines(self, bank_account, transactions_data):
+    def _create_statement_lines(
+        self, bank_account, transactions_data, match_cache=None,
+    ):
         """Create account.bank.statement.line from bank API data.
 
+        The whole batch is resolved up front: existing import refs with one
+        ``IN`` query, partners through a per-run VAT/IBAN/name index and
+        currencies once per code. New lines are inserted with a single
+        ``create``; if that hits the ``bank_import_ref`` UNIQUE constraint
+        (concurrent import), lines are retried one by one and duplicates
+        are skipped.
+
         Args:
             bank_account: res.partner.bank record
             transactions_data: list of dicts with keys:
                 reference, date, amount, description, partner_name,
                 partner_vat, partner_iban, foreign_currency, amount_currency
+            match_cache: passed on to ``_bank_auto_match``
         Returns:
-            int: number of lines created
+            tuple: ``(count, stored, failed)`` — number of lines created,
+            the transactions that are now stored (created or already
+            imported) and those that could not be stored
         """
         journal = self._get_journal_for_account(bank_account)
         if not journal:
@@ -289,63 +749,127 @@ class BankConnector(models.Model):
                 'Jurnal bulunamadı: %s — Hesabı bir banka jurnali ile '
                 'eşleştirin.', bank_account.acc_number,
             )
-            return 0
+            return 0, [], []
 
         StatementLine = self.env['account.bank.statement.line']
-        created = 0
 
+        transactions = {}
         for tx in transactions_data:
             tx_ref = tx.get('reference')
             if not tx_ref:
                 continue
-
             import_ref = (
                 f'{self.bank_type}-'
                 f'{bank_account.sanitized_acc_number}-'
                 f'{tx_ref}'
             )
+            transactions.setdefault(import_ref, tx)
+        if not transactions:
+            return 0, [], []
+
+        # The UNIQUE constraint is global, so look across companies
+        existing_refs = {
+            line.bank_import_ref
+            for line in StatementLine.sudo().search_fetch(
+                [('bank_import_ref', 'in', list(transactions))],
+                ['bank_import_ref'],
+            )
+        }
+        new_transactions = {
+            ref: tx for ref, tx in transactions.items()
+            if ref not in existing_refs
+        }
+        if not new_transactions:
+            return 0, list(transactions.values()), []
 
-            if StatementLine.search_count(
-                [('bank_import_ref', '=', import_ref)]
-            ):
-                continue
-
-            partner_id = self._find_partner_for_transaction(tx)
+        partner_index = self._prepare_partner_index(
+            new_transactions.values(),
+        )
+        journal_currency = journal.currency_id or self.env.company.currency_id
+        currencies = self._get_currencies_by_code(
+            tx.get('foreign_currency') for tx in new_transactions.values()
+        )
 
+        vals_list = []
+        for import_ref, tx in new_transactions.items():
             vals = {
                 'journal_id': journal.id,
                 'date': tx.get('date', fields.Date.today()),
-                'payment_ref': tx.get('description') or tx_ref,
+                'payment_ref': tx.get('description') or tx.get('reference'),
                 'amount': float(tx.get('amount', 0)),
                 'bank_import_ref': import_ref,
-                'partner_id': partner_id,
+                'partner_id': self._find_partner_for_transaction(
+                    tx, partner_index,
+                ),
                 'partner_name': tx.get('partner_name', ''),
             }
 
             foreign_code = tx.get('foreign_currency')
-            journal_currency = (
-                journal.currency_id or self.env.company.currency_id
-            )
             if foreign_code:
-                fc = self.env['res.currency'].search(
-                    [('name', '=', foreign_code.upper())], limit=1,
-                )
+                fc = currencies.get(foreign_code.upper())
                 if fc and fc != journal_currency:
                     vals['foreign_currency_id'] = fc.id
                     vals['amount_currency'] = float(
                         tx.get('amount_currency', 0),
                     )
+            vals_list.append(vals)
 
-            try:
-                StatementLine.create(vals)
-                created += 1
-            except Exception as e:
-                _logger.error('Statement line error [%s]: %s', tx_ref, e)
+        created, failed_refs = self._create_statement_line_batch(vals_list)
 
         if created:
             bank_account.write({'last_sync': fields.Datetime.now()})
+            if self.auto_reconcile_enabled:
+                try:
+                    with self.env.cr.savepoint():
+                        created._bank_auto_match(
+                            self.auto_reconcile_threshold,
+                            match_cache=match_cache,
+                        )
+                except Exception as e:
+                    _logger.error('Auto-match error [%s]: %s', self.name, e)
+
+        stored = [
+            tx for ref, tx in transactions.items() if ref not in failed_refs
+        ]
+        failed = [transactions[ref] for ref in failed_refs]
+        return len(created), stored, failed
+
+    def _create_statement_line_batch(self, vals_list):
+        """Insert statement lines in one ``create``, row by row on conflict.
+
+        Returns:
+            tuple: the created ``account.bank.statement.line`` records and
+            the set of ``bank_import_ref`` that failed for another reason
+            than being already imported
+        """
+        StatementLine = self.env['account.bank.statement.line']
+        try:
+            with self.env.cr.savepoint():
+                return StatementLine.create(vals_list), set()
+        except Exception as e:
+            _logger.info(
+                'Batch statement line import failed, retrying per line: %s',
+                e,
+            )
 
-        return created
+        created = StatementLine
+        failed_refs = set()
+        for vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    created |= StatementLine.create(vals)
+            except psycopg2.errors.UniqueViolation:
+                _logger.debug(
+                    'Statement line already imported: %s',
+                    vals['bank_import_ref'],
+                )
+            except Exception as e:
+                failed_refs.add(vals['bank_import_ref'])
+                _logger.error(
+                    'Statement line error [%s]: %s',
+                    vals['bank_import_ref'], e,
+                )
+        return created, failed_refs
 
     def _get_journal_for_account(self, bank_account):
         return self.env['account.journal'].search([
@@ -354,30 +878,66 @@ class BankConnector(models.Model):
             ('company_id', '=', self.company_id.id),
         ], limit=1)
 
-    def _find_partner_for_transaction(self, tx_data):
+    def _prepare_partner_index(self, transactions_data):
+        """Resolve the VATs and IBANs of a batch with one query each.
+
+        Returns:
+            dict: ``{'vat': {vat: partner_id}, 'iban': {iban: partner_id},
+            'name': {}}``; the name map is filled lazily by
+            ``_find_partner_for_transaction`` so that each distinct name is
+            looked up once per run.
+        """
+        vats, ibans = set(), set()
+        for tx in transactions_data:
+            if tx.get('partner_vat'):
+                vats.add(tx['partner_vat'])
+            if tx.get('partner_iban'):
+                ibans.add(tx['partner_iban'].replace(' ', ''))
+
+        index = {'vat': {}, 'iban': {}, 'name': {}}
+        if vats:
+            for partner in self.env['res.partner'].search_fetch(
+                [('vat', 'in', list(vats))], ['vat'],
+            ):
+                index['vat'].setdefault(partner.vat, partner.id)
+        if ibans:
+            for bank_account in self.env['res.partner.bank'].search_fetch(
+                [('sanitized_acc_number', 'in', list(ibans))],
+                ['sanitized_acc_number', 'partner_id'],
+            ):
+                if bank_account.partner_id:
+                    index['iban'].setdefault(
+                        bank_account.sanitized_acc_number,
+                        bank_account.partner_id.id,
+                    )
+        return index
+
+    def _find_partner_for_transaction(self, tx_data, partner_index=None):
+        if partner_index is None:
+            partner_index = self._prepare_partner_index([tx_data])
+
         partner_vat = tx_data.get('partner_vat')
-        if partner_vat:
-            p = self.env['res.partner'].search(
-                [('vat', '=', partner_vat)], limit=1,
-            )
-            if p:
-                return p.id
+        if partner_vat and partner_vat in partner_index['vat']:
+            return partner_index['vat'][partner_vat]
 
         partner_iban = tx_data.get('partner_iban')
         if partner_iban:
-            ba = self.env['res.partner.bank'].search([
-                ('sanitized_acc_number', '=', partner_iban.replace(' ', '')),
-            ], limit=1)
-            if ba and ba.partner_id:
-                return ba.partner_id.id
+            partner_id = partner_index['iban'].get(
+                partner_iban.replace(' ', ''),
+            )
+            if partner_id:
+                return partner_id
 
         partner_name = tx_data.get('partner_name')
         if partner_name and len(partner_name) > 3:
-            p = self.env['res.partner'].search(
-                [('name', 'ilike', partner_name)], limit=1,
-            )
-            if p:
-                return p.id
+            names = partner_index['name']
+            if partner_name not in names:
+                p = self.env['res.partner'].search(
+                    [('name', 'ilike', partner_name)], limit=1,
+                )
+                names[partner_name] = p.id
+            if names[partner_name]:
+                return names[partner_name]
 
         return False
 
@@ -385,38 +945,21 @@ class BankConnector(models.Model):
     # Currency Rate Helper
     # -------------------------------------------------------------------------
 
-    def _update_currency_rate(self, currency_code, rate_value, source=None):
-        currency = self.env['res.currency'].search(
-            [('name', '=', currency_code.upper())], limit=1,
-        )
-        if not currency:
-            return False
-
-        today = fields.Date.today()
-        CurrencyRate = self.env['res.currency.rate']
-        existing = CurrencyRate.search([
-            ('currency_id', '=', currency.id),
-            ('company_id', '=', self.company_id.id),
-            ('name', '=', today),
-        ], limit=1)
-
-        odoo_rate = 1.0 / float(rate_value) if float(rate_value) else 0
+    def _ingest_exchange_rates(self, rates, source):
+        """Hand a bank's ``{code: TRY per unit}`` rates to the shared service.
 
-        if existing:
-            existing.write({'rate': odoo_rate})
-        else:
-            vals = {
-                'currency_id': currency.id,
-                'company_id': self.company_id.id,
-                'name': today,
-                'rate': odoo_rate,
-            }
-            if source:
-                vals['source'] = source
-                vals['bank_connector_id'] = self.id
-            CurrencyRate.create(vals)
+        The service writes all currencies for all TRY companies in one batch
+        and keeps rates of higher priority sources.
+        """
+        self.ensure_one()
+        return self.env['res.currency.rate']._ingest_rates(
+            source, rates, connector=self,
+        )
 
-        return True
+    def _update_currency_rate(self, currency_code, rate_value, source=None):
+        return bool(self._ingest_exchange_rates(
+            {currency_code: rate_value}, source or 'manual',
+        ))
 
     # -------------------------------------------------------------------------
     # Helpers
@@ -427,6 +970,12 @@ class BankConnector(models.Model):
         if self.state != 'connected':
             raise UserError(_('Önce banka bağlantısı kurulmalı.'))
 
+    def _get_bank_label(self):
+        self.ensure_one()
+        return dict(self._fields['bank_type'].selection).get(
+            self.bank_type, self.bank_type,
+        )
+
     def _notify(self, message, msg_type='info'):
         return {
             'type': 'ir.actions.client',
@@ -438,6 +987,18 @@ class BankConnector(models.Model):
             },
         }
 
+    def _get_currencies_by_code(self, currency_codes):
+        """Map upper-cased ISO codes to res.currency records in one query."""
+        codes = {code.upper() for code in currency_codes if code}
+        if not codes:
+            return {}
+        return {
+            currency.name: currency
+            for currency in self.env['res.currency'].search(
+                [('name', 'in', list(codes))],
+            )
+        }
+
     def _get_currency_id(self, currency_code):
         if not currency_code:
             return self.env.company.currency_id.id
@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from datetime import timedelta
 import logging
 
 from odoo import _, fields, models
-from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
@@ -19,7 +17,7 @@ class BankConnectorQNB(models.Model):
             return 'https://sandbox-api.qnbfinansbank.com'
         return 'https://api.qnbfinansbank.com'
 
-    def _refresh_token_qnb(self):
+    def _request_token_qnb(self):
         import requests as req
 
         url = f'{self._get_base_url()}/oauth/token'
@@ -29,24 +27,9 @@ class BankConnectorQNB(models.Model):
             'client_secret': self.client_secret,
             'scope': 'accounts payments',
         }
-        try:
-            resp = req.post(url, data=data, timeout=30)
-            resp.raise_for_status()
-            result = resp.json()
-            self.write({
-                'access_token': result['access_token'],
-                'refresh_token': result.get('refresh_token'),
-                'token_expires_at': (
-                    fields.Datetime.now()
-                    + timedelta(seconds=result.get('expires_in', 3600))
-                ),
-                'state': 'connected',
-                'last_error': False,
-            })
-        except Exception as e:
-            error_msg = f'QNB token hatası: {e}'
-            self.write({'state': 'error', 'last_error': error_msg})
-            raise UserError(error_msg)
+        resp = req.post(url, data=data, timeout=30)
+        resp.raise_for_status()
+        return resp.json()
 
     def _sync_accounts_qnb(self):
         response = self._make_api_request('GET', '/v1/accounts')
@@ -87,76 +70,51 @@ class BankConnectorQNB(models.Model):
         self.last_sync = fields.Datetime.now()
         return self._notify(_('%d hesap senkronize edildi.') % synced, 'success')
 
-    def _sync_transactions_qnb(self, date_from, date_to):
-        accounts = self.account_ids.filtered(
-            lambda a: a.bank_external_account_id,
+    def _prepare_transactions_request_qnb(self, account, date_from, date_to):
+        endpoint = (
+            f'/v1/accounts/'
+            f'{account.bank_external_account_id}/transactions'
         )
-        total = 0
-
-        for account in accounts:
-            try:
-                endpoint = (
-                    f'/v1/accounts/'
-                    f'{account.bank_external_account_id}/transactions'
-                )
-                params = {
-                    'fromDate': date_from.isoformat(),
-                    'toDate': date_to.isoformat(),
-                }
-                response = self._make_api_request(
-                    'GET', endpoint, params=params,
-                )
-                raw = response.get('transactions', [])
-
-                transactions = []
-                for tx in raw:
-                    transactions.append({
-                        'reference': (
-                            tx.get('transactionId')
-                            or tx.get('referenceNo')
-                        ),
-                        'date': tx.get(
-                            'valueDate',
-                            tx.get('transactionDate', fields.Date.today()),
-                        ),
-                        'amount': float(tx.get('amount', 0)),
-                        'description': tx.get('description', ''),
-                        'partner_name': tx.get(
-                            'counterpartyName',
-                            tx.get('senderName', ''),
-                        ),
-                        'partner_iban': tx.get(
-                            'counterpartyIban',
-                            tx.get('senderIban', ''),
-                        ),
-                    })
-
-                count = self._create_statement_lines(account, transactions)
-                total += count
-                _logger.info(
-                    'QNB %s: %d işlem', account.acc_number, count,
-                )
-            except Exception as e:
-                _logger.error(
-                    'QNB işlem hatası [%s]: %s', account.acc_number, e,
-                )
+        params = {
+            'fromDate': date_from.isoformat(),
+            'toDate': date_to.isoformat(),
+        }
+        return endpoint, params
 
-        self.last_sync = fields.Datetime.now()
-        return self._notify(
-            _('%d işlem senkronize edildi.') % total, 'success',
-        )
+    def _parse_transactions_qnb(self, response):
+        raw = response.get('transactions', [])
+
+        transactions = []
+        for tx in raw:
+            transactions.append({
+                'reference': (
+                    tx.get('transactionId')
+                    or tx.get('referenceNo')
+                ),
+                'date': tx.get(
+                    'valueDate',
+                    tx.get('transactionDate', fields.Date.today()),
+                ),
+                'amount': float(tx.get('amount', 0)),
+                'description': tx.get('description', ''),
+                'partner_name': tx.get(
+                    'counterpartyName',
+                    tx.get('senderName', ''),
+                ),
+                'partner_iban': tx.get(
+                    'counterpartyIban',
+                    tx.get('senderIban', ''),
+                ),
+            })
+        return transactions
 
     def _sync_exchange_rates_qnb(self):
         response = self._make_api_request('GET', '/v1/fx/exchange-rates')
-        rates = response.get('rates', response.get('exchangeRates', []))
-        synced = 0
-
-        for r in rates:
-            code = r.get('currencyCode') or r.get('currency')
-            buy = r.get('buyRate') or r.get('buyingRate')
-            if not code or not buy:
-                continue
-            if self._update_currency_rate(code, buy, source='qnb'):
-                synced += 1
+        rates = {
+            r.get('currencyCode') or r.get('currency'):
+                r.get('buyRate') or r.get('buyingRate')
+            for r in response.get('rates', response.get('exchangeRates', []))
+        }
+        synced = self._ingest_exchange_rates(rates, source='qnb')
 
         return self._notify(_('%d kur güncellendi.') % synced, 'success')
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timezone
+import threading
+import time
+
+from odoo import fields, models
+from odoo.exceptions import UserError
+
+# Tokens are refreshed this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+
+# First key of the pg_advisory_lock(int, int) pair ("BANK")
+TOKEN_LOCK_NAMESPACE = 0x42414E4B
+
+# cr.precommit.data key: connectors whose token rows the current
+# transaction deleted (cleared on commit / rollback)
+TOKEN_DROPPED_KEY = 'bank.token_dropped'
+
+# Per-process token cache: (dbname, connector id) -> (access token, expiry ts)
+_tokens = {}
+_tokens_lock = threading.Lock()
+
+
+class BankTokenError(UserError):
+    """Token could not be obtained; ``auth_failed`` when the bank refused
+    the credentials (as opposed to a network or server error)."""
+
+    def __init__(self, message, auth_failed=False):
+        super().__init__(message)
+        self.auth_failed = auth_failed
+
+
+def cache_get(key):
+    """Cached access token of a connector unless it is about to expire."""
+    with _tokens_lock:
+        entry = _tokens.get(key)
+    if entry and entry[1] - TOKEN_REFRESH_MARGIN > time.time():
+        return entry[0]
+    return None
+
+
+def cache_set(key, access_token, expires_ts):
+    with _tokens_lock:
+        _tokens[key] = (access_token, expires_ts)
+
+
+def cache_discard(key):
+    with _tokens_lock:
+        _tokens.pop(key, None)
+
+
+class BankConnectorToken(models.Model):
+    """OAuth token of a bank connector.
+
+    Kept apart from bank.connector so that a refresh, committed on its own
+    short transaction, never updates the connector row a long running sync
+    transaction is about to write.
+    """
+
+    _name = 'bank.connector.token'
+    _description = 'Banka API Token'
+    _log_access = False
+
+    connector_id = fields.Many2one(
+        'bank.connector', string='Banka Konektörü',
+        required=True, ondelete='cascade',
+    )
+    access_token = fields.Char(string='Access Token')
+    refresh_token = fields.Char(string='Refresh Token')
+    expires_at = fields.Datetime(string='Token Bitiş')
+
+    _unique_connector = models.Constraint(
+        'UNIQUE(connector_id)',
+        'Bir banka bağlantısı için tek token tutulur!',
+    )
+
+    def _is_valid(self):
+        """True when the token is set and not about to expire."""
+        self.ensure_one()
+        return bool(
+            self.access_token
+            and self.expires_at
+            and self.expires_at.replace(tzinfo=timezone.utc).timestamp()
+            - TOKEN_REFRESH_MARGIN > time.time()
+        )
@@ -1,10 +1,8 @@
 # -*- coding: utf-8 -*-
 
-from datetime import timedelta
 import logging
 
 from odoo import _, fields, models
-from odoo.exceptions import UserError
 
 _logger = logging.getLogger(__name__)
 
@@ -19,7 +17,7 @@ class BankConnectorZiraat(models.Model):
             return 'https://sandbox-api.ziraatbank.com.tr'
         return 'https://api.ziraatbank.com.tr'
 
-    def _refresh_token_ziraat(self):
+    def _request_token_ziraat(self):
         import requests as req
 
         url = f'{self._get_base_url()}/oauth/token'
@@ -30,24 +28,9 @@ class BankConnectorZiraat(models.Model):
         }
         if self.is_corporate:
             data['scope'] = 'corporate_accounts corporate_payments'
-        try:
-            resp = req.post(url, data=data, timeout=30)
-            resp.raise_for_status()
-            result = resp.json()
-            self.write({
-                'access_token': result['access_token'],
-                'refresh_token': result.get('refresh_token'),
-                'token_expires_at': (
-                    fields.Datetime.now()
-                    + timedelta(seconds=result.get('expires_in', 3600))
-                ),
-                'state': 'connected',
-                'last_error': False,
-            })
-        except Exception as e:
-            error_msg = f'Ziraat token hatası: {e}'
-            self.write({'state': 'error', 'last_error': error_msg})
-            raise UserError(error_msg)
+        resp = req.post(url, data=data, timeout=30)
+        resp.raise_for_status()
+        return resp.json()
 
     def _sync_accounts_ziraat(self):
         endpoint = (
@@ -93,77 +76,51 @@ class BankConnectorZiraat(models.Model):
         self.last_sync = fields.Datetime.now()
         return self._notify(_('%d hesap senkronize edildi.') % synced, 'success')
 
-    def _sync_transactions_ziraat(self, date_from, date_to):
-        accounts = self.account_ids.filtered(
-            lambda a: a.bank_external_account_id,
-        )
-        total = 0
-
-        for account in accounts:
-            try:
-                ext_id = account.bank_external_account_id
-                if self.is_corporate:
-                    endpoint = (
-                        f'/accounts/v1/corporate/accounts/'
-                        f'{ext_id}/transactions'
-                    )
-                else:
-                    endpoint = (
-                        f'/accounts/v1/accounts/{ext_id}/transactions'
-                    )
-
-                params = {
-                    'startDate': date_from.isoformat(),
-                    'endDate': date_to.isoformat(),
-                }
-                response = self._make_api_request(
-                    'GET', endpoint, params=params,
-                )
-                raw = response.get('transactions', [])
-
-                transactions = []
-                for tx in raw:
-                    transactions.append({
-                        'reference': (
-                            tx.get('transactionId')
-                            or tx.get('referenceNumber')
-                        ),
-                        'date': tx.get(
-                            'valueDate',
-                            tx.get('transactionDate', fields.Date.today()),
-                        ),
-                        'amount': float(tx.get('amount', 0)),
-                        'description': tx.get('description', ''),
-                        'partner_name': tx.get('counterpartyName', ''),
-                        'partner_iban': tx.get('counterpartyIban', ''),
-                    })
-
-                count = self._create_statement_lines(account, transactions)
-                total += count
-                _logger.info(
-                    'Ziraat %s: %d işlem', account.acc_number, count,
-                )
-            except Exception as e:
-                _logger.error(
-                    'Ziraat işlem hatası [%s]: %s', account.acc_number, e,
-                )
+    def _prepare_transactions_request_ziraat(
+        self, account, date_from, date_to,
+    ):
+        ext_id = account.bank_external_account_id
+        if self.is_corporate:
+            endpoint = (
+                f'/accounts/v1/corporate/accounts/'
+                f'{ext_id}/transactions'
+            )
+        else:
+            endpoint = f'/accounts/v1/accounts/{ext_id}/transactions'
+
+        params = {
+            'startDate': date_from.isoformat(),
+            'endDate': date_to.isoformat(),
+        }
+        return endpoint, params
 
-        self.last_sync = fields.Datetime.now()
-        return self._notify(
-            _('%d işlem senkronize edildi.') % total, 'success',
-        )
+    def _parse_transactions_ziraat(self, response):
+        raw = response.get('transactions', [])
+
+        transactions = []
+        for tx in raw:
+            transactions.append({
+                'reference': (
+                    tx.get('transactionId')
+                    or tx.get('referenceNumber')
+                ),
+                'date': tx.get(
+                    'valueDate',
+                    tx.get('transactionDate', fields.Date.today()),
+                ),
+                'amount': float(tx.get('amount', 0)),
+                'description': tx.get('description', ''),
+                'partner_name': tx.get('counterpartyName', ''),
+                'partner_iban': tx.get('counterpartyIban', ''),
+            })
+        return transactions
 
     def _sync_exchange_rates_ziraat(self):
         response = self._make_api_request('GET', '/fx/v1/rates')
-        rates = response.get('rates', [])
-        synced = 0
-
-        for r in rates:
-            code = r.get('currencyCode')
-            buy = r.get('buyingRate') or r.get('buyRate')
-            if not code or not buy:
-                continue
-            if self._update_currency_rate(code, buy, source='ziraat'):
-                synced += 1
+        rates = {
+            r.get('currencyCode'): r.get('buyingRate') or r.get('buyRate')
+            for r in response.get('rates', [])
+        }
+        synced = self._ingest_exchange_rates(rates, source='ziraat')
 
         return self._notify(_('%d kur güncellendi.') % synced, 'success')
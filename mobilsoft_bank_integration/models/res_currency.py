@@ -1,6 +1,16 @@
 # -*- coding: utf-8 -*-
 
-from odoo import fields, models
+import logging
+
+from odoo import api, fields, models, tools
+
+_logger = logging.getLogger(__name__)
+
+# System parameter holding the comma separated rate source priority
+RATE_PRIORITY_PARAM = 'mobilsoft_bank_integration.rate_source_priority'
+
+# Highest priority first: a rate of the day is never replaced by a lower one
+DEFAULT_RATE_PRIORITY = ('manual', 'tcmb', 'garantibbva', 'ziraat', 'qnb')
 
 
 class CurrencyRate(models.Model):
@@ -15,8 +25,150 @@ class CurrencyRate(models.Model):
             ('tcmb', 'TCMB'),
         ],
         string='Kaynak',
-        default='manual',
+        help='Boş: modülden önce girilmiş kur; en düşük öncelikle '
+             'herhangi bir kaynağın kuruyla değiştirilir',
     )
     bank_connector_id = fields.Many2one(
         'bank.connector', string='Banka Konektörü',
     )
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        # Not a field default: existing rows must keep an empty source,
+        # otherwise they would outrank every bank rate as 'manual'
+        for vals in vals_list:
+            vals.setdefault('source', 'manual')
+        rates = super().create(vals_list)
+        self._clear_rate_cache()
+        return rates
+
+    def write(self, vals):
+        res = super().write(vals)
+        self._clear_rate_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self._clear_rate_cache()
+        return res
+
+    def _clear_rate_cache(self):
+        # _ingest_rates clears once for its whole batch
+        if not self.env.context.get('bank_rate_batch'):
+            self.env.registry.clear_cache()
+
+    @api.model
+    def _get_source_priority(self):
+        """Rank per source, 0 = highest (configurable system parameter)."""
+        param = self.env['ir.config_parameter'].sudo().get_param(
+            RATE_PRIORITY_PARAM,
+        )
+        order = [s.strip() for s in (param or '').split(',') if s.strip()]
+        order = order or list(DEFAULT_RATE_PRIORITY)
+        return {source: rank for rank, source in enumerate(order)}
+
+    @api.model
+    def _ingest_rates(self, source, rates, date=None, connector=None):
+        """Write the rates of one source for all TRY companies in one batch.
+
+        Currencies and the existing rows of the day are read with one query
+        each. A row written by a higher priority source is kept; unchanged
+        rates are not rewritten, so several banks reporting the same day
+        cost no extra writes. The rate cache is cleared once per batch.
+
+        Args:
+            source: rate source key (``source`` selection value)
+            rates: ``{currency_code: TRY per unit}``
+            date: rate date, today by default
+            connector: bank.connector that fetched the rates
+        Returns:
+            int: number of currencies with a usable rate
+        """
+        date = date or fields.Date.today()
+        rates = {
+            code.upper(): float(value)
+            for code, value in rates.items()
+            if code and value and float(value)
+        }
+        if not rates:
+            return 0
+
+        currencies = self.env['res.currency'].search(
+            [('name', 'in', list(rates))],
+        )
+        companies = self.env['res.company'].sudo().search(
+            [('currency_id.name', '=', 'TRY')],
+        )
+        if not currencies or not companies:
+            return 0
+
+        existing = {
+            (rate.currency_id.id, rate.company_id.id): rate
+            for rate in self.sudo().search([
+                ('currency_id', 'in', currencies.ids),
+                ('company_id', 'in', companies.ids),
+                ('name', '=', date),
+            ])
+        }
+        priority = self._get_source_priority()
+        rank = priority.get(source, len(priority))
+
+        to_create = []
+        to_write = {}
+        for currency in currencies:
+            odoo_rate = 1.0 / rates[currency.name]
+            for company in companies:
+                row = existing.get((currency.id, company.id))
+                if not row:
+                    vals = {
+                        'currency_id': currency.id,
+                        'company_id': company.id,
+                        'name': date,
+                        'rate': odoo_rate,
+                        'source': source,
+                    }
+                    if connector:
+                        vals['bank_connector_id'] = connector.id
+                    to_create.append(vals)
+                    continue
+                if priority.get(row.source, len(priority)) < rank:
+                    continue
+                if row.source == source and tools.float_is_zero(
+                    row.rate - odoo_rate, precision_digits=12,
+                ):
+                    continue
+                to_write.setdefault(odoo_rate, []).append(row.id)
+
+        Rate = self.sudo().with_context(bank_rate_batch=True)
+        if to_create:
+            Rate.create(to_create)
+        for odoo_rate, row_ids in to_write.items():
+            vals = {'rate': odoo_rate, 'source': source}
+            if connector:
+                vals['bank_connector_id'] = connector.id
+            Rate.browse(row_ids).write(vals)
+        if to_create or to_write:
+            self.env.registry.clear_cache()
+
+        _logger.info(
+            'Rates %s: %d created, %d updated (%d currencies, %d companies)',
+            source, len(to_create), sum(len(ids) for ids in to_write.values()),
+            len(currencies), len(companies),
+        )
+        return len(currencies)
+
+
+class Currency(models.Model):
+    _inherit = 'res.currency'
+
+    @api.model
+    @tools.ormcache('currency_id', 'company_id', 'date')
+    def _get_cached_rate(self, currency_id, company_id, date):
+        """Rate of a currency against the company currency at ``date``.
+
+        Same value as ``currency.rate`` (units of currency per unit of
+        company currency), cached per process and invalidated whenever a
+        res.currency.rate row changes.
+        """
+        currency = self.sudo().browse(currency_id).with_company(company_id)
+        return currency.with_context(date=date).rate
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from datetime import timedelta
+
 from odoo import fields, models
 
 
@@ -16,3 +18,45 @@ class ResPartnerBank(models.Model):
         index=True,
     )
     last_sync = fields.Datetime(string='Son Senkronizasyon', readonly=True)
+    bank_tx_cursor = fields.Date(
+        string='İşlem İmleci', readonly=True, copy=False,
+        help='İçeri aktarılan en yeni işlemin valör tarihi; sonraki '
+             'senkronizasyon buradan devam eder',
+    )
+
+    def _get_transaction_sync_start(self, overlap_days, initial_days):
+        """First date of the next incremental fetch: cursor - overlap."""
+        self.ensure_one()
+        if not self.bank_tx_cursor:
+            return fields.Date.today() - timedelta(days=initial_days)
+        return self.bank_tx_cursor - timedelta(days=max(overlap_days, 0))
+
+    @staticmethod
+    def _get_value_dates(transactions):
+        dates = []
+        for tx in transactions:
+            try:
+                value_date = fields.Date.to_date(str(tx.get('date'))[:10])
+            except ValueError:
+                continue
+            if value_date:
+                dates.append(value_date)
+        return dates
+
+    def _advance_transaction_cursor(self, transactions, date_to, failed=()):
+        """Move the cursor to the latest stored value date (never back).
+
+        Args:
+            transactions: transactions stored or already imported
+            failed: transactions that could not be stored; the cursor is
+                held at the oldest of them so the next sync fetches it again
+        """
+        self.ensure_one()
+        latest = max(self._get_value_dates(transactions), default=False)
+        oldest_failed = min(self._get_value_dates(failed), default=False)
+        if latest and oldest_failed:
+            latest = min(latest, oldest_failed)
+        if latest and date_to:
+            latest = min(latest, date_to)
+        if latest and (not self.bank_tx_cursor or latest > self.bank_tx_cursor):
+            self.bank_tx_cursor = latest
@@ -46,6 +46,7 @@ Website: https://www.mobilsoft.com
         # Views
         'views/bizimhesap_backend_views.xml',
         'views/bizimhesap_sync_log_views.xml',
+        'views/bizimhesap_export_queue_views.xml',
         'views/res_partner_views.xml',
         'views/product_views.xml',
         'views/account_move_views.xml',
@@ -2,6 +2,8 @@
 
 from . import bizimhesap_backend
 from . import bizimhesap_sync_log
+from . import bizimhesap_export_queue
+from . import bizimhesap_abstract_cache
 from . import bizimhesap_binding
 from . import res_partner
 from . import product_product
@@ -58,6 +58,22 @@ class AccountMove(models.Model):
         for record in self:
             record.bizimhesap_synced = bool(record.bizimhesap_binding_ids)
 
+    def _post(self, soft=True):
+        """
+        Onaylanan faturaları BizimHesap gönderim kuyruğuna al (senkron HTTP yok)
+        ve ilgili carilerin ekstre önbelleğini geçersiz kıl.
+        """
+        posted = super()._post(soft=soft)
+        # Fatura/ödeme kaydı cari ekstresini değiştirir
+        self.env['bizimhesap.abstract.cache'].invalidate_partners(posted.partner_id)
+        invoices = posted.filtered(
+            lambda m: m.is_invoice(include_receipts=False) and not m.bizimhesap_guid
+        )
+        if invoices:
+            backends = self.env['bizimhesap.backend']._get_export_queue_backends()
+            backends.filtered('sync_invoice').enqueue_export('invoice', invoices)
+        return posted
+
     def action_sync_to_bizimhesap(self):
         """Manuel olarak BizimHesap'a gönder"""
         self.ensure_one()
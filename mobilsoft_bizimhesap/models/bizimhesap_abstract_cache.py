@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+import json
+import logging
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+
+class BizimHesapAbstractCache(models.Model):
+    """
+    BizimHesap Cari Ekstre Önbelleği (/abstract/{musteri-id})
+
+    Ekstre cevapları backend + cari kodu bazında saklanır. Kayıt, backend'in
+    abstract_cache_ttl süresi içinde taze kabul edilir; cariye ait fatura
+    veya ödeme senkronize edildiğinde geçersiz kılınır (is_stale). Okumalar
+    kayda yazmaz; ön yükleme son günlerde hareketi olan carileri yeniler.
+    """
+    _name = 'bizimhesap.abstract.cache'
+    _description = 'BizimHesap Abstract Cache'
+    _order = 'fetch_date desc'
+    _rec_name = 'customer_id'
+
+    backend_id = fields.Many2one(
+        'bizimhesap.backend',
+        string='Backend',
+        required=True,
+        ondelete='cascade',
+    )
+    customer_id = fields.Char(
+        string='BizimHesap Cari ID',
+        required=True,
+    )
+    partner_id = fields.Many2one(
+        'res.partner',
+        string='Cari',
+        ondelete='cascade',
+        index=True,
+    )
+    response_data = fields.Text(string='Ekstre (JSON)')
+    fetch_date = fields.Datetime(string='Çekilme Tarihi', required=True)
+    is_stale = fields.Boolean(
+        string='Geçersiz',
+        default=False,
+        help='Cariye ait yeni fatura/ödeme senkronize edildi; bir sonraki okumada yenilenir',
+    )
+
+    _constraint_backend_customer_uniq = models.Constraint(
+        'unique(backend_id, customer_id)',
+        'Bu cari için zaten bir ekstre önbelleği var!',
+    )
+
+    def _is_fresh(self, max_age_minutes):
+        """Önbellek kaydı verilen süre içinde ve geçersiz kılınmamış mı?"""
+        self.ensure_one()
+        if self.is_stale or not self.fetch_date:
+            return False
+        return fields.Datetime.now() - self.fetch_date <= timedelta(minutes=max_age_minutes)
+
+    def _get_response(self):
+        self.ensure_one()
+        try:
+            return json.loads(self.response_data or '{}')
+        except ValueError:
+            return {}
+
+    @api.model
+    def _store(self, backend, customer_id, response, partner=None):
+        """Ekstre cevabını önbelleğe yaz (varsa güncelle)."""
+        vals = {
+            'response_data': json.dumps(response),
+            'fetch_date': fields.Datetime.now(),
+            'is_stale': False,
+        }
+        if partner:
+            vals['partner_id'] = partner.id
+        cache = self.search([
+            ('backend_id', '=', backend.id),
+            ('customer_id', '=', str(customer_id)),
+        ], limit=1)
+        if cache:
+            cache.write(vals)
+            return cache
+        return self.create(dict(vals, backend_id=backend.id, customer_id=str(customer_id)))
+
+    @api.model
+    def invalidate_partners(self, partners):
+        """Verilen carilerin (ve ticari ana carilerinin) ekstre önbelleğini geçersiz kıl."""
+        partner_ids = (partners | partners.commercial_partner_id).ids
+        if not partner_ids:
+            return
+        self.sudo().search([
+            ('partner_id', 'in', partner_ids),
+            ('is_stale', '=', False),
+        ]).write({'is_stale': True})
@@ -6,6 +6,7 @@ import requests
 import logging
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 # Senkronizasyon protokolleri
@@ -20,6 +21,29 @@ _logger = logging.getLogger(__name__)
 # BizimHesap API Base URL - Doğru URL
 BIZIMHESAP_API_BASE = "https://bizimhesap.com/api/b2b"
 
+# Toplu senkronizasyonda paralel çalışan HTTP isteği sayısı
+SYNC_FETCH_WORKERS = 5
+
+
+def _fetch_endpoint(url, headers, timeout=60):
+    """
+    ORM dışında (thread içinde) tek bir GET isteği yap.
+
+    Thread'ler env/cursor'a dokunmaz; sonuç ana thread'de işlenir ve loglanır.
+    """
+    try:
+        return requests.get(url, headers=headers, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return e
+
+
+def _post_endpoint(url, headers, data, timeout=60):
+    """ORM dışında (thread içinde) tek bir POST isteği yap."""
+    try:
+        return requests.post(url, headers=headers, json=data, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return e
+
 
 class BizimHesapBackend(models.Model):
     """
@@ -209,6 +233,30 @@ class BizimHesapBackend(models.Model):
         string='Senkronizasyon Aralığı (dakika)',
         default=30,
     )
+
+    # Giden kuyruk (Odoo → BizimHesap)
+    export_on_change = fields.Boolean(
+        string='Değişiklikleri Kuyruğa Al',
+        default=False,
+        help='Cari/ürün değişiklikleri ve onaylanan faturalar arka planda gönderilmek üzere kuyruğa alınır',
+    )
+    export_concurrency = fields.Integer(
+        string='Eşzamanlı Gönderim',
+        default=4,
+        help='Kuyruk işlenirken bu backend için aynı anda yapılacak en fazla istek sayısı',
+    )
+
+    # Cari ekstre (/abstract) önbelleği
+    abstract_cache_ttl = fields.Integer(
+        string='Ekstre Önbellek Süresi (dakika)',
+        default=15,
+        help='Bu süreden eski ekstreler bir sonraki okumada BizimHesap\'tan yeniden çekilir',
+    )
+    abstract_prefetch_days = fields.Integer(
+        string='Ekstre Ön Yükleme (gün)',
+        default=7,
+        help='Son N günde hareketi olan carilerin geçersiz kılınmış/eskimiş ekstreleri arka planda yenilenir (0 = kapalı)',
+    )
     
     # Son senkronizasyon tarihleri
     last_sync_date = fields.Datetime(
@@ -429,6 +477,30 @@ class BizimHesapBackend(models.Model):
         """
         return self._api_request('GET', '/abstract/%s' % customer_id)
     
+    def get_abstract_cached(self, customer_id, partner=None, force=False):
+        """
+        Cari ekstresini önbellekten getir; yoksa/eskiyse canlı çek ve sakla.
+
+        :param customer_id: BizimHesap cari kodu
+        :param partner: res.partner (geçersiz kılma için önbellek kaydına bağlanır)
+        :param force: True ise önbellek yok sayılır
+        :return: dict — get_abstract ile aynı cevap
+        """
+        self.ensure_one()
+        Cache = self.env['bizimhesap.abstract.cache'].sudo()
+        if not force:
+            cache = Cache.search([
+                ('backend_id', '=', self.id),
+                ('customer_id', '=', str(customer_id)),
+            ], limit=1)
+            if cache and cache._is_fresh(self.abstract_cache_ttl):
+                return cache._get_response()
+
+        response = self.get_abstract(customer_id)
+        if response and response.get('resultCode') == 1:
+            Cache._store(self, customer_id, response, partner=partner)
+        return response
+
     # Inventory (Stok)
     def get_inventory(self, warehouse_id):
         """Belirli depodaki stok miktarlarını getir - B2B API"""
@@ -625,75 +697,238 @@ class BizimHesapBackend(models.Model):
             )
             raise UserError(_("Bağlantı hatası: %s") % (e,))
     
-    def action_sync_all(self):
-        """Tüm verileri senkronize et"""
+    def _get_sync_pipeline(self):
+        """
+        Toplu senkronizasyon adımları.
+
+        Her adım: (anahtar, bağımlı olduğu adımlar, önceden çekilecek endpoint'ler
+        ve metod argümanı eşlemesi, uygulama metodu). Uygulama sırası bağımlılıklara
+        göre belirlenir; bugünkü adımlar birbirinden bağımsızdır (ürün eşleştirmesi
+        kategori senkronizasyonunun sonucunu kullanmaz).
+        """
         self.ensure_one()
-        
-        total_created = total_updated = total_failed = 0
-        
-        # 1. Önce kategorileri senkronize et
-        try:
-            result = self.action_sync_categories()
-            _logger.info("Categories sync completed")
-        except Exception as e:
-            _logger.error("Category sync error: %s", e)
-        
-        # 2. Carileri senkronize et (Müşteri + Tedarikçi)
+        steps = [
+            ('categories', (), {'/categories': 'response'}, 'action_sync_categories'),
+        ]
         if self.sync_partner:
-            try:
-                self.action_sync_partners()
-            except Exception as e:
-                _logger.error("Partner sync error: %s", e)
-        
-        # 3. Ürünleri senkronize et
+            steps.append((
+                'partners', (),
+                {'/customers': 'customers_response', '/suppliers': 'suppliers_response'},
+                'action_sync_partners',
+            ))
         if self.sync_product:
+            steps.append((
+                'products', (), {'/products': 'response'}, 'action_sync_products',
+            ))
+        return steps
+
+    @staticmethod
+    def _sort_sync_pipeline(steps):
+        """Adımları bağımlılık sırasına diz (bağımlılığı olmayanlar önce)."""
+        ordered = []
+        done = set()
+        pending = list(steps)
+        while pending:
+            ready = [
+                step for step in pending
+                if all(dep in done or dep not in {s[0] for s in pending} for dep in step[1])
+            ]
+            if not ready:
+                # Döngüsel bağımlılık — kalanları tanımlandığı sırada uygula
+                ready = pending[:]
+            for step in ready:
+                ordered.append(step)
+                done.add(step[0])
+                pending.remove(step)
+        return ordered
+
+    def _prefetch_sync_payloads(self):
+        """
+        Tüm backend'lerin pipeline endpoint'lerini paralel çek.
+
+        HTTP istekleri ORM transaction'ı dışında bir thread havuzunda yapılır;
+        cevaplar ana thread'de loglanıp JSON'a çevrilir.
+
+        :return: {(backend_id, endpoint): dict veya None}; None = çekilemedi,
+                 uygulama adımı canlı isteğe geri düşer.
+        """
+        jobs = {}
+        for backend in self:
+            headers = backend._get_headers()
+            for step in backend._get_sync_pipeline():
+                for endpoint in step[2]:
+                    jobs[(backend.id, endpoint)] = (f"{backend.api_url}{endpoint}", headers)
+
+        if not jobs:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(SYNC_FETCH_WORKERS, len(jobs))) as pool:
+            futures = {
+                key: pool.submit(_fetch_endpoint, url, headers)
+                for key, (url, headers) in jobs.items()
+            }
+            raw_results = {key: future.result() for key, future in futures.items()}
+
+        payloads = {}
+        for (backend_id, endpoint), response in raw_results.items():
+            backend = self.browse(backend_id)
+            payloads[(backend_id, endpoint)] = backend._parse_prefetched_response(
+                endpoint, response,
+            )
+        return payloads
+
+    def _parse_prefetched_response(self, endpoint, response):
+        """Thread'de çekilen cevabı _api_request ile aynı şekilde logla ve çöz."""
+        self.ensure_one()
+        if isinstance(response, Exception):
+            _logger.warning("BizimHesap ön çekme hatası (%s): %s", endpoint, response)
+            self._create_log(
+                operation=f"GET {endpoint}",
+                status='error',
+                error_message=str(response),
+            )
+            return None
+
+        self._create_log(
+            operation=f"GET {endpoint}",
+            status='success' if response.ok else 'error',
+            response_data=response.text[:5000] if response.text else None,
+            status_code=response.status_code,
+        )
+        if not response.ok:
+            _logger.warning(
+                "BizimHesap ön çekme HTTP %s (%s)", response.status_code, endpoint,
+            )
+            return None
+        try:
+            return response.json() if response.content else {}
+        except ValueError as e:
+            _logger.warning("BizimHesap ön çekme JSON hatası (%s): %s", endpoint, e)
+            return None
+
+    def _run_sync_pipeline(self, payloads, commit=False):
+        """
+        Önceden çekilmiş verilerle pipeline adımlarını sırayla uygula.
+
+        Her adım kendi savepoint'inde çalışır; bir adımın hatası diğer
+        adımların yazdıklarını geri almaz. commit=True (yalnızca cron) ise
+        her adımdan sonra commit edilir; arayüzden çağrıldığında request
+        transaction'ı bölünmez. Adım
+        metodları veri alınamadığında hata fırlatır; hata geri alınan
+        adımın yerine ayrı bir log kaydı olarak yazılır. Bağımlı olduğu
+        adım başarısız olan adım atlanır.
+
+        :param commit: her adımdan sonra commit et (cron)
+        :return: {adım anahtarı: 'done' | 'failed' | 'skipped'}
+        """
+        self.ensure_one()
+        results = {}
+        for key, deps, endpoints, method in self._sort_sync_pipeline(self._get_sync_pipeline()):
+            failed_deps = [dep for dep in deps if results.get(dep) in ('failed', 'skipped')]
+            if failed_deps:
+                results[key] = 'skipped'
+                _logger.warning(
+                    "BizimHesap %s sync skipped (%s), failed dependencies: %s",
+                    key, self.name, ', '.join(failed_deps),
+                )
+                continue
+            kwargs = {
+                arg: payloads.get((self.id, endpoint))
+                for endpoint, arg in endpoints.items()
+            }
             try:
-                self.action_sync_products()
+                with self.env.cr.savepoint():
+                    getattr(self, method)(**kwargs)
+                if commit:
+                    self.env.cr.commit()
+                results[key] = 'done'
+                _logger.info("BizimHesap %s sync completed (%s)", key, self.name)
             except Exception as e:
-                _logger.error("Product sync error: %s", e)
-        
+                results[key] = 'failed'
+                _logger.error("BizimHesap %s sync error (%s): %s", key, self.name, e)
+                self._create_log(
+                    operation=f"Sync Pipeline: {key}",
+                    status='error',
+                    error_message=str(e),
+                )
+                if commit:
+                    self.env.cr.commit()
+        return results
+
+    def action_sync_all(self):
+        """
+        Tüm verileri senkronize et
+
+        1. Ağ istekleri (/categories, /customers, /suppliers, /products)
+           paralel çekilir.
+        2. Kategoriler, cariler ve ürünler sırayla, her biri ayrı savepoint'te
+           uygulanır.
+        """
+        self.ensure_one()
+
+        payloads = self._prefetch_sync_payloads()
+        results = self._run_sync_pipeline(payloads)
+
         self.last_sync_date = fields.Datetime.now()
-        
+
+        failed_steps = [key for key, state in results.items() if state != 'done']
+        if failed_steps:
+            message = _('Senkronizasyon tamamlandı, hatalı adımlar: %s') % ', '.join(failed_steps)
+        else:
+            message = _('Tüm veriler (kategoriler, cariler, ürünler) senkronize edildi.')
+
         return {
             'type': 'ir.actions.client',
             'tag': 'display_notification',
             'params': {
                 'title': _('Senkronizasyon Tamamlandı'),
-                'message': _('Tüm veriler (kategoriler, cariler, ürünler) senkronize edildi.'),
-                'type': 'success',
+                'message': message,
+                'type': 'warning' if failed_steps else 'success',
                 'sticky': False,
             }
         }
     
-    def action_sync_categories(self):
-        """Kategorileri senkronize et - B2B API"""
+    def _check_sync_response(self, response, entity):
+        """
+        Senkronizasyon cevabını doğrula; resultCode 1 değilse hata fırlat.
+
+        Toplu senkronizasyon hatayı yakalayıp adımı başarısız sayar.
+        """
+        if response.get('resultCode') != 1:
+            error_text = response.get('errorText', 'Bilinmeyen hata')
+            _logger.error("BizimHesap %s sync API error: %s", entity, error_text)
+            raise UserError(_("API Hatası: %s") % (error_text,))
+
+    def action_sync_categories(self, response=None):
+        """
+        Kategorileri senkronize et - B2B API
+
+        :param response: Önceden çekilmiş /categories cevabı (yoksa canlı istek yapılır)
+        """
         self.ensure_one()
         _logger.info("Starting category sync for %s", self.name)
         
         created = updated = 0
         
-        try:
+        if response is None:
             response = self.get_categories()
-            if response.get('resultCode') == 1:
-                categories = response.get('data', {}).get('categories', [])
-                _logger.info("Found %s categories from BizimHesap", len(categories))
-                
-                for cat_data in categories:
-                    cat_name = cat_data.get('title') or cat_data.get('name', 'Bilinmiyor')
-                    
-                    # Mevcut kategori ara
-                    existing = self.env['product.category'].search([
-                        ('name', '=', cat_name)
-                    ], limit=1)
-                    
-                    if not existing:
-                        # YENİ KAYIT İPTAL EDİLDİ: self.env['product.category'].create({'name': cat_name})
-                        created += 1
-                    else:
-                        updated += 1
-                        
-        except Exception as e:
-            _logger.error("Category sync error: %s", e)
+        self._check_sync_response(response, 'Category')
+        categories = response.get('data', {}).get('categories', [])
+        _logger.info("Found %s categories from BizimHesap", len(categories))
+        
+        for cat_data in categories:
+            cat_name = cat_data.get('title') or cat_data.get('name', 'Bilinmiyor')
+            
+            # Mevcut kategori ara
+            existing = self.env['product.category'].search([
+                ('name', '=', cat_name)
+            ], limit=1)
+            
+            if not existing:
+                # YENİ KAYIT İPTAL EDİLDİ: self.env['product.category'].create({'name': cat_name})
+                created += 1
+            else:
+                updated += 1
         
         self._create_log(
             operation='Sync Categories',
@@ -705,42 +940,42 @@ class BizimHesapBackend(models.Model):
         
         return {'created': created, 'updated': updated}
     
-    def action_sync_warehouses(self):
-        """Depoları senkronize et - B2B API"""
+    def action_sync_warehouses(self, response=None):
+        """
+        Depoları senkronize et - B2B API
+
+        :param response: Önceden çekilmiş /warehouses cevabı (yoksa canlı istek yapılır)
+        """
         self.ensure_one()
         _logger.info("Starting warehouse sync for %s", self.name)
         
         created = updated = 0
         
-        try:
+        if response is None:
             response = self.get_warehouses()
-            if response.get('resultCode') == 1:
-                warehouses = response.get('data', {}).get('warehouses', [])
-                _logger.info("Found %s warehouses from BizimHesap", len(warehouses))
-                
-                for wh_data in warehouses:
-                    wh_name = wh_data.get('title', 'Bilinmiyor')
-                    external_id = wh_data.get('id')
-                    
-                    # Mevcut depo ara
-                    existing = self.env['stock.warehouse'].search([
-                        ('name', '=', wh_name)
-                    ], limit=1)
-                    
-                    if not existing:
-                        # Kısa kod oluştur (ilk 5 karakter)
-                        code = wh_name[:5].upper().replace(' ', '')
-                        self.env['stock.warehouse'].create({
-                            'name': wh_name,
-                            'code': code,
-                            'company_id': self.company_id.id,
-                        })
-                        created += 1
-                    else:
-                        updated += 1
-                        
-        except Exception as e:
-            _logger.error("Warehouse sync error: %s", e)
+        self._check_sync_response(response, 'Warehouse')
+        warehouses = response.get('data', {}).get('warehouses', [])
+        _logger.info("Found %s warehouses from BizimHesap", len(warehouses))
+        
+        for wh_data in warehouses:
+            wh_name = wh_data.get('title', 'Bilinmiyor')
+            
+            # Mevcut depo ara
+            existing = self.env['stock.warehouse'].search([
+                ('name', '=', wh_name)
+            ], limit=1)
+            
+            if not existing:
+                # Kısa kod oluştur (ilk 5 karakter)
+                code = wh_name[:5].upper().replace(' ', '')
+                self.env['stock.warehouse'].create({
+                    'name': wh_name,
+                    'code': code,
+                    'company_id': self.company_id.id,
+                })
+                created += 1
+            else:
+                updated += 1
         
         self._create_log(
             operation='Sync Warehouses',
@@ -761,58 +996,61 @@ class BizimHesapBackend(models.Model):
             }
         }
     
-    def action_sync_partners(self):
+    def action_sync_partners(self, customers_response=None, suppliers_response=None):
         """
         Müşteri ve Tedarikçileri senkronize et - B2B API
         
         /customers ve /suppliers endpoint'lerinden veri çeker
+
+        :param customers_response: Önceden çekilmiş /customers cevabı (opsiyonel)
+        :param suppliers_response: Önceden çekilmiş /suppliers cevabı (opsiyonel)
         """
         self.ensure_one()
         _logger.info("Starting partner sync for %s", self.name)
         
         created = updated = failed = 0
         
+        # Her iki liste de alınamazsa adım başarısız sayılır (hata fırlatılır)
+        if customers_response is None:
+            customers_response = self.get_customers()
+        self._check_sync_response(customers_response, 'Customer')
+        if suppliers_response is None:
+            suppliers_response = self.get_suppliers()
+        self._check_sync_response(suppliers_response, 'Supplier')
+        
         # Müşterileri senkronize et
-        try:
-            response = self.get_customers()
-            if response.get('resultCode') == 1:
-                customers = response.get('data', {}).get('customers', [])
-                _logger.info("Found %s customers from BizimHesap", len(customers))
-                
-                for customer_data in customers:
-                    customer_data['contactType'] = 1  # Müşteri
-                    try:
-                        result = self._import_partner(customer_data)
-                        if result == 'created':
-                            created += 1
-                        elif result == 'updated':
-                            updated += 1
-                    except Exception as e:
-                        failed += 1
-                        _logger.error("Customer import error: %s", e)
-        except Exception as e:
-            _logger.error("Customer sync error: %s", e)
+        customers = customers_response.get('data', {}).get('customers', [])
+        _logger.info("Found %s customers from BizimHesap", len(customers))
+        
+        for customer_data in customers:
+            customer_data['contactType'] = 1  # Müşteri
+            try:
+                with self.env.cr.savepoint():
+                    result = self._import_partner(customer_data)
+                if result == 'created':
+                    created += 1
+                elif result == 'updated':
+                    updated += 1
+            except Exception as e:
+                failed += 1
+                _logger.error("Customer import error: %s", e)
         
         # Tedarikçileri senkronize et
-        try:
-            response = self.get_suppliers()
-            if response.get('resultCode') == 1:
-                suppliers = response.get('data', {}).get('suppliers', [])
-                _logger.info("Found %s suppliers from BizimHesap", len(suppliers))
-                
-                for supplier_data in suppliers:
-                    supplier_data['contactType'] = 2  # Tedarikçi
-                    try:
-                        result = self._import_partner(supplier_data)
-                        if result == 'created':
-                            created += 1
-                        elif result == 'updated':
-                            updated += 1
-                    except Exception as e:
-                        failed += 1
-                        _logger.error("Supplier import error: %s", e)
-        except Exception as e:
-            _logger.error("Supplier sync error: %s", e)
+        suppliers = suppliers_response.get('data', {}).get('suppliers', [])
+        _logger.info("Found %s suppliers from BizimHesap", len(suppliers))
+        
+        for supplier_data in suppliers:
+            supplier_data['contactType'] = 2  # Tedarikçi
+            try:
+                with self.env.cr.savepoint():
+                    result = self._import_partner(supplier_data)
+                if result == 'created':
+                    created += 1
+                elif result == 'updated':
+                    updated += 1
+            except Exception as e:
+                failed += 1
+                _logger.error("Supplier import error: %s", e)
         
         self.last_partner_sync = fields.Datetime.now()
         
@@ -1128,13 +1366,10 @@ class BizimHesapBackend(models.Model):
             'city': '',
             'ref': bh_ref,
         }
-        all_partners = Partner.search_read(
-            [('active', '=', True)],
-            ['id', 'name', 'vat', 'phone', 'email', 'street', 'city', 'parent_id', 'ref']
-        )
         match = {'match_type': 'new'}
         if SYNC_PROTOCOLS:
-            match = SYNC_PROTOCOLS.match_partner(source_partner, all_partners)
+            candidates = self._search_partner_candidates(source_partner)
+            match = SYNC_PROTOCOLS.match_partner(source_partner, candidates)
 
         if match['match_type'] == 'exact':
             # Kesin eşleşme - VKN/Telefon/E-posta ile bulundu
@@ -1538,44 +1773,39 @@ class BizimHesapBackend(models.Model):
             }
         }
 
-    def action_sync_products(self):
+    def action_sync_products(self, response=None):
         """
         Ürünleri senkronize et - B2B API formatı
         
         B2B API /products endpoint'i tek seferde tüm ürünleri döndürür.
+
+        :param response: Önceden çekilmiş /products cevabı (yoksa canlı istek yapılır)
         """
         self.ensure_one()
         _logger.info("Starting product sync for %s", self.name)
         
         created = updated = failed = 0
         
-        try:
+        if response is None:
             response = self.get_products()
-            
-            # B2B API response formatı: {"resultCode": 1, "data": {"products": [...]}}
-            if response.get('resultCode') == 1:
-                products = response.get('data', {}).get('products', [])
-                
-                _logger.info("Found %s products from BizimHesap", len(products))
-                
-                for product_data in products:
-                    try:
-                        result = self._import_product(product_data)
-                        if result == 'created':
-                            created += 1
-                        elif result == 'updated':
-                            updated += 1
-                    except Exception as e:
-                        failed += 1
-                        _logger.error("Product import error: %s", e)
-            else:
-                error_text = response.get('errorText', 'Bilinmeyen hata')
-                _logger.error("BizimHesap API error: %s", error_text)
-                raise UserError(_("API Hatası: %s") % (error_text,))
-                
-        except Exception as e:
-            _logger.error("Product sync error: %s", e)
-            raise
+        
+        # B2B API response formatı: {"resultCode": 1, "data": {"products": [...]}}
+        self._check_sync_response(response, 'Product')
+        products = response.get('data', {}).get('products', [])
+        
+        _logger.info("Found %s products from BizimHesap", len(products))
+        
+        for product_data in products:
+            try:
+                with self.env.cr.savepoint():
+                    result = self._import_product(product_data)
+                if result == 'created':
+                    created += 1
+                elif result == 'updated':
+                    updated += 1
+            except Exception as e:
+                failed += 1
+                _logger.error("Product import error: %s", e)
         
         self.last_product_sync = fields.Datetime.now()
         
@@ -1667,7 +1897,8 @@ class BizimHesapBackend(models.Model):
         }
         all_products = self.env['product.product'].search_read(
             [],
-            ['id', 'name', 'default_code', 'barcode', 'product_tmpl_id']
+            ['id', 'name', 'default_code', 'barcode', 'product_tmpl_id',
+             'bizimhesap_barcode_key', 'bizimhesap_code_key']
         )
         match = {'match_type': 'new'}
         if SYNC_PROTOCOLS:
@@ -1986,6 +2217,7 @@ class BizimHesapBackend(models.Model):
                 return 'skipped'
         
         invoice = self.env['account.move'].create(invoice_vals)
+        self.env['bizimhesap.abstract.cache'].invalidate_partners(invoice.partner_id)
         
         self.env['bizimhesap.invoice.binding'].create({
             'backend_id': self.id,
@@ -2229,39 +2461,7 @@ class BizimHesapBackend(models.Model):
         # API'ye gönder
         try:
             response = self._api_request('POST', '/addinvoice', data=data)
-            
-            if response.get('error'):
-                raise UserError(_("BizimHesap Hata: %s") % (response.get('error'),))
-            
-            guid = response.get('guid')
-            url = response.get('url')
-            
-            # Faturayı güncelle
-            invoice.write({
-                'bizimhesap_guid': guid,
-                'bizimhesap_url': url,
-                'bizimhesap_sent_date': fields.Datetime.now(),
-            })
-            
-            # Binding oluştur
-            self.env['bizimhesap.invoice.binding'].create({
-                'backend_id': self.id,
-                'external_id': guid,
-                'odoo_id': invoice.id,
-                'sync_date': fields.Datetime.now(),
-                'external_data': json.dumps(data),
-            })
-            
-            # Log
-            self._create_log(
-                operation='Export Invoice',
-                status='success',
-                records_created=1,
-                message=f"Fatura {invoice.name} BizimHesap'a gönderildi: {guid}",
-            )
-            
-            _logger.info("Invoice %s exported successfully: %s", invoice.name, guid)
-            return response
+            return self._finalize_invoice_export(invoice, data, response)
             
         except Exception as e:
             _logger.error("Invoice export error: %s", e)
@@ -2272,7 +2472,197 @@ class BizimHesapBackend(models.Model):
                 message=f"Fatura {invoice.name} gönderilemedi: {str(e)}",
             )
             raise UserError(_("Fatura gönderilemedi: %s") % (str(e),))
+
+    def _finalize_invoice_export(self, invoice, data, response):
+        """/addinvoice cevabını faturaya ve binding'e işle."""
+        if response.get('error'):
+            raise UserError(_("BizimHesap Hata: %s") % (response.get('error'),))
+        
+        guid = response.get('guid')
+        url = response.get('url')
+        
+        # Faturayı güncelle
+        invoice.write({
+            'bizimhesap_guid': guid,
+            'bizimhesap_url': url,
+            'bizimhesap_sent_date': fields.Datetime.now(),
+        })
+        
+        # Binding oluştur
+        self.env['bizimhesap.invoice.binding'].create({
+            'backend_id': self.id,
+            'external_id': guid,
+            'odoo_id': invoice.id,
+            'sync_date': fields.Datetime.now(),
+            'external_data': json.dumps(data),
+        })
+        
+        self.env['bizimhesap.abstract.cache'].invalidate_partners(invoice.partner_id)
+
+        # Log
+        self._create_log(
+            operation='Export Invoice',
+            status='success',
+            records_created=1,
+            message=f"Fatura {invoice.name} BizimHesap'a gönderildi: {guid}",
+        )
+        
+        _logger.info("Invoice %s exported successfully: %s", invoice.name, guid)
+        return response
+
+    # ═══════════════════════════════════════════════════════════════
+    # GİDEN KUYRUK (EXPORT QUEUE)
+    # ═══════════════════════════════════════════════════════════════
+
+    @api.model
+    def _get_export_queue_backends(self):
+        """Değişiklikleri kuyruğa alan aktif backend'ler."""
+        return self.sudo().search([
+            ('active', '=', True),
+            ('state', '=', 'connected'),
+            ('export_on_change', '=', True),
+            ('sync_direction', 'in', ('export', 'both')),
+        ])
+
+    def enqueue_export(self, export_type, records):
+        """
+        Kayıtları BizimHesap'a gönderilmek üzere kuyruğa al.
+
+        :param export_type: 'partner' | 'product' | 'invoice'
+        :param records: gönderilecek kayıtlar
+        """
+        Queue = self.env['bizimhesap.export.queue'].sudo()
+        jobs = Queue.browse()
+        for backend in self:
+            jobs |= Queue.enqueue(backend, export_type, records)
+        return jobs
+
+    def _prepare_export_request(self, export_type, record):
+        """
+        Kuyruk işi için gönderilecek isteği hazırla (ana thread'de, ORM ile).
+
+        B2B API'de cari ve ürün yazma endpoint'i yoktur (create_contact /
+        update_contact / create_product / update_product işlem yapmaz); bu
+        tiplerde HTTP isteği gerekmez ve None döner. Gönderilmiş veya
+        onaylanmamış faturalar için de istek yapılmaz.
+
+        :return: (endpoint, data) veya None
+        """
+        if export_type == 'partner':
+            self.export_partner(record)
+            return None
+        if export_type == 'product':
+            self.export_product(record)
+            return None
+        if record.bizimhesap_guid or record.state != 'posted':
+            return None
+        return '/addinvoice', self._map_invoice_to_bizimhesap(record)
+
+    def _finalize_export(self, export_type, record, data, response):
+        """Başarılı gönderimin cevabını işle (ana thread'de)."""
+        if export_type == 'invoice':
+            self._finalize_invoice_export(record, data, response)
+
+    def _process_export_jobs(self, jobs):
+        """
+        Bir backend'e ait kuyruk işlerini gönder.
+
+        Tüm tipler (cari, ürün, fatura) aynı üç aşamadan geçer: istekler ana
+        thread'de hazırlanır, HTTP istekleri backend'in eşzamanlılık
+        limitiyle thread havuzunda yapılır, sonuçlar yine ana thread'de her
+        iş için ayrı savepoint içinde işlenir.
+
+        İşler buraya _cron_process_queue tarafından 'running' durumuna
+        alınıp commit edilmiş olarak gelir.
+        """
+        self.ensure_one()
+
+        requests_to_send = {}
+        for job in jobs:
+            record = job._get_record()
+            if not record:
+                job._mark_done()
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    request = self._prepare_export_request(job.export_type, record)
+            except Exception as e:
+                _logger.warning("BizimHesap export job %s failed: %s", job.dedup_key, e)
+                job._mark_failed(e)
+                continue
+            if request:
+                requests_to_send[job] = (record,) + request
+            else:
+                job._mark_done()
+
+        if not requests_to_send:
+            return
+
+        headers = self._get_headers()
+        workers = max(1, min(self.export_concurrency or 1, len(requests_to_send)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                job: pool.submit(_post_endpoint, f"{self.api_url}{endpoint}", headers, data)
+                for job, (_record, endpoint, data) in requests_to_send.items()
+            }
+            responses = {job: future.result() for job, future in futures.items()}
+
+        for job, response in responses.items():
+            record, endpoint, data = requests_to_send[job]
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                self._create_log(
+                    operation=f'POST {endpoint}',
+                    status='success' if response.ok else 'error',
+                    request_data=json.dumps(data),
+                    response_data=response.text[:5000] if response.text else None,
+                    status_code=response.status_code,
+                )
+                response.raise_for_status()
+                with self.env.cr.savepoint():
+                    self._finalize_export(
+                        job.export_type, record, data,
+                        response.json() if response.content else {},
+                    )
+                job._mark_done()
+            except Exception as e:
+                _logger.warning("BizimHesap export %s failed: %s", job.dedup_key, e)
+                self._create_log(
+                    operation=f'Export {job.export_type}',
+                    status='error',
+                    records_failed=1,
+                    message=f"{record.display_name} gönderilemedi: {str(e)}",
+                )
+                job._mark_failed(e)
     
+    def _search_partner_candidates(self, source_partner):
+        """
+        Protokol eşleştirmesi için aday cariler.
+
+        Tüm carileri yükleyip Python'da taramak yerine indexli normalize
+        anahtarlar (VKN, telefon, firma adı), e-posta ve cari kodu ile aranır.
+        İsim benzerliği/şube tespiti bu adaylar üzerinde yapılır.
+        """
+        email = (source_partner.get('email') or '').strip()
+        keys = [
+            ('bizimhesap_vat_key', '=', SYNC_PROTOCOLS.normalize_vat(source_partner.get('vat'))),
+            ('bizimhesap_phone_key', '=', SYNC_PROTOCOLS.normalize_phone(source_partner.get('phone'))),
+            ('bizimhesap_name_key', '=', SYNC_PROTOCOLS.normalize_company_name(
+                (source_partner.get('name') or '').strip())),
+            ('email', '=ilike', email),
+            ('ref', '=', source_partner.get('ref')),
+        ]
+        leaves = [leaf for leaf in keys if leaf[2]]
+        if not leaves:
+            return []
+        domain = [('active', '=', True)] + ['|'] * (len(leaves) - 1) + leaves
+        return self.env['res.partner'].search_read(
+            domain,
+            ['id', 'name', 'vat', 'phone', 'mobile', 'email', 'street', 'city', 'parent_id', 'ref',
+             'bizimhesap_vat_key', 'bizimhesap_phone_key', 'bizimhesap_name_key'],
+        )
+
     def _map_invoice_to_bizimhesap(self, invoice):
         """
         Odoo account.move → BizimHesap fatura dönüşümü
@@ -2392,16 +2782,29 @@ class BizimHesapBackend(models.Model):
     
     @api.model
     def _cron_sync_all(self):
-        """Otomatik senkronizasyon cron job"""
+        """
+        Otomatik senkronizasyon cron job
+
+        Tüm backend'lerin verileri tek bir thread havuzunda paralel çekilir,
+        ardından her backend kendi pipeline'ını bağımsız transaction'larla uygular.
+        """
         backends = self.search([
             ('active', '=', True),
             ('state', '=', 'connected'),
             ('auto_sync', '=', True),
         ])
-        
+
+        try:
+            payloads = backends._prefetch_sync_payloads()
+        except Exception as e:
+            _logger.error("Cron prefetch failed: %s", e)
+            payloads = {}
+
         for backend in backends:
             try:
-                backend.action_sync_all()
+                backend._run_sync_pipeline(payloads, commit=True)
+                backend.last_sync_date = fields.Datetime.now()
+                self.env.cr.commit()
             except Exception as e:
                 _logger.error("Cron sync failed for %s: %s", backend.name, e)
     
@@ -2518,11 +2921,14 @@ class BizimHesapBackend(models.Model):
     # ABSTRACT — CARİ EKSTRESI (API Dok. /abstract/{musteri-id})
     # ═══════════════════════════════════════════════════════════════
 
-    def action_sync_partner_abstract(self, partner):
+    def action_sync_partner_abstract(self, partner, force=False):
         """
         Tek bir partnerin cari ekstresini BizimHesap'tan çek ve bakiyeyi güncelle.
 
+        Ekstre abstract_cache_ttl süresi boyunca önbellekten okunur.
+
         :param partner: res.partner kaydı
+        :param force: True ise önbellek atlanıp canlı istek yapılır
         :return: API cevabı dict veya {}
         """
         self.ensure_one()
@@ -2540,7 +2946,7 @@ class BizimHesapBackend(models.Model):
             return {}
 
         try:
-            response = self.get_abstract(binding.external_id)
+            response = self.get_abstract_cached(binding.external_id, partner=partner, force=force)
         except Exception as e:
             _logger.warning("get_abstract hatası (partner=%s): %s", partner.name, e)
             return {}
@@ -2587,3 +2993,64 @@ class BizimHesapBackend(models.Model):
 
         _logger.info("Abstract synced for partner %s (id=%s)", partner.name, binding.external_id)
         return response
+
+    @api.model
+    def _cron_prefetch_abstracts(self):
+        """
+        Son günlerde hareketi olan carilerin ekstrelerini arka planda önceden çek.
+
+        Son abstract_prefetch_days gün içinde onaylı faturası/ödemesi olan
+        eşleşmiş cariler seçilir; önbelleği taze olanlar atlanır. İstekler
+        thread havuzunda paralel yapılır, cevaplar ana thread'de önbelleğe
+        yazılır.
+        """
+        backends = self.search([
+            ('active', '=', True),
+            ('state', '=', 'connected'),
+            ('abstract_prefetch_days', '>', 0),
+        ])
+        Cache = self.env['bizimhesap.abstract.cache'].sudo()
+
+        for backend in backends:
+            since = fields.Datetime.now() - timedelta(days=backend.abstract_prefetch_days)
+            active_partners = self.env['account.move']._read_group([
+                ('state', '=', 'posted'),
+                ('commercial_partner_id', '!=', False),
+                ('write_date', '>=', since),
+            ], ['commercial_partner_id'])
+            bindings = self.env['bizimhesap.partner.binding'].search([
+                ('backend_id', '=', backend.id),
+                ('odoo_id', 'in', [partner.id for partner, in active_partners]),
+            ])
+            fresh = set(Cache.search([
+                ('backend_id', '=', backend.id),
+                ('customer_id', 'in', bindings.mapped('external_id')),
+                ('is_stale', '=', False),
+                ('fetch_date', '>=', fields.Datetime.now() - timedelta(minutes=backend.abstract_cache_ttl)),
+            ]).mapped('customer_id'))
+            todo = bindings.filtered(lambda b: b.external_id not in fresh)
+            if not todo:
+                continue
+
+            headers = backend._get_headers()
+            with ThreadPoolExecutor(max_workers=min(SYNC_FETCH_WORKERS, len(todo))) as pool:
+                futures = {
+                    binding: pool.submit(
+                        _fetch_endpoint,
+                        f"{backend.api_url}/abstract/{binding.external_id}",
+                        headers,
+                    )
+                    for binding in todo
+                }
+                responses = {binding: future.result() for binding, future in futures.items()}
+
+            stored = 0
+            for binding, response in responses.items():
+                data = backend._parse_prefetched_response(
+                    '/abstract/%s' % binding.external_id, response,
+                )
+                if data and data.get('resultCode') == 1:
+                    Cache._store(backend, binding.external_id, data, partner=binding.odoo_id)
+                    stored += 1
+            self.env.cr.commit()
+            _logger.info("BizimHesap abstract prefetch (%s): %s/%s", backend.name, stored, len(todo))
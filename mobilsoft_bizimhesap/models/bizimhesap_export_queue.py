@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api
+from odoo.tools import SQL
+import logging
+from datetime import timedelta
+
+_logger = logging.getLogger(__name__)
+
+# Bir işin kalıcı olarak 'failed' durumuna düşmeden önceki deneme sayısı
+EXPORT_MAX_ATTEMPTS = 5
+
+# Cron başına işlenecek en fazla iş sayısı
+EXPORT_BATCH_SIZE = 300
+
+# Bu süreden uzun 'running' kalan iş yarıda kalmış (worker öldü) sayılır
+EXPORT_STALE_MINUTES = 60
+
+EXPORT_MODELS = {
+    'partner': 'res.partner',
+    'product': 'product.product',
+    'invoice': 'account.move',
+}
+
+
+class BizimHesapExportQueue(models.Model):
+    """
+    BizimHesap Giden Kuyruk (Odoo → BizimHesap)
+
+    export_partner / export_product / export_invoice çağrıları kullanıcı
+    isteği içinde yapılmak yerine buraya yazılır. Aynı kayıt için bekleyen
+    iş varsa yenisi açılmaz (dedup_key); payload gönderim anında kaydın son
+    halinden üretildiği için sonraki düzenlemeler tek gönderimde birleşir.
+
+    Birleştirme yalnızca 'pending' işlerle yapılır: gönderimi süren
+    ('running') bir iş payload'ını zaten üretmiştir, o sırada gelen
+    düzenleme yeni bir bekleyen iş açar ve kaybolmaz.
+    """
+    _name = 'bizimhesap.export.queue'
+    _description = 'BizimHesap Export Queue'
+    _order = 'next_attempt_date, id'
+    _rec_name = 'dedup_key'
+
+    backend_id = fields.Many2one(
+        'bizimhesap.backend',
+        string='Backend',
+        required=True,
+        ondelete='cascade',
+        index=True,
+    )
+
+    export_type = fields.Selection([
+        ('partner', 'Cari'),
+        ('product', 'Ürün'),
+        ('invoice', 'Fatura'),
+    ], string='Tip', required=True)
+
+    res_id = fields.Integer(string='Kayıt ID', required=True)
+
+    dedup_key = fields.Char(
+        string='Tekil Anahtar',
+        required=True,
+        index=True,
+        help='backend:tip:kayıt — bekleyen aynı anahtarlı iş varsa yenisi açılmaz',
+    )
+
+    state = fields.Selection([
+        ('pending', 'Bekliyor'),
+        ('running', 'Gönderiliyor'),
+        ('done', 'Gönderildi'),
+        ('failed', 'Başarısız'),
+    ], string='Durum', default='pending', required=True, index=True)
+
+    enqueue_count = fields.Integer(
+        string='Birleştirilen Değişiklik',
+        default=1,
+        help='Gönderimden önce bu işte birleştirilen değişiklik sayısı',
+    )
+    attempt_count = fields.Integer(string='Deneme', default=0)
+    next_attempt_date = fields.Datetime(
+        string='Sonraki Deneme',
+        default=fields.Datetime.now,
+        index=True,
+    )
+    done_date = fields.Datetime(string='Gönderim Tarihi')
+    last_error = fields.Text(string='Son Hata')
+
+    _dedup_key_pending_uniq = models.UniqueIndex(
+        "(dedup_key) WHERE state = 'pending'",
+        'Bu kayıt için zaten bekleyen bir gönderim işi var!',
+    )
+
+    @api.model
+    def _make_dedup_key(self, backend, export_type, res_id):
+        return '%s:%s:%s' % (backend.id, export_type, res_id)
+
+    @api.model
+    def enqueue(self, backend, export_type, records):
+        """
+        Kayıtları gönderim kuyruğuna ekle.
+
+        Bekleyen işi olan kayıtlar için yeni iş açılmaz; mevcut işin
+        enqueue_count değeri artırılır (coalesce). Tek bir
+        INSERT ... ON CONFLICT DO UPDATE ile yapılır: aynı kaydı eşzamanlı
+        kuyruğa alan iki istek tekil indekse takılıp fatura onayını veya
+        cari kaydını hataya düşürmez.
+
+        :param backend: bizimhesap.backend kaydı
+        :param export_type: 'partner' | 'product' | 'invoice'
+        :param records: gönderilecek Odoo kayıtları
+        :return: ilgili kuyruk işleri
+        """
+        if not records:
+            return self.browse()
+
+        now = fields.Datetime.now()
+        uid = self.env.uid
+        self.flush_model()
+        self.env.cr.execute(SQL(
+            """
+            INSERT INTO bizimhesap_export_queue
+                (backend_id, export_type, res_id, dedup_key, state, enqueue_count,
+                 attempt_count, next_attempt_date, create_uid, create_date,
+                 write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (dedup_key) WHERE state = 'pending'
+            DO UPDATE SET enqueue_count = bizimhesap_export_queue.enqueue_count + 1,
+                          write_uid = EXCLUDED.write_uid,
+                          write_date = EXCLUDED.write_date
+            RETURNING id, (xmax = 0) AS inserted
+            """,
+            SQL(", ").join(
+                SQL(
+                    "(%s, %s, %s, %s, 'pending', 1, 0, %s, %s, %s, %s, %s)",
+                    backend.id, export_type, rec_id,
+                    self._make_dedup_key(backend, export_type, rec_id),
+                    now, uid, now, uid, now,
+                )
+                for rec_id in records.ids
+            ),
+        ))
+        rows = self.env.cr.fetchall()
+        self.invalidate_model(['enqueue_count', 'write_uid', 'write_date'])
+        if any(inserted for _job_id, inserted in rows):
+            self.env.ref('mobilsoft_bizimhesap.ir_cron_bizimhesap_export_queue')._trigger()
+        return self.browse([job_id for job_id, _inserted in rows])
+
+    def _get_record(self):
+        """Kuyruk işinin hedef Odoo kaydı (silinmişse boş recordset)."""
+        self.ensure_one()
+        return self.env[EXPORT_MODELS[self.export_type]].browse(self.res_id).exists()
+
+    def _mark_done(self):
+        self.write({
+            'state': 'done',
+            'done_date': fields.Datetime.now(),
+            'last_error': False,
+        })
+
+    def _get_superseded(self):
+        """
+        Aynı anahtarla yeni bir bekleyen işi olan işler.
+
+        Bunlar yeniden 'pending' yapılamaz (tekil indeks); kaydın son hali
+        zaten bekleyen iş ile gönderilecektir.
+        """
+        if not self:
+            return self
+        pending_keys = set(self.search([
+            ('dedup_key', 'in', self.mapped('dedup_key')),
+            ('state', '=', 'pending'),
+            ('id', 'not in', self.ids),
+        ]).mapped('dedup_key'))
+        return self.filtered(lambda j: j.dedup_key in pending_keys)
+
+    def _mark_failed(self, error):
+        """Hata sonrası üstel geri çekilme ile yeniden planla."""
+        superseded = self._get_superseded()
+        for job in self:
+            attempts = job.attempt_count + 1
+            vals = {
+                'attempt_count': attempts,
+                'last_error': str(error),
+            }
+            if attempts >= EXPORT_MAX_ATTEMPTS or job in superseded:
+                vals['state'] = 'failed'
+            else:
+                vals['state'] = 'pending'
+                vals['next_attempt_date'] = fields.Datetime.now() + timedelta(minutes=2 ** attempts)
+            job.write(vals)
+
+    def action_retry(self):
+        """Başarısız işleri yeniden kuyruğa al"""
+        failed = self.filtered(lambda j: j.state == 'failed')
+        (failed - failed._get_superseded()).write({
+            'state': 'pending',
+            'attempt_count': 0,
+            'next_attempt_date': fields.Datetime.now(),
+        })
+        self.env.ref('mobilsoft_bizimhesap.ir_cron_bizimhesap_export_queue')._trigger()
+
+    @api.model
+    def _cron_process_queue(self):
+        """
+        Kuyruğu boşalt: zamanı gelen işleri backend bazında grupla ve
+        her backend'in eşzamanlılık limitiyle gönder.
+
+        İşler HTTP gönderiminden önce 'running' olarak commit edilir; böylece
+        gönderim sürerken yapılan enqueue çağrıları bu satırlarda beklemez,
+        yeni bir bekleyen iş açar.
+        """
+        stale = self.search([
+            ('state', '=', 'running'),
+            ('write_date', '<', fields.Datetime.now() - timedelta(minutes=EXPORT_STALE_MINUTES)),
+        ])
+        if stale:
+            stale._mark_failed('Gönderim yarıda kaldı')
+            self.env.cr.commit()
+
+        jobs = self.search([
+            ('state', '=', 'pending'),
+            ('next_attempt_date', '<=', fields.Datetime.now()),
+        ], limit=EXPORT_BATCH_SIZE)
+        if not jobs:
+            return
+        jobs.write({'state': 'running'})
+        self.env.cr.commit()
+
+        for backend in jobs.backend_id:
+            backend_jobs = jobs.filtered(lambda j: j.backend_id == backend)
+            try:
+                backend._process_export_jobs(backend_jobs)
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error("BizimHesap export queue failed for %s: %s", backend.name, e)
+                backend_jobs._mark_failed(e)
+                self.env.cr.commit()
@@ -2,6 +2,8 @@
 
 from odoo import models, fields, api, _
 
+from .sync_protocols import SyncProtocols
+
 
 class ProductProduct(models.Model):
     """
@@ -21,11 +23,57 @@ class ProductProduct(models.Model):
         string='BizimHesap Senkronize',
         store=False,  # CRITICAL: store=True constraint violation'a neden oluyor
     )
+
+    # Eşleştirme anahtarları (SyncProtocols normalizasyonu, yazımda güncellenir)
+    bizimhesap_barcode_key = fields.Char(
+        string='Normalize Barkod',
+        compute='_compute_bizimhesap_match_keys',
+        store=True,
+        index=True,
+    )
+    bizimhesap_code_key = fields.Char(
+        string='Normalize Ürün Kodu',
+        compute='_compute_bizimhesap_match_keys',
+        store=True,
+        index=True,
+    )
+
+    @api.depends('barcode', 'default_code')
+    def _compute_bizimhesap_match_keys(self):
+        for product in self:
+            product.bizimhesap_barcode_key = SyncProtocols.normalize_barcode(product.barcode)
+            product.bizimhesap_code_key = SyncProtocols.normalize_product_code(product.default_code)
     
     @api.depends('bizimhesap_binding_ids')
     def _compute_bizimhesap_synced(self):
         for record in self:
             record.bizimhesap_synced = bool(record.bizimhesap_binding_ids)
+
+    # BizimHesap'a gönderilen alanlar (_map_product_to_bizimhesap)
+    _BIZIMHESAP_EXPORT_FIELDS = {
+        'default_code', 'name', 'description_sale', 'uom_id', 'taxes_id',
+        'standard_price', 'list_price', 'type',
+    }
+
+    def write(self, vals):
+        fnames = set()
+        if self.env.context.get('sync_source') != 'bizimhesap':
+            fnames = self._BIZIMHESAP_EXPORT_FIELDS.intersection(vals)
+        before = {
+            product.id: {fname: product[fname] for fname in fnames}
+            for product in self
+        } if fnames else {}
+        res = super().write(vals)
+        # Sadece gönderilen alanlardan biri gerçekten değişen ürünler kuyruğa alınır
+        changed = self.filtered(lambda p: p.id in before and any(
+            p[fname] != value for fname, value in before[p.id].items()
+        ))
+        if changed:
+            backends = self.env['bizimhesap.backend']._get_export_queue_backends()
+            backends = backends.filtered('sync_product')
+            if backends:
+                backends.enqueue_export('product', changed)
+        return res
     
     def action_sync_to_bizimhesap(self):
         """Manuel olarak BizimHesap'a gönder"""
@@ -3,6 +3,8 @@
 from odoo import models, fields, api, _
 import logging
 
+from .sync_protocols import SyncProtocols
+
 _logger = logging.getLogger(__name__)
 
 
@@ -71,7 +73,42 @@ class ResPartner(models.Model):
                         for field in protected_updates:
                             vals.pop(field, None)
 
-        return super().write(vals)
+        before = self._bizimhesap_export_snapshot(vals)
+        res = super().write(vals)
+        self._enqueue_bizimhesap_export(before)
+        return res
+
+    # BizimHesap'a gönderilen alanlar (_map_partner_to_bizimhesap)
+    _BIZIMHESAP_EXPORT_FIELDS = {
+        'name', 'ref', 'vat', 'street', 'city', 'zip', 'phone', 'mobile',
+        'email', 'website', 'comment', 'customer_rank', 'supplier_rank',
+    }
+
+    def _bizimhesap_export_snapshot(self, vals):
+        """
+        write() öncesi, vals içindeki gönderilen alanların mevcut değerleri.
+
+        :return: {partner_id: {alan: değer}} — gönderilen alan yazılmıyorsa
+            veya değişiklik BizimHesap'tan geliyorsa boş sözlük
+        """
+        if self.env.context.get('sync_source') == 'bizimhesap':
+            return {}
+        fnames = self._BIZIMHESAP_EXPORT_FIELDS.intersection(vals)
+        if not fnames:
+            return {}
+        return {partner.id: {fname: partner[fname] for fname in fnames} for partner in self}
+
+    def _enqueue_bizimhesap_export(self, before):
+        """Gönderilen alanlardan biri gerçekten değişen carileri giden kuyruğa al."""
+        changed = self.filtered(lambda p: p.id in before and any(
+            p[fname] != value for fname, value in before[p.id].items()
+        ))
+        if not changed:
+            return
+        backends = self.env['bizimhesap.backend']._get_export_queue_backends()
+        backends = backends.filtered('sync_partner')
+        if backends:
+            backends.enqueue_export('partner', changed)
 
     bizimhesap_binding_ids = fields.One2many(
         'bizimhesap.partner.binding',
@@ -117,6 +154,26 @@ class ResPartner(models.Model):
         readonly=True,
     )
 
+    # Eşleştirme anahtarları (SyncProtocols normalizasyonu, yazımda güncellenir)
+    bizimhesap_vat_key = fields.Char(
+        string='Normalize VKN',
+        compute='_compute_bizimhesap_match_keys',
+        store=True,
+        index=True,
+    )
+    bizimhesap_phone_key = fields.Char(
+        string='Normalize Telefon',
+        compute='_compute_bizimhesap_match_keys',
+        store=True,
+        index=True,
+    )
+    bizimhesap_name_key = fields.Char(
+        string='Normalize Firma Adı',
+        compute='_compute_bizimhesap_match_keys',
+        store=True,
+        index=True,
+    )
+
     # Vergiden muafiyet (Joker Tedarik yönlendirmesi için)
     is_tax_exempt = fields.Boolean(
         string='Vergiden Muaf',
@@ -240,6 +297,17 @@ class ResPartner(models.Model):
                 partner.bizimhesap_invoice_residual
             )
 
+    @api.depends('vat', 'phone', 'mobile', 'name')
+    def _compute_bizimhesap_match_keys(self):
+        for partner in self:
+            partner.bizimhesap_vat_key = SyncProtocols.normalize_vat(partner.vat)
+            partner.bizimhesap_phone_key = SyncProtocols.normalize_phone(
+                partner.phone or partner.mobile
+            )
+            partner.bizimhesap_name_key = SyncProtocols.normalize_company_name(
+                (partner.name or '').strip()
+            )
+
     @api.depends('bizimhesap_binding_ids')
     def _compute_bizimhesap_synced(self):
         for record in self:
@@ -15,6 +15,7 @@ Kurallar:
 import re
 from datetime import datetime
 from difflib import SequenceMatcher
+from functools import lru_cache
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -66,6 +67,17 @@ class SyncProtocols:
         'sarıyer', 'silivri', 'sultanbeyli', 'sultangazi', 'şile', 'şişli',
         'tuzla', 'ümraniye', 'üsküdar', 'zeytinburnu'
     ]
+
+    # Tek geçişte tüm adayları bulan derlenmiş eşleştiriciler.
+    # Lookahead sayesinde iç içe geçen adlar (eyüp / eyüpsultan) da yakalanır;
+    # alternasyon sırası liste sırasıyla aynıdır.
+    _DISTRICT_RE = re.compile('(?=(%s))' % '|'.join(map(re.escape, ISTANBUL_DISTRICTS)))
+    _CITY_RE = re.compile('(?=(%s))' % '|'.join(map(re.escape, TURKEY_CITIES)))
+    _DISTRICT_ORDER = dict(zip(ISTANBUL_DISTRICTS, range(len(ISTANBUL_DISTRICTS))))
+    _CITY_ORDER = dict(zip(TURKEY_CITIES, range(len(TURKEY_CITIES))))
+
+    # Normalizasyon sonuçları için süreç içi önbellek boyutu
+    NORMALIZE_CACHE_SIZE = 65536
     
     # ═══════════════════════════════════════════════════════════════
     # TARİH KARŞILAŞTIRMA - EN GÜNCEL VERİ KAZANIR
@@ -151,6 +163,7 @@ class SyncProtocols:
     # ═══════════════════════════════════════════════════════════════
     
     @staticmethod
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
     def normalize_phone(phone):
         """Telefon numarasını normalize et: +90 5XX XXX XXXX"""
         if not phone:
@@ -167,6 +180,7 @@ class SyncProtocols:
         return '+' + digits if digits else None
     
     @staticmethod
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
     def normalize_vat(vat):
         """
         Vergi numarasını normalize et
@@ -239,6 +253,7 @@ class SyncProtocols:
         return norm1.lstrip('0') == norm2.lstrip('0')
     
     @staticmethod
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
     def normalize_company_name(name):
         """Firma adını normalize et (karşılaştırma için)"""
         if not name:
@@ -260,6 +275,7 @@ class SyncProtocols:
         return name
     
     @staticmethod
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
     def normalize_barcode(barcode):
         """Barkodu normalize et"""
         if not barcode:
@@ -285,25 +301,46 @@ class SyncProtocols:
         str2 = str(str2).lower().strip()
         return SequenceMatcher(None, str1, str2).ratio()
     
+    @staticmethod
+    def _first_listed_match(pattern, order, text):
+        """Metinde geçen adlardan listede en önce geleni döndür."""
+        found = {match.group(1) for match in pattern.finditer(text)}
+        if not found:
+            return None
+        return min(found, key=order.__getitem__)
+
+    @staticmethod
+    def _precomputed(record, key, compute, *args):
+        """
+        Kayıtta saklı normalize anahtar varsa onu kullan, yoksa hesapla.
+
+        search_read ile gelen bizimhesap_*_key alanları (res.partner /
+        product.product üzerinde indexli, yazımda güncellenen kolonlar)
+        her karşılaştırmada normalizasyonu yeniden çalıştırmayı önler.
+        """
+        if key in record:
+            return record[key] or None
+        return compute(*args)
+
     @classmethod
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
     def extract_location_from_address(cls, address, city=None):
-        """Adresten şehir/ilçe bilgisi çıkar"""
+        """
+        Adresten şehir/ilçe bilgisi çıkar
+
+        Önce İstanbul ilçeleri, sonra şehirler aranır; listeler tek bir
+        derlenmiş regex ile taranır (ad başına ayrı alt dize kontrolü yok).
+        """
         if not address and not city:
             return None
         
         text = f"{address or ''} {city or ''}".lower()
         
-        # Önce İstanbul ilçelerini kontrol et
-        for district in cls.ISTANBUL_DISTRICTS:
-            if district in text:
-                return district.title()
-        
-        # Sonra şehirleri kontrol et
-        for city_name in cls.TURKEY_CITIES:
-            if city_name in text:
-                return city_name.title()
-        
-        return None
+        location = (
+            cls._first_listed_match(cls._DISTRICT_RE, cls._DISTRICT_ORDER, text)
+            or cls._first_listed_match(cls._CITY_RE, cls._CITY_ORDER, text)
+        )
+        return location.title() if location else None
     
     # ═══════════════════════════════════════════════════════════════
     # ÜRÜN EŞLEŞTİRME PROTOKOLܠ
@@ -342,8 +379,10 @@ class SyncProtocols:
         }
         
         for target in target_products:
-            target_barcode = cls.normalize_barcode(target.get('barcode'))
-            target_code = cls.normalize_product_code(target.get('default_code'))
+            target_barcode = cls._precomputed(
+                target, 'bizimhesap_barcode_key', cls.normalize_barcode, target.get('barcode'))
+            target_code = cls._precomputed(
+                target, 'bizimhesap_code_key', cls.normalize_product_code, target.get('default_code'))
             target_name = (target.get('name') or '').strip()
             target_tmpl_id = target.get('product_tmpl_id')
             if isinstance(target_tmpl_id, (list, tuple)):
@@ -443,12 +482,16 @@ class SyncProtocols:
         branch_candidates = []  # Potansiyel şube eşleşmeleri
         
         for target in target_partners:
-            target_vat = cls.normalize_vat(target.get('vat'))
-            target_phone = cls.normalize_phone(target.get('phone') or target.get('mobile'))
+            target_vat = cls._precomputed(
+                target, 'bizimhesap_vat_key', cls.normalize_vat, target.get('vat'))
+            target_phone = cls._precomputed(
+                target, 'bizimhesap_phone_key', cls.normalize_phone,
+                target.get('phone') or target.get('mobile'))
             target_mobile = cls.normalize_phone(target.get('mobile'))
             target_email = (target.get('email') or '').lower().strip()
             target_name = (target.get('name') or '').strip()
-            target_name_normalized = cls.normalize_company_name(target_name)
+            target_name_normalized = cls._precomputed(
+                target, 'bizimhesap_name_key', cls.normalize_company_name, target_name) or ''
             target_ref = (target.get('ref') or '').strip()
             target_address = target.get('street') or ''
             target_city = target.get('city') or ''
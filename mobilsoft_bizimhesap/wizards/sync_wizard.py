@@ -103,55 +103,31 @@ class BizimHesapSyncWizard(models.TransientModel):
         }
     
     def _export_partners(self):
-        """Tüm partner'ları export et"""
+        """Tüm partner'ları giden kuyruğa al"""
         partners = self.env['res.partner'].search([
             ('customer_rank', '>', 0),  # Sadece müşteriler
         ])
-        
-        created = updated = failed = 0
-        
-        for partner in partners:
-            try:
-                binding = self.env['bizimhesap.partner.binding'].search([
-                    ('backend_id', '=', self.backend_id.id),
-                    ('odoo_id', '=', partner.id),
-                ], limit=1)
-                
-                self.backend_id.export_partner(partner)
-                
-                if binding:
-                    updated += 1
-                else:
-                    created += 1
-                    
-            except Exception as e:
-                failed += 1
-        
-        return {'created': created, 'updated': updated, 'failed': failed}
+        return self._enqueue_export('partner', partners, 'bizimhesap.partner.binding')
     
     def _export_products(self):
-        """Tüm ürünleri export et"""
+        """Tüm ürünleri giden kuyruğa al"""
         products = self.env['product.product'].search([
             ('sale_ok', '=', True),
         ])
-        
-        created = updated = failed = 0
-        
-        for product in products:
-            try:
-                binding = self.env['bizimhesap.product.binding'].search([
-                    ('backend_id', '=', self.backend_id.id),
-                    ('odoo_id', '=', product.id),
-                ], limit=1)
-                
-                self.backend_id.export_product(product)
-                
-                if binding:
-                    updated += 1
-                else:
-                    created += 1
-                    
-            except Exception as e:
-                failed += 1
-        
-        return {'created': created, 'updated': updated, 'failed': failed}
+        return self._enqueue_export('product', products, 'bizimhesap.product.binding')
+
+    def _enqueue_export(self, export_type, records, binding_model):
+        """
+        Kayıtları toplu olarak kuyruğa al; gönderim arka planda yapılır.
+
+        created/updated sayıları mevcut binding'e göre hesaplanır.
+        """
+        bound_ids = set(self.env[binding_model].search([
+            ('backend_id', '=', self.backend_id.id),
+            ('odoo_id', 'in', records.ids),
+        ]).mapped('odoo_id').ids)
+
+        self.backend_id.enqueue_export(export_type, records)
+
+        updated = len(bound_ids)
+        return {'created': len(records) - updated, 'updated': updated, 'failed': 0}
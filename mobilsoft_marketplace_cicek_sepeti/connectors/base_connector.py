@@ -5,7 +5,7 @@
 Documentation: https://bayi-api.ciceksepeti.com/
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +23,13 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
 
     API_BASE_URL = "https://bayi-api.ciceksepeti.com/api"
 
+    # price-and-stock accepts at most 200 items per request
+    BATCH_SIZE = 200
+
+    # Dealer API quota is tight; bulk endpoints are preferred anyway
+    RATE_LIMIT = 1.0
+    RATE_BURST = 5
+
     def __init__(self, channel_record):
         """Initialize Çiçek Sepeti connector"""
         super().__init__(channel_record)
@@ -78,17 +85,18 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
             _logger.info("Starting Çiçek Sepeti order sync")
 
             if not last_sync:
-                last_sync = datetime.now() - timedelta(hours=24)
+                last_sync = self._get_order_sync_start()
 
             # Fetch orders from Çiçek Sepeti API
             orders = self._fetch_cicek_sepeti_orders(last_sync)
 
+            order_payloads = []
             for order_data in orders:
                 try:
                     # Çiçek Sepeti has special fields for gift orders
                     shipping_addr = order_data.get("shippingAddress", {})
 
-                    marketplace_order = self._process_marketplace_order(
+                    order_payloads.append(
                         {
                             "channel_order_id": str(order_data.get("orderId")),
                             "order_date": self._parse_datetime(
@@ -99,22 +107,22 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
                             "partner_phone": shipping_addr.get("phoneNumber", ""),
                             "shipping_address": self._format_address(shipping_addr),
                             "amount_total": float(order_data.get("totalPrice", 0)),
+                            "lines": order_data.get("items", []),
                         }
                     )
 
-                    # Create order lines
-                    self._create_order_lines(
-                        marketplace_order, order_data.get("items", [])
-                    )
-
-                    created_count += 1
-
                 except Exception as e:
                     _logger.error(
                         f"Failed to process order {order_data.get('orderId')}: {str(e)}"
                     )
                     failed_count += 1
 
+            result = self._ingest_orders(order_payloads)
+            created_count = result["created"]
+            updated_count = result["updated"]
+            failed_count += result["failed"]
+            self._update_order_watermark(order_payloads, result["failed_ids"])
+
             self._update_sync_log(
                 "success",
                 records_processed=len(orders),
@@ -124,7 +132,8 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
             )
 
             _logger.info(
-                f"Order sync completed: {created_count} created, {failed_count} failed"
+                f"Order sync completed: {created_count} created, {updated_count} updated, "
+                f"{failed_count} failed"
             )
 
         except Exception as e:
@@ -135,155 +144,45 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
         """
         Sync inventory to Çiçek Sepeti
 
-        Update product stock on Çiçek Sepeti based on Odoo inventory
+        Push stock of changed listings through the bulk inventory endpoint
         """
-        sync_log = self._create_sync_log("sync_inventory")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Çiçek Sepeti inventory sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    qty = int(marketplace_product.product_id.qty_available)
-
-                    # Update stock on Çiçek Sepeti
-                    self._update_cicek_sepeti_stock(
-                        marketplace_product.channel_product_id, qty
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "qty_available": qty,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync stock for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Inventory sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Inventory sync failed: {str(e)}")
-            self._log_error(f"Stok senkronizasyonu başarısız: {str(e)}")
+        return self._sync_inventory_batched()
 
     def sync_prices(self) -> dict[str, Any]:
         """
         Sync prices to Çiçek Sepeti
 
-        Update product prices on Çiçek Sepeti based on Odoo prices
+        Push prices of changed listings through the bulk price endpoint
         """
-        sync_log = self._create_sync_log("sync_prices")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Çiçek Sepeti price sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    price = (
-                        marketplace_product.sale_price
-                        or marketplace_product.product_id.list_price
-                    )
-
-                    # Update price on Çiçek Sepeti
-                    self._update_cicek_sepeti_price(
-                        marketplace_product.channel_product_id, float(price)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "sale_price": price,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync price for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Price sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Price sync failed: {str(e)}")
-            self._log_error(f"Fiyat senkronizasyonu başarısız: {str(e)}")
+        return self._sync_prices_batched()
 
     # ==================== Çiçek Sepeti API Methods ====================
 
     def _fetch_cicek_sepeti_orders(self, last_sync: datetime) -> list[dict]:
-        """Fetch orders from Çiçek Sepeti API"""
-        try:
-            # Format date for API
-            start_date = self._format_datetime(last_sync)
+        """
+        Fetch orders from Çiçek Sepeti API
 
+        When the first page reports totalPages the rest are fetched in
+        parallel, otherwise hasMore is followed page by page.
+        """
+        try:
             url = f"{self.API_BASE_URL}/orders"
             params = {
-                "fromDate": start_date,
+                "fromDate": self._format_datetime(last_sync),
                 "pageSize": 100,
             }
 
-            all_orders = []
-            page = 1
-
-            # Pagination loop
-            while True:
-                params["page"] = page
-                response = self._make_api_call("GET", url, params=params)
-                data = response.json()
-
-                orders = data.get("orders", [])
-                if not orders:
-                    break
-
-                all_orders.extend(orders)
-
-                # Check if there are more pages
-                if not data.get("hasMore", False):
-                    break
+            def fetch_page(page):
+                data = self._send_request(
+                    "GET", url, params=dict(params, page=page)
+                ).json()
+                return (
+                    data.get("orders", []),
+                    data.get("hasMore", False),
+                    data.get("totalPages"),
+                )
 
-                page += 1
+            all_orders = self._fetch_all_pages(fetch_page, first_page=1)
 
             _logger.info(f"Fetched {len(all_orders)} orders from Çiçek Sepeti")
             return all_orders
@@ -292,37 +191,52 @@ class CicekSepetiConnector(BaseMarketplaceConnector):
             _logger.error(f"Failed to fetch orders: {str(e)}")
             return []
 
-    def _update_cicek_sepeti_stock(self, product_id: str, quantity: int) -> bool:
-        """Update product stock on Çiçek Sepeti"""
-        try:
-            url = f"{self.API_BASE_URL}/products/{product_id}/stock"
-
-            payload = {
-                "quantity": quantity,
-            }
-
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
-
-        except Exception as e:
-            _logger.error(f"Failed to update stock for {product_id}: {str(e)}")
-            return False
-
-    def _update_cicek_sepeti_price(self, product_id: str, price: float) -> bool:
-        """Update product price on Çiçek Sepeti"""
-        try:
-            url = f"{self.API_BASE_URL}/products/{product_id}/price"
-
-            payload = {
-                "price": price,
-            }
+    def _push_inventory_batch(self, items: list[dict]) -> dict:
+        """Update stock of up to BATCH_SIZE stock codes in one request"""
+        return self._put_price_and_stock(
+            [
+                {"stockCode": item["key"], "stockQuantity": item["quantity"]}
+                for item in items
+            ]
+        )
 
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
+    def _push_price_batch(self, items: list[dict]) -> dict:
+        """Update prices of up to BATCH_SIZE stock codes in one request"""
+        return self._put_price_and_stock(
+            [
+                {
+                    "stockCode": item["key"],
+                    "salesPrice": item["price"],
+                    "listPrice": max(item["list_price"], item["price"]),
+                }
+                for item in items
+            ]
+        )
 
-        except Exception as e:
-            _logger.error(f"Failed to update price for {product_id}: {str(e)}")
-            return False
+    def _put_price_and_stock(self, payload_items: list[dict]) -> dict:
+        """Send items to the asynchronous price-and-stock endpoint"""
+        url = f"{self.API_BASE_URL}/products/price-and-stock"
+        response = self._make_api_call("PUT", url, json={"items": payload_items})
+        return {"batch_request_id": response.json().get("batchId")}
+
+    def _fetch_batch_result(self, batch_request_id: str, operation: str) -> dict:
+        """Query per-stock-code results of a price-and-stock batch"""
+        url = f"{self.API_BASE_URL}/products/batch-status/{batch_request_id}"
+        data = self._make_api_call("GET", url).json()
+
+        items = data.get("items", [])
+        if any(item.get("status") in ("Processing", "Pending") for item in items):
+            return {"done": False}
+
+        failed_items = {}
+        for item in items:
+            if item.get("status") != "Failed":
+                continue
+            stock_code = (item.get("data") or {}).get("stockCode")
+            reasons = [r.get("message", "") for r in item.get("failureReasons") or []]
+            failed_items[stock_code] = ", ".join(reasons) or "Failed"
+
+        return {"done": True, "failed_items": failed_items}
 
     # ==================== Helper Methods ====================
 
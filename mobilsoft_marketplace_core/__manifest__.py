@@ -11,12 +11,16 @@
         "stock",
         "account",
         "mail",
+        "mobilsoft_webhook_inbox",
     ],
     "data": [
         "security/ir.model.access.csv",
+        "data/ir_cron.xml",
         "views/marketplace_product_views.xml",
         "views/marketplace_order_views.xml",
         "views/marketplace_sync_log_views.xml",
+        "views/marketplace_batch_request_views.xml",
+        "views/marketplace_webhook_event_views.xml",
         "views/marketplace_channel_views.xml",
         "views/menu.xml",
     ],
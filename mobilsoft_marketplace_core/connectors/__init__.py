@@ -1 +1 @@
-from . import base_connector
+from . import base_connector, rate_limiter, registry
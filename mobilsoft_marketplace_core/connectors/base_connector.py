@@ -6,11 +6,20 @@ the required abstract methods.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+import json
 import logging
+import random
+import threading
+import time
 from typing import Any, Dict, List, Optional
 
 import requests
+from urllib3.exceptions import NewConnectionError
+
+from . import rate_limiter, registry
 
 _logger = logging.getLogger(__name__)
 
@@ -18,6 +27,35 @@ _logger = logging.getLogger(__name__)
 class BaseMarketplaceConnector(ABC):
     """Base class for all marketplace connectors"""
 
+    # Max items per bulk stock/price request (override with platform limit)
+    BATCH_SIZE = 100
+
+    # Platform has a bulk content update endpoint (_push_content_batch)
+    SUPPORTS_CONTENT_PUSH = False
+
+    # Orders upserted together by _ingest_orders
+    ORDER_INGEST_CHUNK = 500
+
+    # Sync log operation -> marketplace.batch.request operation
+    BATCH_OPERATIONS = {
+        "sync_inventory": "inventory",
+        "sync_prices": "price",
+        "sync_products": "content",
+    }
+
+    # Platform request quota (requests per second, bucket size); the channel
+    # fields api_rate_limit / api_rate_burst override these when set
+    RATE_LIMIT = 5.0
+    RATE_BURST = 10
+
+    # Backoff for 429 / 5xx responses: base * 2^attempt seconds, capped
+    RETRY_BACKOFF_BASE = 1.0
+    RETRY_BACKOFF_MAX = 60.0
+    RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    # Timeouts and 5xx are retried only for these; a POST / PUT may already
+    # have been applied by the platform (stock, price, order actions)
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+
     def __init__(self, channel_record):
         """
         Initialize connector with marketplace channel record
@@ -37,13 +75,23 @@ class BaseMarketplaceConnector(ABC):
         self.merchant_id = channel_record.merchant_id
         self.shop_id = channel_record.shop_id
 
-        # Session for API calls
-        self.session = requests.Session()
+        # Session for API calls, kept warm per worker process
+        self.session = registry.get_shared(channel_record, "session", requests.Session)
         self._configure_session()
 
+        # Rate limiting, resolved here so worker threads never read the ORM
+        self._registry = self.env.registry
+        self._channel_id = channel_record.id
+        self._rate_limit = channel_record.api_rate_limit or self.RATE_LIMIT
+        self._rate_burst = channel_record.api_rate_burst or self.RATE_BURST
+        self._max_retries = max(channel_record.api_max_retries, 0)
+        self._stats_lock = threading.Lock()
+
         # Sync log
         self.sync_log = None
         self.api_call_count = 0
+        self.retry_count = 0
+        self.throttle_wait = 0.0
 
     def _configure_session(self):
         """Configure requests session (override in subclass if needed)"""
@@ -64,7 +112,8 @@ class BaseMarketplaceConnector(ABC):
         Sync orders from marketplace
 
         Args:
-            last_sync: Only fetch orders after this datetime
+            last_sync: Only fetch orders after this datetime; defaults to
+                _get_order_sync_start()
 
         Returns:
             Dict with sync results
@@ -112,6 +161,8 @@ class BaseMarketplaceConnector(ABC):
                 "status": status,
                 "end_time": datetime.now(),
                 "api_call_count": self.api_call_count,
+                "retry_count": self.retry_count,
+                "throttle_wait": round(self.throttle_wait, 3),
             }
             update_vals.update(kwargs)
             self.sync_log.write(update_vals)
@@ -144,19 +195,301 @@ class BaseMarketplaceConnector(ABC):
         Returns:
             Response object
         """
-        self.api_call_count += 1
-
         try:
-            _logger.info(f"API Call: {method} {url}")
-            response = self.session.request(method, url, **kwargs)
-            response.raise_for_status()
-            return response
+            return self._send_request(method, url, **kwargs)
         except requests.exceptions.RequestException as e:
             self._log_error(f"API call failed: {str(e)}")
             raise
 
+    def _send_request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Perform the HTTP request without touching the ORM
+
+        Safe to call from worker threads (see _fetch_all_pages); errors are
+        raised to the caller. Every attempt first takes a token from the
+        channel's shared bucket. Retries (up to api_max_retries, jittered
+        exponential backoff, honouring Retry-After) cover 429 for every
+        method, and timeouts / 5xx only for idempotent methods; a POST or
+        PUT is otherwise retried only when the connection failed before the
+        request was sent.
+        """
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            waited = rate_limiter.acquire(
+                self._registry, self._channel_id, self._rate_limit, self._rate_burst
+            )
+            with self._stats_lock:
+                self.api_call_count += 1
+                self.throttle_wait += waited
+
+            _logger.info(f"API Call: {method} {url}")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self._max_retries or not (
+                    idempotent or self._is_unsent_error(e)
+                ):
+                    raise
+                self._backoff(attempt, f"{type(e).__name__}", None)
+                attempt += 1
+                continue
+
+            status = response.status_code
+            if (
+                status in self.RETRY_STATUS_CODES
+                and (status == 429 or idempotent)
+                and attempt < self._max_retries
+            ):
+                self._backoff(attempt, f"HTTP {status}", response)
+                attempt += 1
+                continue
+
+            response.raise_for_status()
+            return response
+
+    @staticmethod
+    def _is_unsent_error(error: requests.exceptions.RequestException) -> bool:
+        """Connection failed before the request reached the platform"""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def _backoff(self, attempt: int, reason: str, response: requests.Response | None):
+        """Sleep before the next retry and account the wait"""
+        delay = random.uniform(0, min(self.RETRY_BACKOFF_MAX, self.RETRY_BACKOFF_BASE * 2**attempt))
+        retry_after = self._parse_retry_after(response) if response is not None else None
+        if retry_after is not None:
+            delay = min(retry_after, self.RETRY_BACKOFF_MAX) + random.uniform(0, self.RETRY_BACKOFF_BASE)
+
+        _logger.warning(
+            f"[{self._channel_id}] {reason}, retry {attempt + 1}/{self._max_retries} in {delay:.2f}s"
+        )
+        with self._stats_lock:
+            self.retry_count += 1
+            self.throttle_wait += delay
+        time.sleep(delay)
+
+    @staticmethod
+    def _parse_retry_after(response: requests.Response) -> float | None:
+        """Retry-After header as seconds (delta-seconds or HTTP date)"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(float(value), 0.0)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+    def _fetch_all_pages(
+        self, fetch_page, first_page: int = 0, concurrent: bool = True
+    ) -> list:
+        """
+        Fetch every page of a paginated listing
+
+        The first page is fetched alone; when it reports the total page
+        count, the remaining pages are fetched in parallel with at most
+        order_fetch_workers requests in flight for this channel. Otherwise
+        pages are followed one by one while the platform reports more.
+
+        Args:
+            fetch_page: Callable(page) -> (items, has_more, total_pages or
+                None). Runs in worker threads, so it must only use
+                _send_request and never the ORM.
+            first_page: Index of the first page (0 or 1 depending on API)
+            concurrent: Allow parallel fetching of the remaining pages
+
+        Returns:
+            All items in page order
+        """
+        items, has_more, total_pages = fetch_page(first_page)
+        all_items = list(items)
+        if not has_more or not items:
+            return all_items
+
+        workers = max(self.channel.order_fetch_workers, 1)
+        if concurrent and total_pages and total_pages > 1 and workers > 1:
+            pages = range(first_page + 1, first_page + total_pages)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for page_items in pool.map(lambda page: fetch_page(page)[0], pages):
+                    all_items.extend(page_items)
+            return all_items
+
+        page = first_page
+        while has_more and items:
+            page += 1
+            items, has_more, total_pages = fetch_page(page)
+            all_items.extend(items)
+        return all_items
+
+    def _get_order_sync_start(self) -> datetime:
+        """
+        Default start of an order fetch
+
+        The channel watermark minus its overlap window; the last 24 hours
+        only for a channel that has never synced orders.
+        """
+        return self.channel._get_order_sync_start() or datetime.now() - timedelta(hours=24)
+
+    def _update_order_watermark(
+        self, orders_data: list[dict], failed_ids: list[str] | None = None
+    ):
+        """
+        Move the channel order watermark to the newest fetched order
+
+        The next sync starts from the watermark minus the channel overlap
+        window instead of re-reading the last 24 hours. When some orders
+        could not be ingested the watermark is held at the oldest of them,
+        so the next sync fetches them again.
+
+        Args:
+            orders_data: Order payloads of this fetch
+            failed_ids: channel_order_id of the orders _ingest_orders failed on
+        """
+        failed = set(failed_ids or ())
+        order_dates = [data["order_date"] for data in orders_data if data.get("order_date")]
+        failed_dates = [
+            data["order_date"]
+            for data in orders_data
+            if data.get("order_date") and str(data["channel_order_id"]) in failed
+        ]
+        if not order_dates:
+            return
+
+        latest = min(failed_dates) if failed_dates else max(order_dates)
+        if not self.channel.order_watermark or latest > self.channel.order_watermark:
+            self.channel.order_watermark = latest
+
     # ==================== Order Processing ====================
 
+    def _ingest_orders(self, orders_data: list[dict]) -> dict[str, Any]:
+        """
+        Upsert a page of orders with their lines
+
+        Existing orders and products are preloaded with one query each per
+        chunk; new orders and all lines are created in batches. Lines of a
+        re-synced order are replaced, never appended, so ingesting the same
+        page twice leaves the same result.
+
+        Args:
+            orders_data: Dicts as accepted by _prepare_order_vals, with the
+                raw order lines under "lines"
+
+        Returns:
+            Dict with created / updated / failed counts, the orders and the
+            channel_order_id of the failed ones (failed_ids)
+        """
+        result = {
+            "created": 0,
+            "updated": 0,
+            "failed": 0,
+            "failed_ids": [],
+            "orders": self.env["marketplace.order"],
+        }
+
+        for chunk in self._chunked(orders_data, self.ORDER_INGEST_CHUNK):
+            try:
+                with self.env.cr.savepoint():
+                    chunk_result = self._ingest_order_chunk(chunk)
+            except Exception as e:
+                # Isolate the faulty order(s) by retrying one by one
+                _logger.warning(
+                    f"[{self.channel.name}] Bulk order upsert failed, "
+                    f"retrying {len(chunk)} orders individually: {str(e)}"
+                )
+                chunk_result = {
+                    "created": 0,
+                    "updated": 0,
+                    "failed": 0,
+                    "failed_ids": [],
+                    "orders": self.env["marketplace.order"],
+                }
+                for order_data in chunk:
+                    try:
+                        with self.env.cr.savepoint():
+                            single = self._ingest_order_chunk([order_data])
+                    except Exception as order_error:
+                        _logger.error(
+                            f"Failed to process order {order_data.get('channel_order_id')}: {str(order_error)}"
+                        )
+                        chunk_result["failed"] += 1
+                        chunk_result["failed_ids"].append(str(order_data.get("channel_order_id")))
+                        continue
+                    for key in ("created", "updated", "orders"):
+                        chunk_result[key] += single[key]
+
+            for key in ("created", "updated", "failed", "failed_ids", "orders"):
+                result[key] += chunk_result[key]
+
+        return result
+
+    def _ingest_order_chunk(self, orders_data: list[dict]) -> dict[str, Any]:
+        """Upsert one chunk of orders; raises on the first database error"""
+        MarketplaceOrder = self.env["marketplace.order"]
+        OrderLine = self.env["marketplace.order.line"]
+
+        # Last occurrence wins if the platform returned an order twice
+        by_channel_id = {str(data["channel_order_id"]): data for data in orders_data}
+
+        existing = MarketplaceOrder.search(
+            [
+                ("channel_id", "=", self.channel.id),
+                ("channel_order_id", "in", list(by_channel_id)),
+            ]
+        )
+        existing_by_id = {order.channel_order_id: order for order in existing}
+
+        to_create = []
+        for channel_order_id, data in by_channel_id.items():
+            vals = self._prepare_order_vals(data)
+            order = existing_by_id.get(channel_order_id)
+            if order:
+                # Keep the local workflow status of known orders
+                vals.pop("status", None)
+                order.write(vals)
+            else:
+                to_create.append(vals)
+
+        created = MarketplaceOrder.create(to_create) if to_create else MarketplaceOrder
+        orders_by_id = dict(existing_by_id)
+        orders_by_id.update({order.channel_order_id: order for order in created})
+
+        # Replace lines of every order in the chunk
+        all_lines = [
+            line for data in by_channel_id.values() for line in data.get("lines") or []
+        ]
+        products = self._get_products_for_lines(all_lines)
+        listings = self._get_listings_for_lines(all_lines)
+
+        existing.line_ids.unlink()
+        line_vals = []
+        for channel_order_id, data in by_channel_id.items():
+            order = orders_by_id[channel_order_id]
+            for sequence, line_data in enumerate(data.get("lines") or [], start=1):
+                line_vals.append(
+                    self._prepare_order_line_vals(
+                        order, line_data, products, listings, sequence
+                    )
+                )
+        if line_vals:
+            OrderLine.create(line_vals)
+
+        return {
+            "created": len(created),
+            "updated": len(existing),
+            "failed": 0,
+            "failed_ids": [],
+            "orders": existing | created,
+        }
+
     def _process_marketplace_order(self, order_data: dict) -> "marketplace.order":
         """
         Process marketplace order data and create/update order record
@@ -178,8 +511,10 @@ class BaseMarketplaceConnector(ABC):
         )
 
         if existing:
-            # Update existing order
-            existing.write(self._prepare_order_vals(order_data))
+            # Update existing order, keeping its local workflow status
+            vals = self._prepare_order_vals(order_data)
+            vals.pop("status", None)
+            existing.write(vals)
             return existing
         else:
             # Create new order
@@ -199,60 +534,135 @@ class BaseMarketplaceConnector(ABC):
             "status": "pending",
         }
 
-    def _create_order_lines(self, order: "marketplace.order", lines_data: list[dict]):
-        """Create order lines from marketplace data"""
-        OrderLine = self.env["marketplace.order.line"]
+    def _prepare_order_line_vals(
+        self,
+        order: "marketplace.order",
+        line_data: dict,
+        products: dict,
+        listings: dict,
+        sequence: int = 10,
+    ) -> dict:
+        """Prepare values dict for marketplace.order.line creation"""
+        key = self._line_product_key(line_data)
+        listing = listings.get(line_data.get("sku"))
+        return {
+            "order_id": order.id,
+            "sequence": sequence,
+            "product_id": products[key].id,
+            "marketplace_product_id": listing.id if listing else False,
+            "qty": line_data.get("qty", 1),
+            "price": line_data.get("price", 0),
+            "discount": line_data.get("discount", 0),
+        }
 
-        for line_data in lines_data:
-            product = self._get_or_create_product(line_data)
+    def _create_order_lines(self, order: "marketplace.order", lines_data: list[dict]):
+        """Replace order lines with the marketplace data"""
+        products = self._get_products_for_lines(lines_data)
+        listings = self._get_listings_for_lines(lines_data)
 
-            OrderLine.create(
-                {
-                    "order_id": order.id,
-                    "product_id": product.id,
-                    "qty": line_data.get("qty", 1),
-                    "price": line_data.get("price", 0),
-                    "discount": line_data.get("discount", 0),
-                }
-            )
+        order.line_ids.unlink()
+        self.env["marketplace.order.line"].create(
+            [
+                self._prepare_order_line_vals(
+                    order, line_data, products, listings, sequence
+                )
+                for sequence, line_data in enumerate(lines_data, start=1)
+            ]
+        )
 
     # ==================== Product Processing ====================
 
-    def _get_or_create_product(self, product_data: dict) -> "product.product":
+    @staticmethod
+    def _line_product_key(line_data: dict) -> str:
+        """Product lookup key of an order line (SKU, or name when missing)"""
+        return line_data.get("sku") or line_data.get("name") or "Untitled Product"
+
+    def _get_products_for_lines(self, lines_data: list[dict]) -> dict:
         """
-        Get or create product from marketplace data
+        Resolve products of many order lines at once
 
-        Args:
-            product_data: Dict containing product information
+        Products are matched by barcode or internal reference in a single
+        query; lines without SKU are matched by name. Missing products are
+        created in one batch.
 
         Returns:
-            product.product record
+            Dict {line product key: product.product}
         """
         Product = self.env["product.product"]
 
-        # Try to find by SKU or product ID
-        product = Product.search(
+        skus = {line.get("sku") for line in lines_data if line.get("sku")}
+        names = {
+            self._line_product_key(line) for line in lines_data if not line.get("sku")
+        }
+
+        products = {}
+        if skus:
+            for product in Product.search(
+                [
+                    "|",
+                    ("barcode", "in", list(skus)),
+                    ("default_code", "in", list(skus)),
+                ]
+            ):
+                for code in (product.barcode, product.default_code):
+                    if code in skus:
+                        products.setdefault(code, product)
+        if names:
+            for product in Product.search([("name", "in", list(names))]):
+                products.setdefault(product.name, product)
+
+        missing = {}
+        for line in lines_data:
+            key = self._line_product_key(line)
+            if key not in products:
+                missing.setdefault(key, line)
+
+        if missing:
+            categories = {}
+            vals_list = []
+            for line in missing.values():
+                category_name = line.get("category", "Marketplace Products")
+                if category_name not in categories:
+                    categories[category_name] = self._get_product_category(line)
+                vals_list.append(
+                    {
+                        "name": line.get("name", "Untitled Product"),
+                        "is_storable": True,
+                        "categ_id": categories[category_name].id,
+                        "default_code": line.get("sku"),
+                        "list_price": line.get("price", 0),
+                    }
+                )
+            products.update(zip(missing, Product.create(vals_list)))
+
+        return products
+
+    def _get_listings_for_lines(self, lines_data: list[dict]) -> dict:
+        """Channel listings of the order lines by SKU, in one query"""
+        skus = {line.get("sku") for line in lines_data if line.get("sku")}
+        if not skus:
+            return {}
+        listings = self.env["marketplace.product"].search(
             [
-                "|",
-                ("barcode", "=", product_data.get("sku")),
-                ("default_code", "=", product_data.get("sku")),
-            ],
-            limit=1,
+                ("channel_id", "=", self.channel.id),
+                ("channel_sku", "in", list(skus)),
+            ]
         )
+        return {listing.channel_sku: listing for listing in listings}
 
-        if product:
-            return product
+    def _get_or_create_product(self, product_data: dict) -> "product.product":
+        """
+        Get or create product from marketplace data
 
-        # Create new product
-        return Product.create(
-            {
-                "name": product_data.get("name", "Untitled Product"),
-                "is_storable": True,
-                "categ_id": self._get_product_category(product_data).id,
-                "default_code": product_data.get("sku"),
-                "list_price": product_data.get("price", 0),
-            }
-        )
+        Args:
+            product_data: Dict containing product information
+
+        Returns:
+            product.product record
+        """
+        return self._get_products_for_lines([product_data])[
+            self._line_product_key(product_data)
+        ]
 
     def _get_product_category(self, product_data: dict):
         """Get or create product category"""
@@ -311,6 +721,519 @@ class BaseMarketplaceConnector(ABC):
             move._action_confirm()
             move._action_done()
 
+    # ==================== Catalog Publishing ====================
+
+    def publish_catalog(self, force: bool = False) -> dict[str, Any]:
+        """
+        Publish the catalog, sending only what changed since the last publish
+
+        Every listing is compared with its published snapshot: content
+        changes go through the content update endpoint (when the platform
+        has one), price and stock changes through the bulk price/stock
+        endpoints. The number of API calls grows with the number of changed
+        listings, not with the catalog size.
+
+        Args:
+            force: Ignore snapshots and send everything
+        """
+        self._create_sync_log("sync_products")
+        result = {"processed": 0, "updated": 0, "failed": 0, "batch_request_ids": []}
+        notes = []
+
+        try:
+            listings = self._get_active_listings()
+            stages = [
+                ("sync_products", "içerik", self._collect_content_items),
+                ("sync_prices", "fiyat", self._collect_price_items),
+                ("sync_inventory", "stok", self._collect_inventory_items),
+            ]
+            for operation, label, collect in stages:
+                if operation == "sync_products" and not self._supports_content_push():
+                    notes.append("içerik güncellemesi desteklenmiyor")
+                    continue
+
+                items = collect(listings, force=force)
+                if not items:
+                    continue
+                pushed = self._push_batched(operation, items)
+                result["processed"] += len(items)
+                result["updated"] += pushed["updated"]
+                result["failed"] += pushed["failed"]
+                result["batch_request_ids"] += pushed["batch_request_ids"]
+                notes.append(f"{len(items)} {label} değişikliği")
+
+            self._update_sync_log(
+                "partial" if result["failed"] else "success",
+                records_processed=result["processed"],
+                records_updated=result["updated"],
+                records_failed=result["failed"],
+                notes=f"{len(listings)} ilan tarandı: " + (", ".join(notes) or "değişiklik yok"),
+            )
+
+            _logger.info(
+                f"[{self.channel.name}] Catalog publish completed: "
+                f"{result['processed']} changes, {result['failed']} failed"
+            )
+
+        except Exception as e:
+            _logger.error(f"[{self.channel.name}] Catalog publish failed: {str(e)}")
+            self._log_error(f"Katalog yayını başarısız: {str(e)}")
+
+        return result
+
+    def _collect_content_items(
+        self, listings: "marketplace.product", force: bool = False
+    ) -> list[dict]:
+        """
+        Build content items for listings whose content differs from the snapshot
+
+        Listings whose content hash matches the published one are skipped
+        without decoding the snapshot.
+        """
+        Listing = self.env["marketplace.product"]
+        payloads = listings._get_content_payloads()
+
+        items = []
+        keyless = []
+        for listing in listings:
+            content = payloads[listing.id]
+            content_hash = Listing._content_hash(content)
+            if not force and listing.published_hash == content_hash:
+                continue
+
+            changes = (
+                content
+                if force
+                else Listing._diff_content(listing.get_published_content(), content)
+            )
+            if not changes:
+                listing.published_hash = content_hash
+                continue
+            key = self._batch_item_key(listing)
+            if not key:
+                keyless.append(listing.id)
+                continue
+            items.append(
+                {
+                    "listing_id": listing.id,
+                    "key": key,
+                    "channel_product_id": listing.channel_product_id,
+                    "changes": changes,
+                    "content": content,
+                    "content_hash": content_hash,
+                }
+            )
+        self._flag_missing_keys(keyless)
+        return items
+
+    # ==================== Batch Push ====================
+
+    def _sync_inventory_batched(self, force: bool = False) -> dict[str, Any]:
+        """
+        Push stock of changed listings through the platform bulk endpoint
+
+        Only listings marked dirty by stock moves (or never pushed) are
+        read, so the cost follows the number of changes, not the catalog.
+
+        Args:
+            force: Push every active listing, not only the changed ones
+
+        Returns:
+            Dict with sync results
+        """
+        return self._sync_batched("sync_inventory", force=force)
+
+    def _sync_prices_batched(self, force: bool = False) -> dict[str, Any]:
+        """
+        Push prices of changed listings through the platform bulk endpoint
+
+        Args:
+            force: Push every active listing, not only the changed ones
+
+        Returns:
+            Dict with sync results
+        """
+        return self._sync_batched("sync_prices", force=force)
+
+    def _sync_batched(self, operation: str, force: bool = False) -> dict[str, Any]:
+        """Collect changed items, push them in BATCH_SIZE chunks and log results"""
+        self._create_sync_log(operation)
+        result = {"processed": 0, "updated": 0, "failed": 0, "batch_request_ids": []}
+
+        try:
+            _logger.info(f"[{self.channel.name}] Starting batched {operation}")
+
+            if operation == "sync_inventory":
+                listings = self._get_active_listings(stock_changes_only=not force)
+                items = self._collect_inventory_items(listings, force=force)
+            else:
+                listings = self._get_active_listings()
+                items = self._collect_price_items(listings, force=force)
+
+            result.update(self._push_batched(operation, items))
+            result["processed"] = len(items)
+
+            self._update_sync_log(
+                "partial" if result["failed"] else "success",
+                records_processed=len(items),
+                records_updated=result["updated"],
+                records_failed=result["failed"],
+                notes=(
+                    f"{len(listings)} ilan tarandı, {len(items)} değişiklik "
+                    f"{len(result['batch_request_ids'])} toplu istekle gönderildi"
+                ),
+            )
+
+            _logger.info(
+                f"[{self.channel.name}] {operation} completed: "
+                f"{result['updated']} updated, {result['failed']} failed"
+            )
+
+        except Exception as e:
+            _logger.error(f"[{self.channel.name}] {operation} failed: {str(e)}")
+            self._log_error(f"Toplu gönderim başarısız ({operation}): {str(e)}")
+
+        return result
+
+    def _get_active_listings(
+        self, stock_changes_only: bool = False
+    ) -> "marketplace.product":
+        """
+        Active listings of this channel
+
+        Args:
+            stock_changes_only: Only listings with pending stock changes whose
+                retry backoff (stock_retry_date) has elapsed
+        """
+        Listing = self.env["marketplace.product"]
+        domain = [
+            ("channel_id", "=", self.channel.id),
+            ("active", "=", True),
+        ]
+        if stock_changes_only:
+            domain += Listing._get_stock_push_domain()
+        return Listing.search(domain)
+
+    def _batch_item_key(self, listing: "marketplace.product") -> str | None:
+        """
+        Identifier the platform uses for a listing in bulk requests
+
+        The seller key (Trendyol barcode, N11 sellerStockCode, Hepsiburada
+        merchantSku, ÇiçekSepeti stockCode) is stored as channel_sku. There
+        is no fallback to channel_product_id: sending the platform product
+        id in place of the seller key would update the wrong item or none.
+        """
+        return listing.channel_sku or None
+
+    def _flag_missing_keys(self, listing_ids: list[int]):
+        """Flag listings left out of a bulk push because they have no key"""
+        if not listing_ids:
+            return
+        _logger.warning(
+            f"[{self.channel.name}] {len(listing_ids)} listings skipped: "
+            f"no platform key (channel_sku)"
+        )
+        self.env["marketplace.product"].browse(listing_ids).write(
+            {
+                "sync_status": "error",
+                "sync_error": "Pazaryeri SKU boş; ilan toplu gönderime alınmadı",
+            }
+        )
+
+    def _collect_inventory_items(
+        self, listings: "marketplace.product", force: bool = False
+    ) -> list[dict]:
+        """
+        Build stock items for listings whose quantity differs from the last push
+
+        Dirty listings carry the sellable quantity recorded by the stock
+        move; the rest are computed once for the whole recordset. Dirty
+        listings whose quantity did not change are cleared without a push.
+        """
+        Listing = self.env["marketplace.product"]
+        dirty = listings.filtered("stock_dirty") if not force else Listing
+        qty_by_product = Listing._get_sellable_qty((listings - dirty).product_id)
+
+        dirty_ids = set(dirty.ids)
+        items = []
+        unchanged_ids = []
+        keyless = []
+        for listing in listings:
+            if listing.id in dirty_ids:
+                qty = int(listing.pending_qty)
+            else:
+                qty = qty_by_product.get(listing.product_id.id, 0)
+            if (
+                not force
+                and listing.sync_status == "synced"
+                and int(listing.last_pushed_qty) == qty
+            ):
+                if listing.id in dirty_ids:
+                    unchanged_ids.append(listing.id)
+                continue
+            key = self._batch_item_key(listing)
+            if not key:
+                keyless.append(listing.id)
+                continue
+            items.append(
+                {
+                    "listing_id": listing.id,
+                    "key": key,
+                    "channel_product_id": listing.channel_product_id,
+                    "quantity": qty,
+                }
+            )
+
+        if unchanged_ids:
+            Listing.browse(unchanged_ids).write({"stock_dirty": False})
+        self._flag_missing_keys(keyless)
+        Listing.browse(keyless).filtered("stock_dirty")._schedule_stock_retry()
+        return items
+
+    def _collect_price_items(
+        self, listings: "marketplace.product", force: bool = False
+    ) -> list[dict]:
+        """Build price items for listings whose price differs from the last push"""
+        items = []
+        keyless = []
+        for listing in listings:
+            price = float(listing.sale_price or listing.product_id.list_price)
+            if (
+                not force
+                and listing.sync_status == "synced"
+                and listing.last_pushed_price == price
+            ):
+                continue
+            key = self._batch_item_key(listing)
+            if not key:
+                keyless.append(listing.id)
+                continue
+            items.append(
+                {
+                    "listing_id": listing.id,
+                    "key": key,
+                    "channel_product_id": listing.channel_product_id,
+                    "price": price,
+                    "list_price": float(listing.list_price or price),
+                }
+            )
+        self._flag_missing_keys(keyless)
+        return items
+
+    def _push_batched(self, operation: str, items: list[dict]) -> dict[str, Any]:
+        """
+        Send items to the platform in BATCH_SIZE chunks
+
+        Accepted chunks with an asynchronous batch id are recorded as
+        marketplace.batch.request so their per-item results can be polled.
+        """
+        Listing = self.env["marketplace.product"]
+        BatchRequest = self.env["marketplace.batch.request"]
+        batch_operation = self.BATCH_OPERATIONS[operation]
+        push = {
+            "inventory": self._push_inventory_batch,
+            "price": self._push_price_batch,
+            "content": self._push_content_batch,
+        }[batch_operation]
+
+        pushed_items = []
+        failed_items = {}
+        failed_count = 0
+        batch_request_ids = []
+
+        for chunk in self._chunked(items, self.BATCH_SIZE):
+            chunk_listings = Listing.browse([item["listing_id"] for item in chunk])
+            try:
+                response = push(chunk) or {}
+            except Exception as e:
+                _logger.error(
+                    f"[{self.channel.name}] Batch {batch_operation} push failed "
+                    f"for {len(chunk)} items: {str(e)}"
+                )
+                chunk_listings.write({"sync_status": "error", "sync_error": str(e)})
+                if batch_operation == "inventory":
+                    chunk_listings._schedule_stock_retry()
+                failed_count += len(chunk)
+                continue
+
+            chunk_failed = response.get("failed_items") or {}
+            failed_items.update(chunk_failed)
+            failed_count += len(chunk_failed)
+            pushed_items.extend(item for item in chunk if item["key"] not in chunk_failed)
+
+            batch_request_id = response.get("batch_request_id")
+            if batch_request_id:
+                batch_request_ids.append(batch_request_id)
+                BatchRequest.create(
+                    {
+                        "channel_id": self.channel.id,
+                        "operation": batch_operation,
+                        "batch_request_id": str(batch_request_id),
+                        "product_ids": [(6, 0, chunk_listings.ids)],
+                        "item_count": len(chunk),
+                    }
+                )
+
+        self._write_pushed_values(batch_operation, pushed_items)
+        self._mark_failed_items(
+            Listing.browse([item["listing_id"] for item in items]),
+            failed_items,
+            batch_operation,
+        )
+
+        return {
+            "updated": len(pushed_items),
+            "failed": failed_count,
+            "batch_request_ids": batch_request_ids,
+        }
+
+    def _write_pushed_values(self, batch_operation: str, items: list[dict]):
+        """
+        Store pushed values on the listings
+
+        Listings sharing the same value are written together, so a push of
+        thousands of items costs one write per distinct value.
+        """
+        if not items:
+            return
+
+        Listing = self.env["marketplace.product"]
+        common_vals = {
+            "sync_status": "synced",
+            "sync_error": False,
+            "last_sync": datetime.now(),
+        }
+
+        if batch_operation == "content":
+            # Snapshots differ per listing; only changed listings get here
+            for item in items:
+                Listing.browse(item["listing_id"]).write(
+                    dict(
+                        common_vals,
+                        published_content=json.dumps(item["content"], sort_keys=True),
+                        published_hash=item["content_hash"],
+                    )
+                )
+            return
+
+        by_value = {}
+        for item in items:
+            if batch_operation == "inventory":
+                value = item["quantity"]
+            else:
+                value = item["price"]
+            by_value.setdefault(value, []).append(item["listing_id"])
+
+        for value, listing_ids in by_value.items():
+            if batch_operation == "inventory":
+                vals = {
+                    "qty_available": value,
+                    "last_pushed_qty": value,
+                    "stock_dirty": False,
+                    "stock_retry_count": 0,
+                    "stock_retry_date": False,
+                }
+            else:
+                vals = {"sale_price": value, "last_pushed_price": value}
+            Listing.browse(listing_ids).write(dict(common_vals, **vals))
+
+    def _mark_failed_items(
+        self,
+        listings: "marketplace.product",
+        failed_items: dict,
+        batch_operation: str | None = None,
+    ):
+        """
+        Flag listings rejected by the platform, keyed by _batch_item_key
+
+        A rejected content update also drops the published snapshot, so the
+        next publish sends the full content of that listing again. A
+        rejected stock update keeps (or puts back) the listing in the dirty
+        set and schedules its next attempt with a growing backoff.
+        """
+        if not failed_items:
+            return
+
+        stock_failed = self.env["marketplace.product"]
+        for listing in listings:
+            error = failed_items.get(self._batch_item_key(listing))
+            if error is not None:
+                vals = {"sync_status": "error", "sync_error": str(error)}
+                if batch_operation == "content":
+                    vals.update(published_content=False, published_hash=False)
+                elif batch_operation == "inventory":
+                    if not listing.stock_dirty:
+                        # Async result: the push already cleared the flag
+                        vals.update(stock_dirty=True, pending_qty=listing.last_pushed_qty)
+                    stock_failed |= listing
+                listing.write(vals)
+        stock_failed._schedule_stock_retry()
+
+    @abstractmethod
+    def _push_inventory_batch(self, items: list[dict]) -> dict:
+        """
+        Send one chunk of stock items to the platform bulk endpoint
+
+        Args:
+            items: Dicts with listing_id, key, channel_product_id and quantity
+
+        Returns:
+            Dict with optional "batch_request_id" (async platforms) and
+            "failed_items" ({key: error}) for items rejected synchronously
+        """
+        pass
+
+    @abstractmethod
+    def _push_price_batch(self, items: list[dict]) -> dict:
+        """
+        Send one chunk of price items to the platform bulk endpoint
+
+        Args:
+            items: Dicts with listing_id, key, channel_product_id, price and list_price
+
+        Returns:
+            Same structure as _push_inventory_batch
+        """
+        pass
+
+    def _push_content_batch(self, items: list[dict]) -> dict:
+        """
+        Send one chunk of catalog content updates to the platform
+
+        Only called when SUPPORTS_CONTENT_PUSH is set. The default marks
+        every item as failed, so a connector that enables the flag without
+        overriding this reports per-listing errors instead of aborting.
+
+        Args:
+            items: Dicts with listing_id, key, channel_product_id, "changes"
+                (only the content fields that differ from the published
+                snapshot) and "content" (the full content, for platforms
+                whose update endpoint needs every field)
+
+        Returns:
+            Same structure as _push_inventory_batch
+        """
+        error = f"{self.__class__.__name__} does not support batch content push"
+        return {"failed_items": {item["key"]: error for item in items}}
+
+    def _supports_content_push(self) -> bool:
+        return self.SUPPORTS_CONTENT_PUSH
+
+    def _fetch_batch_result(self, batch_request_id: str, operation: str) -> dict:
+        """
+        Poll the result of an asynchronous batch request
+
+        Returns:
+            Dict with "done" (bool) and "failed_items" ({key: error})
+        """
+        return {"done": True, "failed_items": {}}
+
+    @staticmethod
+    def _chunked(items: list, size: int):
+        """Yield successive size-sized chunks of items"""
+        for start in range(0, len(items), size):
+            yield items[start : start + size]
+
     # ==================== Utility Methods ====================
 
     def _format_datetime(self, dt: datetime) -> str:
@@ -340,8 +1263,3 @@ class BaseMarketplaceConnector(ABC):
             return ""
         # Remove non-digit characters except + and -
         return "".join(c for c in phone if c.isdigit() or c in "+-")
-
-    def __del__(self):
-        """Clean up session"""
-        if hasattr(self, "session"):
-            self.session.close()
@@ -0,0 +1,74 @@
+"""
+Shared Token Bucket for Marketplace API Calls
+
+Every Odoo worker (and every page-fetch thread inside a worker) takes its
+tokens from the same marketplace_rate_bucket row of the channel. The row is
+locked with SELECT ... FOR UPDATE on a dedicated cursor that is committed
+right away, so the bucket never holds a lock across an HTTP request and
+never joins the caller's transaction.
+"""
+
+import logging
+import time
+
+_logger = logging.getLogger(__name__)
+
+
+def acquire(registry, channel_id: int, rate: float, burst: int) -> float:
+    """
+    Block until the channel bucket grants one request
+
+    Args:
+        registry: Odoo registry of the database (thread safe)
+        channel_id: marketplace.channel id
+        rate: Tokens refilled per second; <= 0 disables limiting
+        burst: Bucket capacity
+
+    Returns:
+        Seconds spent waiting for a token
+    """
+    if rate <= 0:
+        return 0.0
+
+    capacity = max(float(burst), 1.0)
+    waited = 0.0
+    while True:
+        wait = _take_token(registry, channel_id, rate, capacity)
+        if not wait:
+            return waited
+        time.sleep(wait)
+        waited += wait
+
+
+def _take_token(registry, channel_id: int, rate: float, capacity: float) -> float:
+    """Take a token if available; otherwise return the seconds until one is"""
+    with registry.cursor() as cr:
+        now = time.time()
+        cr.execute(
+            """
+            INSERT INTO marketplace_rate_bucket (channel_id, tokens, refilled_at)
+            VALUES (%s, %s, %s)
+            ON CONFLICT (channel_id) DO NOTHING
+            """,
+            [channel_id, capacity, now],
+        )
+        cr.execute(
+            "SELECT tokens, refilled_at FROM marketplace_rate_bucket"
+            " WHERE channel_id = %s FOR UPDATE",
+            [channel_id],
+        )
+        tokens, refilled_at = cr.fetchone()
+        tokens = min(capacity, tokens + max(now - refilled_at, 0.0) * rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+
+        cr.execute(
+            "UPDATE marketplace_rate_bucket SET tokens = %s, refilled_at = %s"
+            " WHERE channel_id = %s",
+            [tokens, now, channel_id],
+        )
+    return wait
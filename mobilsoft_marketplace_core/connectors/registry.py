@@ -0,0 +1,100 @@
+"""
+Per-process Connector Registry
+
+Connector instances are bound to a cursor/environment and are created per
+call, but the expensive parts they use (keep-alive HTTP sessions, parsed
+SOAP clients) and the connector class lookup are kept per worker process
+and reused across syncs, webhooks and cron runs. Shared objects are
+dropped as soon as the connection settings of the channel change.
+"""
+
+from functools import lru_cache
+import importlib
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Channel fields whose change requires new sessions / clients
+CONNECTION_FIELDS = (
+    "channel_type",
+    "platform_type",
+    "api_key",
+    "api_secret",
+    "merchant_id",
+    "shop_id",
+)
+
+# (dbname, model, channel id) -> (fingerprint, {name: shared object})
+_shared = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def resolve_connector_class(connector_path: str):
+    """Import "package.module.ClassName" once per process"""
+    module_path, class_name = connector_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def _channel_key(channel) -> tuple:
+    return (channel.env.cr.dbname, channel._name, channel.id)
+
+
+def _fingerprint(channel) -> int:
+    """Hash of the connection settings; a change invalidates shared objects"""
+    return hash(tuple(channel[f] for f in CONNECTION_FIELDS if f in channel._fields))
+
+
+def get_shared(channel, name: str, factory):
+    """
+    Return the per-process object `name` of a channel, building it once
+
+    Args:
+        channel: marketplace.channel / qcommerce.channel record
+        name: Resource name, e.g. "session" or "soap_client"
+        factory: Callable building the object; a None result is not cached
+
+    Returns:
+        The shared object
+    """
+    key = _channel_key(channel)
+    fingerprint = _fingerprint(channel)
+
+    with _lock:
+        entry = _shared.get(key)
+        if entry and entry[0] == fingerprint and name in entry[1]:
+            return entry[1][name]
+
+    # Build outside the lock: WSDL downloads must not block other channels
+    obj = factory()
+    if obj is None:
+        return None
+
+    with _lock:
+        entry = _shared.get(key)
+        if not entry or entry[0] != fingerprint:
+            if entry:
+                _close_all(entry[1])
+            entry = (fingerprint, {})
+            _shared[key] = entry
+        return entry[1].setdefault(name, obj)
+
+
+def invalidate(channel):
+    """Drop the shared objects of the given channel(s)"""
+    with _lock:
+        for record in channel:
+            entry = _shared.pop(_channel_key(record), None)
+            if entry:
+                _close_all(entry[1])
+
+
+def _close_all(objects: dict):
+    for obj in objects.values():
+        close = getattr(obj, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                _logger.debug(f"Failed to close shared connector object: {str(e)}")
@@ -4,14 +4,164 @@ Marketplace API Controllers
 RESTful API endpoints for marketplace operations
 """
 
+import base64
+from datetime import date, datetime, timezone
 import json
 import logging
 
 from odoo import http
 from odoo.http import Response, request
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+# Page size of the list endpoints (default / upper bound)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# API field name -> model field, in default output order
+ORDER_API_FIELDS = {
+    "id": "id",
+    "channel_order_id": "channel_order_id",
+    "channel": "channel_id",
+    "order_date": "order_date",
+    "customer": "partner_name",
+    "amount": "amount_total",
+    "status": "status",
+    "email": "partner_email",
+    "phone": "partner_phone",
+    "shipping_status": "shipping_status",
+    "tracking_number": "tracking_number",
+    "updated_at": "write_date",
+}
+ORDER_DEFAULT_FIELDS = (
+    "id",
+    "channel_order_id",
+    "channel",
+    "order_date",
+    "customer",
+    "amount",
+    "status",
+)
+
+PRODUCT_API_FIELDS = {
+    "id": "id",
+    "channel_sku": "channel_sku",
+    "product_name": "product_id",
+    "price": "sale_price",
+    "qty": "qty_sellable",
+    "status": "status",
+    "channel": "channel_id",
+    "channel_product_id": "channel_product_id",
+    "list_price": "list_price",
+    "sync_status": "sync_status",
+    "updated_at": "write_date",
+}
+PRODUCT_DEFAULT_FIELDS = ("id", "channel_sku", "product_name", "price", "qty", "status")
+
+
+def _encode_cursor(write_date, record_id) -> str:
+    # isoformat keeps microseconds, so ties on write_date stay exact
+    raw = f"{write_date.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+    write_date, record_id = raw.split("|")
+    return datetime.fromisoformat(write_date), int(record_id)
+
+
+def _parse_datetime(value: str) -> datetime:
+    """ISO 8601 string -> naive UTC datetime"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _serialize_value(value):
+    """search_read value -> JSON: many2one as name, dates as ISO, False as None"""
+    if isinstance(value, tuple):
+        return value[1]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if value is False:
+        return None
+    return value
+
+
+def _read_keyset_page(model_name, domain, api_fields, default_fields, kw):
+    """
+    One page of records in (write_date, id) order
+
+    The page ids come from one index-backed keyset query (record rules
+    applied); the projected fields are then read in one batch, so related
+    names are fetched once per page instead of once per record.
+
+    Request parameters (kw):
+        cursor: next_cursor of the previous page
+        updated_since: ISO datetime, only records written at/after it
+        fields: Comma separated API field names (default: default_fields)
+        limit: Page size, at most MAX_PAGE_SIZE
+
+    Returns:
+        Response dict with data and next_cursor (None on the last page)
+
+    Raises:
+        ValueError: on unknown fields or malformed parameters
+    """
+    requested = kw.get("fields") or default_fields
+    if isinstance(requested, str):
+        requested = [name.strip() for name in requested.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in api_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    Model = request.env[model_name]
+    domain = list(domain)
+    if kw.get("updated_since"):
+        domain.append(("write_date", ">=", _parse_datetime(kw["updated_since"])))
+
+    limit = min(max(int(kw.get("limit") or DEFAULT_PAGE_SIZE), 1), MAX_PAGE_SIZE)
+    query = Model._search(domain, order="write_date, id", limit=limit)
+    if kw.get("cursor"):
+        write_date, record_id = _decode_cursor(kw["cursor"])
+        query.add_where(
+            SQL(
+                "(%s, %s) > (%s, %s)",
+                SQL.identifier(Model._table, "write_date"),
+                SQL.identifier(Model._table, "id"),
+                write_date,
+                record_id,
+            )
+        )
+    ids = list(query)
+
+    model_fields = list({api_fields[name] for name in requested})
+    records = Model.browse(ids).read(model_fields)
+
+    next_cursor = None
+    if len(ids) == limit:
+        # Exact (microsecond) write_date of the last row for the next page
+        request.env.cr.execute(
+            SQL(
+                "SELECT write_date FROM %s WHERE id = %s",
+                SQL.identifier(Model._table),
+                ids[-1],
+            )
+        )
+        next_cursor = _encode_cursor(request.env.cr.fetchone()[0], ids[-1])
+
+    return {
+        "status": "success",
+        "data": [
+            {name: _serialize_value(record[api_fields[name]]) for name in requested}
+            for record in records
+        ],
+        "next_cursor": next_cursor,
+    }
+
 
 class MarketplaceController(http.Controller):
     """Main marketplace API controller"""
@@ -20,18 +170,22 @@ class MarketplaceController(http.Controller):
     def get_channels(self, **kw):
         """Get all marketplace channels"""
         try:
-            channels = request.env["marketplace.channel"].search([])
+            # Statistics are computed for all channels at once by one grouped query
+            channels = request.env["marketplace.channel"].search_read(
+                [],
+                ["name", "channel_type", "active", "last_sync", "total_products", "total_orders"],
+            )
             return {
                 "status": "success",
                 "data": [
                     {
-                        "id": ch.id,
-                        "name": ch.name,
-                        "type": ch.channel_type,
-                        "active": ch.active,
-                        "last_sync": ch.last_sync.isoformat() if ch.last_sync else None,
-                        "total_products": ch.total_products,
-                        "total_orders": ch.total_orders,
+                        "id": ch["id"],
+                        "name": ch["name"],
+                        "type": ch["channel_type"],
+                        "active": ch["active"],
+                        "last_sync": ch["last_sync"].isoformat() if ch["last_sync"] else None,
+                        "total_products": ch["total_products"],
+                        "total_orders": ch["total_orders"],
                     }
                     for ch in channels
                 ],
@@ -96,7 +250,13 @@ class MarketplaceController(http.Controller):
 
     @http.route("/api/marketplace/orders", type="jsonrpc", auth="user", methods=["GET"])
     def get_orders(self, **kw):
-        """Get marketplace orders"""
+        """
+        Get marketplace orders
+
+        Keyset paginated on (write_date, id): pass the returned next_cursor
+        as cursor to get the next page. Supports updated_since, fields and
+        limit (see _read_keyset_page).
+        """
         try:
             domain = []
             if "channel_id" in kw:
@@ -104,25 +264,11 @@ class MarketplaceController(http.Controller):
             if "status" in kw:
                 domain.append(("status", "=", kw["status"]))
 
-            orders = request.env["marketplace.order"].search(domain, limit=100)
-
-            return {
-                "status": "success",
-                "data": [
-                    {
-                        "id": order.id,
-                        "channel_order_id": order.channel_order_id,
-                        "channel": order.channel_id.name,
-                        "order_date": (
-                            order.order_date.isoformat() if order.order_date else None
-                        ),
-                        "customer": order.partner_name,
-                        "amount": order.amount_total,
-                        "status": order.status,
-                    }
-                    for order in orders
-                ],
-            }
+            return _read_keyset_page(
+                "marketplace.order", domain, ORDER_API_FIELDS, ORDER_DEFAULT_FIELDS, kw
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
         except Exception as e:
             return {"status": "error", "message": str(e)}, 500
 
@@ -135,34 +281,39 @@ class MarketplaceController(http.Controller):
     def get_order(self, order_id, **kw):
         """Get order details"""
         try:
-            order = request.env["marketplace.order"].browse(order_id)
-            if not order.exists():
+            order_fields = (
+                "id",
+                "channel_order_id",
+                "channel",
+                "order_date",
+                "customer",
+                "email",
+                "phone",
+                "amount",
+                "status",
+            )
+            orders = request.env["marketplace.order"].search_read(
+                [("id", "=", order_id)], [ORDER_API_FIELDS[name] for name in order_fields]
+            )
+            if not orders:
                 return {"status": "error", "message": "Order not found"}, 404
 
-            return {
-                "status": "success",
-                "data": {
-                    "id": order.id,
-                    "channel_order_id": order.channel_order_id,
-                    "channel": order.channel_id.name,
-                    "order_date": (
-                        order.order_date.isoformat() if order.order_date else None
-                    ),
-                    "customer": order.partner_name,
-                    "email": order.partner_email,
-                    "phone": order.partner_phone,
-                    "amount": order.amount_total,
-                    "status": order.status,
-                    "lines": [
-                        {
-                            "product": line.product_id.name,
-                            "qty": line.qty,
-                            "price": line.price,
-                        }
-                        for line in order.line_ids
-                    ],
-                },
+            lines = request.env["marketplace.order.line"].search_read(
+                [("order_id", "=", order_id)], ["product_id", "qty", "price"]
+            )
+            data = {
+                name: _serialize_value(orders[0][ORDER_API_FIELDS[name]])
+                for name in order_fields
             }
+            data["lines"] = [
+                {
+                    "product": _serialize_value(line["product_id"]),
+                    "qty": line["qty"],
+                    "price": line["price"],
+                }
+                for line in lines
+            ]
+            return {"status": "success", "data": data}
         except Exception as e:
             return {"status": "error", "message": str(e)}, 500
 
@@ -192,7 +343,11 @@ class MarketplaceController(http.Controller):
 
     @http.route("/api/marketplace/products", type="jsonrpc", auth="user", methods=["GET"])
     def get_products(self, **kw):
-        """Get marketplace products"""
+        """
+        Get marketplace products
+
+        Paginated like get_orders (cursor, updated_since, fields, limit).
+        """
         try:
             domain = []
             if "channel_id" in kw:
@@ -200,22 +355,15 @@ class MarketplaceController(http.Controller):
             if "status" in kw:
                 domain.append(("status", "=", kw["status"]))
 
-            products = request.env["marketplace.product"].search(domain, limit=100)
-
-            return {
-                "status": "success",
-                "data": [
-                    {
-                        "id": prod.id,
-                        "channel_sku": prod.channel_sku,
-                        "product_name": prod.product_id.name,
-                        "price": prod.sale_price,
-                        "qty": prod.qty_sellable,
-                        "status": prod.status,
-                    }
-                    for prod in products
-                ],
-            }
+            return _read_keyset_page(
+                "marketplace.product",
+                domain,
+                PRODUCT_API_FIELDS,
+                PRODUCT_DEFAULT_FIELDS,
+                kw,
+            )
+        except ValueError as e:
+            return {"status": "error", "message": str(e)}, 400
         except Exception as e:
             return {"status": "error", "message": str(e)}, 500
 
@@ -234,29 +382,49 @@ class WebhookController(http.Controller):
         """
         Receive webhook from marketplace
 
-        Each marketplace connector should implement specific webhook handling
+        The request must carry the channel's webhook secret (HMAC signature
+        or secret header, see webhook.inbox.mixin._verify_request). The
+        event is then only stored in the webhook inbox and processed by
+        cron (connector._process_webhook), so the platform gets an
+        immediate answer and retried deliveries of the same event are
+        no-ops.
         """
         try:
-            _logger.info(f"Webhook received for channel: {channel}")
-            _logger.info(f"Payload: {kw}")
-
-            # Find channel
-            Channel = http.request.env["marketplace.channel"]
-            marketplace_channel = Channel.search(
-                [("channel_type", "=", channel)], limit=1
+            WebhookEvent = http.request.env["marketplace.webhook.event"]
+            # Only the secret is read before the request is authenticated
+            channels = (
+                http.request.env["marketplace.channel"]
+                .sudo()
+                .search_read([("channel_type", "=", channel)], ["webhook_secret"], limit=1)
             )
 
-            if not marketplace_channel:
+            if not channels:
                 return {"status": "error", "message": "Channel not found"}, 404
 
-            # Get connector and process webhook
-            connector = marketplace_channel._get_connector()
-            result = connector._process_webhook(kw)
+            if not WebhookEvent._verify_request(
+                channels[0]["webhook_secret"], http.request.httprequest
+            ):
+                _logger.warning(f"Webhook rejected for channel {channel}: invalid signature")
+                return {"status": "error", "message": "Invalid signature"}, 401
+
+            if not isinstance(kw, dict) or not kw:
+                return {"status": "error", "message": "Empty payload"}, 400
+
+            marketplace_channel = (
+                http.request.env["marketplace.channel"].sudo().browse(channels[0]["id"])
+            )
+            created = WebhookEvent.sudo().enqueue(marketplace_channel, kw)
+
+            _logger.info(
+                f"Webhook received for channel: {channel} "
+                f"({kw.get('eventType')}, {'queued' if created else 'duplicate'})"
+            )
+            _logger.debug(f"Payload: {kw}")
 
             return {
                 "status": "success",
-                "message": f"Webhook processed for {channel}",
-                "result": result,
+                "message": f"Webhook accepted for {channel}",
+                "duplicate": not created,
             }
         except Exception as e:
             _logger.error(f"Webhook error: {str(e)}")
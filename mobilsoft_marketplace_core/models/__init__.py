@@ -1,7 +1,10 @@
 from . import (
     inherits,
+    marketplace_batch_request,
     marketplace_channel,
     marketplace_order,
     marketplace_product,
+    marketplace_rate_bucket,
     marketplace_sync_log,
+    marketplace_webhook_event,
 )
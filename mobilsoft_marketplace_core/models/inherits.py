@@ -2,7 +2,7 @@
 Marketplace Inherits - Odoo modellerin marketplace entegrasyonları
 """
 
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class SaleOrder(models.Model):
@@ -33,3 +33,32 @@ class StockPicking(models.Model):
     marketplace_order_id = fields.Many2one(
         "marketplace.order", "Pazaryeri Siparişi", ondelete="set null"
     )
+
+
+class StockQuant(models.Model):
+    """Mark marketplace listings dirty when on-hand or reserved stock changes"""
+
+    _inherit = "stock.quant"
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        quants = super().create(vals_list)
+        self.env["marketplace.product"]._mark_stock_dirty(quants.product_id)
+        return quants
+
+    def write(self, vals):
+        res = super().write(vals)
+        if "quantity" in vals or "reserved_quantity" in vals:
+            self.env["marketplace.product"]._mark_stock_dirty(self.product_id)
+        return res
+
+
+class StockMove(models.Model):
+    """Mark marketplace listings dirty when stock moves are done"""
+
+    _inherit = "stock.move"
+
+    def _action_done(self, cancel_backorder=False):
+        moves = super()._action_done(cancel_backorder=cancel_backorder)
+        self.env["marketplace.product"]._mark_stock_dirty(moves.product_id)
+        return moves
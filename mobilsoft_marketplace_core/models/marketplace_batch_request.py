@@ -0,0 +1,111 @@
+import json
+import logging
+
+from odoo import api, fields, models
+
+_logger = logging.getLogger(__name__)
+
+# Sonuç alınamayan toplu istek bu kadar sorgudan sonra başarısız sayılır
+BATCH_MAX_POLLS = 30
+
+
+class MarketplaceBatchRequest(models.Model):
+    """Pazaryeri Toplu Stok/Fiyat/İçerik İsteği"""
+
+    _name = "marketplace.batch.request"
+    _description = "Pazaryeri Toplu İsteği"
+    _order = "submit_date desc, id desc"
+    _rec_name = "batch_request_id"
+
+    channel_id = fields.Many2one(
+        "marketplace.channel",
+        "Pazaryeri",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    operation = fields.Selection(
+        [
+            ("inventory", "Stok"),
+            ("price", "Fiyat"),
+            ("content", "İçerik"),
+        ],
+        string="İşlem",
+        required=True,
+    )
+    batch_request_id = fields.Char("Toplu İstek ID", required=True, index=True)
+    state = fields.Selection(
+        [
+            ("pending", "Sonuç Bekleniyor"),
+            ("done", "Tamamlandı"),
+            ("partial", "Kısmi"),
+            ("failed", "Başarısız"),
+        ],
+        string="Durum",
+        default="pending",
+        required=True,
+        index=True,
+    )
+    product_ids = fields.Many2many("marketplace.product", string="İlanlar")
+    item_count = fields.Integer("Kalem Sayısı")
+    failed_count = fields.Integer("Başarısız Kalem")
+    poll_count = fields.Integer("Sorgu Sayısı", default=0)
+    submit_date = fields.Datetime("Gönderim Zamanı", default=fields.Datetime.now)
+    done_date = fields.Datetime("Sonuç Zamanı")
+    result_details = fields.Text("Sonuç Detayları (JSON)")
+
+    def action_poll(self):
+        """Toplu isteklerin sonucunu pazaryerinden sorgula"""
+        for channel in self.channel_id:
+            batches = self.filtered(
+                lambda b: b.channel_id == channel and b.state == "pending"
+            )
+            if not batches:
+                continue
+            connector = channel._get_connector()
+            for batch in batches:
+                batch._apply_result(connector)
+
+    def _apply_result(self, connector):
+        """Sonucu işle: reddedilen kalemlerin ilanlarını hata durumuna al"""
+        self.ensure_one()
+        try:
+            result = connector._fetch_batch_result(
+                self.batch_request_id, self.operation
+            )
+        except Exception as e:
+            _logger.warning(
+                "Toplu istek sonucu alınamadı (%s): %s", self.batch_request_id, e
+            )
+            result = {"done": False}
+
+        if not result.get("done"):
+            self.poll_count += 1
+            if self.poll_count >= BATCH_MAX_POLLS:
+                self.write({"state": "failed", "done_date": fields.Datetime.now()})
+            return
+
+        failed_items = result.get("failed_items") or {}
+        connector._mark_failed_items(self.product_ids, failed_items, self.operation)
+        self.write(
+            {
+                "state": "partial" if failed_items else "done",
+                "failed_count": len(failed_items),
+                "done_date": fields.Datetime.now(),
+                "result_details": json.dumps(failed_items) if failed_items else False,
+            }
+        )
+
+    @api.model
+    def _cron_poll_pending(self):
+        """Bekleyen toplu isteklerin sonuçlarını sorgula"""
+        pending = self.search([("state", "=", "pending")])
+        for channel in pending.channel_id:
+            try:
+                pending.filtered(lambda b: b.channel_id == channel).action_poll()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error(
+                    "Kanal %s toplu istek sorgusu başarısız: %s", channel.name, e
+                )
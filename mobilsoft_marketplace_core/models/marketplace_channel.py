@@ -1,9 +1,13 @@
+from collections import defaultdict
+from datetime import timedelta
 import json
 import logging
 
 from odoo import api, fields, models
 from odoo.exceptions import UserError, ValidationError
 
+from ..connectors import registry as connector_registry
+
 _logger = logging.getLogger(__name__)
 
 
@@ -36,6 +40,13 @@ class MarketplaceChannel(models.Model):
     # API Credentials
     api_key = fields.Char("API Key", required=True)
     api_secret = fields.Char("API Secret", required=False)
+    webhook_secret = fields.Char(
+        "Webhook Gizli Anahtarı",
+        groups="base.group_system",
+        copy=False,
+        help="Gelen webhook'lar bu anahtarla doğrulanır (X-Webhook-Signature "
+        "HMAC-SHA256 veya X-Webhook-Secret); boşsa webhook kabul edilmez",
+    )
     merchant_id = fields.Char("Satıcı ID", required=False)
     shop_id = fields.Char("Mağaza ID", required=False)
 
@@ -78,6 +89,38 @@ class MarketplaceChannel(models.Model):
     )
     last_error = fields.Text("Son Hata Mesajı", readonly=True)
 
+    # Order Pull
+    order_watermark = fields.Datetime(
+        "Sipariş Senkron İşareti",
+        readonly=True,
+        help="Alınan en yeni siparişin tarihi; sonraki çekim buradan başlar",
+    )
+    order_sync_overlap = fields.Integer(
+        "Çakışma Penceresi (dakika)",
+        default=15,
+        help="Geç düşen siparişleri kaçırmamak için işaretin bu kadar öncesinden başlanır",
+    )
+    order_fetch_workers = fields.Integer(
+        "Paralel Sayfa İsteği",
+        default=4,
+        help="Sipariş sayfaları çekilirken bu kanala aynı anda yapılacak en fazla istek",
+    )
+
+    # API Rate Limiting
+    api_rate_limit = fields.Float(
+        "İstek Limiti (saniye başına)",
+        help="Tüm worker'lar için ortak istek hızı; 0 ise platformun varsayılan limiti kullanılır",
+    )
+    api_rate_burst = fields.Integer(
+        "Anlık İstek Kapasitesi",
+        help="Beklemeden art arda yapılabilecek en fazla istek; 0 ise platform varsayılanı",
+    )
+    api_max_retries = fields.Integer(
+        "Yeniden Deneme Sayısı",
+        default=4,
+        help="429 ve 5xx yanıtlarında artan bekleme ile yapılacak en fazla yeniden deneme",
+    )
+
     # Statistics
     total_products = fields.Integer(
         "Toplam Ürün", compute="_compute_statistics", readonly=True
@@ -112,15 +155,43 @@ class MarketplaceChannel(models.Model):
             if not record.api_key:
                 raise ValidationError("API Key gereklidir!")
 
-    @api.depends("product_ids", "order_ids")
+    @api.depends(
+        "product_ids",
+        "product_ids.active",
+        "product_ids.channel_id",
+        "order_ids",
+        "order_ids.channel_id",
+        "order_ids.status",
+    )
     def _compute_statistics(self):
-        """İstatistikleri hesapla"""
-        for record in self:
-            record.total_products = len(record.product_ids)
-            record.total_orders = len(record.order_ids)
-            record.pending_orders = len(
-                record.order_ids.filtered(lambda x: x.status == "pending")
+        """
+        İstatistikleri hesapla
+
+        Alanlar saklanmaz: sipariş/ilan yazan her işlemin kanal satırını
+        kilitlemesi yerine sayımlar okunurken, kayıtlar yüklenmeden tek bir
+        SQL gruplamasıyla yapılır. Ürün sayısı yalnızca aktif ilanları
+        kapsar.
+        """
+        product_counts = dict(
+            self.env["marketplace.product"]._read_group(
+                [("channel_id", "in", self.ids), ("active", "=", True)],
+                ["channel_id"],
+                ["__count"],
             )
+        )
+        order_counts = defaultdict(int)
+        pending_counts = defaultdict(int)
+        for channel, status, count in self.env["marketplace.order"]._read_group(
+            [("channel_id", "in", self.ids)], ["channel_id", "status"], ["__count"]
+        ):
+            order_counts[channel] += count
+            if status == "pending":
+                pending_counts[channel] += count
+
+        for record in self:
+            record.total_products = product_counts.get(record, 0)
+            record.total_orders = order_counts[record]
+            record.pending_orders = pending_counts[record]
 
     def action_sync_now(self):
         """Hemen senkronizasyon yap"""
@@ -130,7 +201,7 @@ class MarketplaceChannel(models.Model):
                 connector = record._get_connector()
 
                 if record.supports_orders:
-                    connector.sync_orders()
+                    connector.sync_orders(last_sync=record._get_order_sync_start())
                 if record.supports_inventory:
                     connector.sync_inventory()
                 if record.supports_pricing:
@@ -147,6 +218,49 @@ class MarketplaceChannel(models.Model):
                 _logger.error(f"Kanal {record.name} senkronizasyon hatası: {str(e)}")
                 raise UserError(f"Senkronizasyon hatası: {str(e)}")
 
+    def _get_order_sync_start(self):
+        """Sipariş çekiminin başlangıcı: işaret (yoksa son senkron) eksi çakışma penceresi"""
+        self.ensure_one()
+        start = self.order_watermark or self.last_sync
+        if not start:
+            return None
+        return start - timedelta(minutes=self.order_sync_overlap)
+
+    def action_reset_order_watermark(self):
+        """Sipariş işaretini sıfırla (sonraki çekim varsayılan aralıkla başlar)"""
+        self.write({"order_watermark": False})
+
+    def action_push_full_inventory(self):
+        """Değişiklik takibinden bağımsız olarak tüm ilanların stokunu gönder"""
+        for record in self:
+            record._get_connector()._sync_inventory_batched(force=True)
+
+    def action_publish_catalog(self):
+        """Son yayından bu yana değişen içerik, fiyat ve stokları gönder"""
+        for record in self:
+            record._get_connector().publish_catalog()
+
+    @api.model
+    def _cron_sync_stock_changes(self):
+        """
+        Stoku değişen ilanları gönder (dakikalık)
+
+        Yalnızca deneme zamanı gelmiş stock_dirty işaretli ilanı olan
+        kanallar işlenir.
+        """
+        Listing = self.env["marketplace.product"]
+        dirty = Listing.search(Listing._get_stock_push_domain())
+        channels = dirty.channel_id.filtered(
+            lambda c: c.active and c.supports_inventory
+        )
+        for channel in channels:
+            try:
+                channel._get_connector().sync_inventory()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error(f"Kanal {channel.name} stok gönderimi başarısız: {str(e)}")
+
     def action_test_connection(self):
         """API bağlantısını test et"""
         for record in self:
@@ -184,10 +298,8 @@ class MarketplaceChannel(models.Model):
         if not connector_path:
             raise UserError(f"{self.channel_type} için connector bulunamadı!")
 
-        # Import connector dynamically
-        module_path, class_name = connector_path.rsplit(".", 1)
-        module = __import__(module_path, fromlist=[class_name])
-        connector_class = getattr(module, class_name)
+        # Class lookup and sessions are cached per process (connectors.registry)
+        connector_class = connector_registry.resolve_connector_class(connector_path)
 
         return connector_class(self)
 
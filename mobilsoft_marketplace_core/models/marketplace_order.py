@@ -17,7 +17,7 @@ class MarketplaceOrder(models.Model):
 
     # Marketplace Info
     channel_id = fields.Many2one(
-        "marketplace.channel", "Pazaryeri", required=True, ondelete="cascade"
+        "marketplace.channel", "Pazaryeri", required=True, ondelete="cascade", index=True
     )
     channel_order_id = fields.Char("Pazaryeri Sipariş ID", required=True)
 
@@ -96,6 +96,8 @@ class MarketplaceOrder(models.Model):
         'UNIQUE(channel_id, channel_order_id)',
         'Bu sipariş ID pazaryeri içinde benzersiz olmalıdır!',
     )
+    # API sayfalama (write_date, id) sırasıyla yapılır
+    _write_date_id_idx = models.Index("(write_date, id)")
 
     @api.model_create_multi
     def create(self, vals_list):
@@ -287,7 +289,7 @@ class MarketplaceOrderLine(models.Model):
     _order = "sequence"
 
     order_id = fields.Many2one(
-        "marketplace.order", "Sipariş", required=True, ondelete="cascade"
+        "marketplace.order", "Sipariş", required=True, ondelete="cascade", index=True
     )
     sequence = fields.Integer("Sıra", default=10)
 
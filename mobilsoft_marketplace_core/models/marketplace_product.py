@@ -1,3 +1,5 @@
+from datetime import timedelta
+import hashlib
 import json
 import logging
 
@@ -6,6 +8,9 @@ from odoo.exceptions import ValidationError
 
 _logger = logging.getLogger(__name__)
 
+# Başarısız stok gönderiminde yeniden deneme aralığı üst sınırı (dakika)
+STOCK_RETRY_MAX_MINUTES = 24 * 60
+
 
 class MarketplaceProduct(models.Model):
     """Pazaryeri Ürün İlanı"""
@@ -17,7 +22,7 @@ class MarketplaceProduct(models.Model):
 
     # Main Relations
     channel_id = fields.Many2one(
-        "marketplace.channel", "Pazaryeri", required=True, ondelete="cascade"
+        "marketplace.channel", "Pazaryeri", required=True, ondelete="cascade", index=True
     )
     product_id = fields.Many2one("product.product", "Odoo Ürünü", required=True)
 
@@ -70,6 +75,50 @@ class MarketplaceProduct(models.Model):
     )
     last_sync = fields.Datetime("Son Senkronizasyon")
     sync_error = fields.Text("Senkronizasyon Hatası")
+    last_pushed_qty = fields.Float(
+        "Son Gönderilen Stok",
+        readonly=True,
+        help="Pazaryerine en son gönderilen stok; değişmeyen ilanlar tekrar gönderilmez",
+    )
+    last_pushed_price = fields.Float(
+        "Son Gönderilen Fiyat",
+        readonly=True,
+        help="Pazaryerine en son gönderilen satış fiyatı",
+    )
+    stock_dirty = fields.Boolean(
+        "Stok Değişti",
+        readonly=True,
+        index=True,
+        help="Stok hareketi sonrası gönderilmeyi bekliyor",
+    )
+    pending_qty = fields.Float(
+        "Gönderilecek Stok",
+        readonly=True,
+        help="Son stok hareketinden sonraki satılabilir miktar",
+    )
+    stock_retry_count = fields.Integer(
+        "Stok Deneme Sayısı",
+        readonly=True,
+        help="Art arda başarısız stok gönderimi sayısı",
+    )
+    stock_retry_date = fields.Datetime(
+        "Sonraki Stok Denemesi",
+        readonly=True,
+        index=True,
+        help="Başarısız stok gönderimi bu zamandan önce tekrar denenmez",
+    )
+
+    # Published Snapshot
+    published_content = fields.Text(
+        "Yayınlanan İçerik (JSON)",
+        readonly=True,
+        help="Pazaryerine en son başarıyla gönderilen başlık, açıklama, özellik ve görseller",
+    )
+    published_hash = fields.Char(
+        "Yayınlanan İçerik Özeti",
+        readonly=True,
+        help="Değişmeyen ilanların içerik karşılaştırması yapılmadan atlanması için",
+    )
 
     # Extra Fields
     extra_data = fields.Text("Ek Veriler (JSON)")
@@ -78,6 +127,17 @@ class MarketplaceProduct(models.Model):
         'UNIQUE(channel_id, channel_product_id)',
         'Bu ürün ID pazaryeri içinde benzersiz olmalıdır!',
     )
+    # API sayfalama (write_date, id) sırasıyla yapılır
+    _write_date_id_idx = models.Index("(write_date, id)")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        listings = super().create(vals_list)
+        # Henüz gönderilmemiş ilanların stoku dakikalık gönderimle yayınlanır
+        self._mark_stock_dirty(
+            listings.filtered(lambda l: l.sync_status != "synced").product_id
+        )
+        return listings
 
     @api.depends("sale_price", "cost_price")
     def _compute_margin(self):
@@ -96,6 +156,128 @@ class MarketplaceProduct(models.Model):
         for record in self:
             record.qty_sellable = record.qty_available - record.qty_reserved
 
+    @api.model
+    def _get_sellable_qty(self, products):
+        """Ürün bazında satılabilir miktar (rezerveler düşülmüş), tek hesaplamada"""
+        return {product.id: max(int(product.free_qty), 0) for product in products}
+
+    @api.model
+    def _mark_stock_dirty(self, products):
+        """
+        Stok hareketi gören ürünlerin ilanlarını işaretle
+
+        Aynı transaction içindeki tüm hareketler toplanır; ilanlar commit
+        öncesinde bir kez, yeni satılabilir miktarla işaretlenir.
+        """
+        if not products:
+            return
+        data = self.env.cr.precommit.data
+        if "marketplace.dirty_product_ids" not in data:
+            data["marketplace.dirty_product_ids"] = set()
+            self.env.cr.precommit.add(self._flush_stock_dirty)
+        data["marketplace.dirty_product_ids"].update(products.ids)
+
+    def _flush_stock_dirty(self):
+        product_ids = self.env.cr.precommit.data.pop("marketplace.dirty_product_ids", set())
+        listings = self.sudo().search(
+            [
+                ("product_id", "in", list(product_ids)),
+                ("active", "=", True),
+            ]
+        )
+        if not listings:
+            return
+
+        qty_by_product = self._get_sellable_qty(listings.product_id)
+        by_qty = {}
+        for listing in listings:
+            by_qty.setdefault(qty_by_product.get(listing.product_id.id, 0), []).append(
+                listing.id
+            )
+        for qty, listing_ids in by_qty.items():
+            self.sudo().browse(listing_ids).write(
+                {"stock_dirty": True, "pending_qty": qty}
+            )
+
+    @api.model
+    def _get_stock_push_domain(self):
+        """Stok gönderimi bekleyen ve deneme zamanı gelmiş ilanlar"""
+        return [
+            ("stock_dirty", "=", True),
+            ("active", "=", True),
+            "|",
+            ("stock_retry_date", "=", False),
+            ("stock_retry_date", "<=", fields.Datetime.now()),
+        ]
+
+    def _schedule_stock_retry(self):
+        """
+        Stoku gönderilemeyen ilanları bir sonraki denemeye ertele
+
+        Bekleme her başarısızlıkta ikiye katlanır (2, 4, 8 ... dakika, en
+        fazla bir gün); ilanlar stock_dirty kalır ve süre dolunca tekrar
+        gönderilir.
+        """
+        now = fields.Datetime.now()
+        by_count = {}
+        for listing in self:
+            by_count.setdefault(listing.stock_retry_count + 1, []).append(listing.id)
+        for count, listing_ids in by_count.items():
+            delay = min(2 ** min(count, 11), STOCK_RETRY_MAX_MINUTES)
+            self.browse(listing_ids).write(
+                {
+                    "stock_retry_count": count,
+                    "stock_retry_date": now + timedelta(minutes=delay),
+                }
+            )
+
+    def _get_content_payloads(self) -> dict:
+        """
+        İlanların yayınlanacak içeriği, ilan id'si bazında
+
+        Fiyat ve stok last_pushed_price / last_pushed_qty ile ayrıca
+        izlenir; burada yalnızca katalog içeriği yer alır.
+        """
+        payloads = {}
+        for listing in self:
+            product = listing.product_id
+            extra = listing.get_extra_data()
+            attributes = extra.get("attributes") or {
+                ptav.attribute_id.name: ptav.name
+                for ptav in product.product_template_attribute_value_ids
+            }
+            payloads[listing.id] = {
+                "title": listing.title or product.name or "",
+                "description": listing.description or product.description_sale or "",
+                "category": listing.channel_category or "",
+                "barcode": product.barcode or "",
+                "attributes": attributes,
+                "images": extra.get("images") or [],
+            }
+        return payloads
+
+    @api.model
+    def _content_hash(self, content: dict) -> str:
+        canonical = json.dumps(content, sort_keys=True, default=str)
+        return hashlib.sha1(canonical.encode()).hexdigest()
+
+    @api.model
+    def _diff_content(self, published: dict, content: dict) -> dict:
+        """Son yayınlanan içeriğe göre değişen alanlar"""
+        return {
+            key: value for key, value in content.items() if published.get(key) != value
+        }
+
+    def get_published_content(self):
+        """Son yayınlanan içeriği JSON olarak döndür"""
+        if not self.published_content:
+            return {}
+        try:
+            return json.loads(self.published_content)
+        except json.JSONDecodeError as e:
+            _logger.warning("Ürün published_content JSON parse hatası (id=%s): %s", self.id, e)
+            return {}
+
     def action_sync_now(self):
         """Ürünü hemen senkronize et"""
         for record in self:
@@ -0,0 +1,29 @@
+from odoo import fields, models
+
+
+class MarketplaceRateBucket(models.Model):
+    """
+    Pazaryeri API İstek Kovası
+
+    Kanal başına tek satır; tüm worker'lar istek hakkını bu satırdan alır
+    (bkz. connectors/rate_limiter.py). Kayıtlar yalnızca SQL ile güncellenir.
+    """
+
+    _name = "marketplace.rate.bucket"
+    _description = "Pazaryeri API İstek Kovası"
+    _log_access = False
+    _rec_name = "channel_id"
+
+    channel_id = fields.Many2one(
+        "marketplace.channel",
+        "Pazaryeri",
+        required=True,
+        ondelete="cascade",
+    )
+    tokens = fields.Float("Kalan Hak", readonly=True)
+    refilled_at = fields.Float("Son Doldurma (epoch)", readonly=True)
+
+    _constraint_channel_uniq = models.Constraint(
+        "UNIQUE(channel_id)",
+        "Her pazaryeri için tek istek kovası olabilir!",
+    )
@@ -59,6 +59,12 @@ class MarketplaceSyncLog(models.Model):
     # Log details
     api_call_count = fields.Integer("API Çağrı Sayısı", default=0)
     response_time = fields.Float("Ortalama Yanıt Süresi (ms)", default=0)
+    retry_count = fields.Integer("Yeniden Deneme Sayısı", default=0)
+    throttle_wait = fields.Float(
+        "Bekleme Süresi (saniye)",
+        default=0,
+        help="İstek limiti ve 429/5xx yeniden denemeleri nedeniyle beklenen toplam süre",
+    )
 
     @api.depends("start_time", "end_time")
     def _compute_duration(self):
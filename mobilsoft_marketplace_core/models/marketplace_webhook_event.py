@@ -0,0 +1,31 @@
+from odoo import fields, models
+
+
+class MarketplaceWebhookEvent(models.Model):
+    """Pazaryeri Webhook Gelen Kutusu"""
+
+    _name = "marketplace.webhook.event"
+    _inherit = ["webhook.inbox.mixin"]
+    _description = "Pazaryeri Webhook Olayı"
+
+    _order_ref_keys = ("orderId", "orderNumber", "order_id", "shipmentPackageId")
+    _order_pull_event_types = ("OrderCreated",)
+    _inbox_cron_xmlid = "mobilsoft_marketplace_core.ir_cron_marketplace_webhook_inbox"
+
+    channel_id = fields.Many2one(
+        "marketplace.channel",
+        "Pazaryeri",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+
+    _constraint_channel_dedup_key_uniq = models.Constraint(
+        "UNIQUE(channel_id, dedup_key)",
+        "Bu olay zaten alındı!",
+    )
+
+    def _pull_orders(self, connector):
+        # Sipariş işaretinden (watermark) itibaren tek çekim
+        connector.sync_orders()
+        return True
@@ -0,0 +1 @@
+from . import test_ingest_orders
@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+
+from odoo.tests import TransactionCase, tagged
+
+from ..connectors.base_connector import BaseMarketplaceConnector
+
+
+class _StubConnector(BaseMarketplaceConnector):
+    """Connector without API access; only the ORM ingestion is exercised"""
+
+    ORDER_INGEST_CHUNK = 2
+
+    def test_connection(self):
+        return True
+
+    def sync_orders(self, last_sync=None):
+        return {}
+
+    def sync_inventory(self):
+        return {}
+
+    def sync_prices(self):
+        return {}
+
+    def _push_inventory_batch(self, items):
+        return {}
+
+    def _push_price_batch(self, items):
+        return {}
+
+    def _push_content_batch(self, items):
+        return {}
+
+
+@tagged("post_install", "-at_install")
+class TestIngestOrders(TransactionCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.channel = cls.env["marketplace.channel"].create(
+            {
+                "name": "Test Kanal",
+                "channel_type": "other",
+                "api_key": "test",
+                "auto_confirm_orders": False,
+            }
+        )
+        cls.connector = _StubConnector(cls.channel)
+
+    def _payloads(self, count):
+        start = datetime(2026, 1, 1)
+        return [
+            {
+                "channel_order_id": f"T-{index}",
+                "order_date": start + timedelta(minutes=index),
+                "partner_name": "Müşteri",
+                "amount_total": 10.0,
+                "lines": [],
+            }
+            for index in range(count)
+        ]
+
+    def test_ingest_orders_over_several_chunks(self):
+        payloads = self._payloads(5)
+        result = self.connector._ingest_orders(payloads)
+
+        self.assertEqual(result["created"], 5)
+        self.assertEqual(result["failed"], 0)
+        self.assertEqual(result["failed_ids"], [])
+        self.assertEqual(len(result["orders"]), 5)
+
+        # Re-ingesting the same page updates, never duplicates
+        result = self.connector._ingest_orders(payloads)
+        self.assertEqual(result["created"], 0)
+        self.assertEqual(result["updated"], 5)
+
+    def test_watermark_moves_to_latest_order(self):
+        payloads = self._payloads(3)
+        result = self.connector._ingest_orders(payloads)
+        self.connector._update_order_watermark(payloads, result["failed_ids"])
+        self.assertEqual(self.channel.order_watermark, payloads[-1]["order_date"])
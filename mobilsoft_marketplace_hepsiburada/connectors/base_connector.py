@@ -5,7 +5,7 @@ Hepsiburada REST API entegrasyonu
 Documentation: https://developer.hepsiburada.com/
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +23,16 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
 
     API_BASE_URL = "https://api.hepsiburada.com/api"
 
+    # Listing uploads are limited to 1000 items per request
+    BATCH_SIZE = 1000
+
+    # Partial product updates go through the product-updates endpoint
+    SUPPORTS_CONTENT_PUSH = True
+
+    # Merchant API quota: 10 requests per second
+    RATE_LIMIT = 10.0
+    RATE_BURST = 20
+
     def __init__(self, channel_record):
         """Initialize Hepsiburada connector"""
         super().__init__(channel_record)
@@ -77,18 +87,19 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
             _logger.info("Starting Hepsiburada order sync")
 
             if not last_sync:
-                last_sync = datetime.now() - timedelta(hours=24)
+                last_sync = self._get_order_sync_start()
 
             # Fetch orders from Hepsiburada API
             orders = self._fetch_hepsiburada_orders(last_sync)
 
+            order_payloads = []
             for order_data in orders:
                 try:
                     # Process each order
                     shipping_addr = order_data.get("shippingAddress", {})
                     invoice_addr = order_data.get("invoiceAddress", {})
 
-                    marketplace_order = self._process_marketplace_order(
+                    order_payloads.append(
                         {
                             "channel_order_id": str(order_data.get("orderNumber")),
                             "order_date": self._parse_datetime(
@@ -101,22 +112,22 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
                             "amount_total": float(
                                 order_data.get("totalPrice", {}).get("value", 0)
                             ),
+                            "lines": order_data.get("lineItems", []),
                         }
                     )
 
-                    # Create order lines
-                    self._create_order_lines(
-                        marketplace_order, order_data.get("lineItems", [])
-                    )
-
-                    created_count += 1
-
                 except Exception as e:
                     _logger.error(
                         f"Failed to process order {order_data.get('orderNumber')}: {str(e)}"
                     )
                     failed_count += 1
 
+            result = self._ingest_orders(order_payloads)
+            created_count = result["created"]
+            updated_count = result["updated"]
+            failed_count += result["failed"]
+            self._update_order_watermark(order_payloads, result["failed_ids"])
+
             self._update_sync_log(
                 "success",
                 records_processed=len(orders),
@@ -126,7 +137,8 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
             )
 
             _logger.info(
-                f"Order sync completed: {created_count} created, {failed_count} failed"
+                f"Order sync completed: {created_count} created, {updated_count} updated, "
+                f"{failed_count} failed"
             )
 
         except Exception as e:
@@ -137,155 +149,46 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
         """
         Sync inventory to Hepsiburada
 
-        Update product stock on Hepsiburada based on Odoo inventory
+        Push stock of changed listings through the bulk inventory endpoint
         """
-        sync_log = self._create_sync_log("sync_inventory")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Hepsiburada inventory sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    qty = marketplace_product.product_id.qty_available
-
-                    # Update stock on Hepsiburada
-                    self._update_hepsiburada_stock(
-                        marketplace_product.channel_product_id, int(qty)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "qty_available": qty,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync stock for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Inventory sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Inventory sync failed: {str(e)}")
-            self._log_error(f"Stok senkronizasyonu başarısız: {str(e)}")
+        return self._sync_inventory_batched()
 
     def sync_prices(self) -> dict[str, Any]:
         """
         Sync prices to Hepsiburada
 
-        Update product prices on Hepsiburada based on Odoo prices
+        Push prices of changed listings through the bulk price endpoint
         """
-        sync_log = self._create_sync_log("sync_prices")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Hepsiburada price sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    price = (
-                        marketplace_product.sale_price
-                        or marketplace_product.product_id.list_price
-                    )
-
-                    # Update price on Hepsiburada
-                    self._update_hepsiburada_price(
-                        marketplace_product.channel_product_id, float(price)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "sale_price": price,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync price for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Price sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Price sync failed: {str(e)}")
-            self._log_error(f"Fiyat senkronizasyonu başarısız: {str(e)}")
+        return self._sync_prices_batched()
 
     # ==================== Hepsiburada API Methods ====================
 
     def _fetch_hepsiburada_orders(self, last_sync: datetime) -> list[dict]:
-        """Fetch orders from Hepsiburada API"""
-        try:
-            # Format date for API (ISO 8601)
-            start_date = self._format_datetime(last_sync)
+        """
+        Fetch orders from Hepsiburada API
 
+        Pages are offset based; once totalCount is known the remaining
+        offsets are fetched in parallel.
+        """
+        try:
             url = f"{self.API_BASE_URL}/shop/{self.shop_id}/orders"
+            limit = 100
             params = {
-                "createdDateFrom": start_date,
-                "limit": 100,
+                # Format date for API (ISO 8601)
+                "createdDateFrom": self._format_datetime(last_sync),
+                "limit": limit,
             }
 
-            all_orders = []
-            offset = 0
-
-            # Pagination loop
-            while True:
-                params["offset"] = offset
-                response = self._make_api_call("GET", url, params=params)
-                data = response.json()
-
+            def fetch_page(page):
+                data = self._send_request(
+                    "GET", url, params=dict(params, offset=page * limit)
+                ).json()
                 orders = data.get("orders", [])
-                if not orders:
-                    break
-
-                all_orders.extend(orders)
-
-                # Check if there are more orders
-                if len(orders) < params["limit"]:
-                    break
+                total_count = data.get("totalCount")
+                total_pages = -(-int(total_count) // limit) if total_count else None
+                return orders, len(orders) >= limit, total_pages
 
-                offset += params["limit"]
+            all_orders = self._fetch_all_pages(fetch_page, first_page=0)
 
             _logger.info(f"Fetched {len(all_orders)} orders from Hepsiburada")
             return all_orders
@@ -294,37 +197,95 @@ class HepsiburadaConnector(BaseMarketplaceConnector):
             _logger.error(f"Failed to fetch orders: {str(e)}")
             raise
 
-    def _update_hepsiburada_stock(self, product_id: str, quantity: int) -> bool:
-        """Update product stock on Hepsiburada"""
-        try:
-            url = f"{self.API_BASE_URL}/products/{product_id}/inventory"
+    def _push_inventory_batch(self, items: list[dict]) -> dict:
+        """Upload stock of up to BATCH_SIZE listings in one request"""
+        return self._post_listing_upload(
+            "stock-uploads",
+            [
+                {
+                    "hepsiburadaSku": item["channel_product_id"],
+                    "merchantSku": item["key"],
+                    "availableStock": item["quantity"],
+                }
+                for item in items
+            ],
+        )
 
-            payload = {
-                "quantity": quantity,
-            }
+    def _push_price_batch(self, items: list[dict]) -> dict:
+        """Upload prices of up to BATCH_SIZE listings in one request"""
+        return self._post_listing_upload(
+            "price-uploads",
+            [
+                {
+                    "hepsiburadaSku": item["channel_product_id"],
+                    "merchantSku": item["key"],
+                    "price": item["price"],
+                }
+                for item in items
+            ],
+        )
 
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
+    def _push_content_batch(self, items: list[dict]) -> dict:
+        """
+        Send partial product updates for up to BATCH_SIZE listings
 
-        except Exception as e:
-            _logger.error(f"Failed to update stock for {product_id}: {str(e)}")
-            raise
+        Each item carries only the fields that changed since the last
+        successful publish.
+        """
+        field_map = {
+            "title": "productName",
+            "description": "description",
+            "category": "categoryId",
+            "barcode": "barcode",
+            "attributes": "attributes",
+            "images": "images",
+        }
+        payload = [
+            dict(
+                {"hepsiburadaSku": item["channel_product_id"], "merchantSku": item["key"]},
+                **{field_map[field]: value for field, value in item["changes"].items()},
+            )
+            for item in items
+        ]
+        url = f"{self.API_BASE_URL}/products/merchantid/{self.shop_id}/product-updates"
+        response = self._make_api_call("POST", url, json=payload)
+        return {"batch_request_id": response.json().get("id")}
 
-    def _update_hepsiburada_price(self, product_id: str, price: float) -> bool:
-        """Update product price on Hepsiburada"""
-        try:
-            url = f"{self.API_BASE_URL}/products/{product_id}/price"
+    def _post_listing_upload(self, upload_type: str, payload: list[dict]) -> dict:
+        """
+        Send a listing upload
 
-            payload = {
-                "price": price,
-            }
+        Uploads are processed asynchronously; the returned id is used to
+        query item results.
+        """
+        url = f"{self.API_BASE_URL}/listings/merchantid/{self.shop_id}/{upload_type}"
+        response = self._make_api_call("POST", url, json=payload)
+        return {"batch_request_id": response.json().get("id")}
+
+    def _fetch_batch_result(self, batch_request_id: str, operation: str) -> dict:
+        """Query per-SKU results of a stock, price or product update upload"""
+        if operation == "content":
+            url = (
+                f"{self.API_BASE_URL}/products/merchantid/{self.shop_id}"
+                f"/product-updates/id/{batch_request_id}"
+            )
+        else:
+            upload_type = "stock-uploads" if operation == "inventory" else "price-uploads"
+            url = (
+                f"{self.API_BASE_URL}/listings/merchantid/{self.shop_id}"
+                f"/{upload_type}/id/{batch_request_id}"
+            )
+        data = self._make_api_call("GET", url).json()
 
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
+        if data.get("status") not in ("Done", "Failed"):
+            return {"done": False}
 
-        except Exception as e:
-            _logger.error(f"Failed to update price for {product_id}: {str(e)}")
-            raise
+        failed_items = {
+            error.get("merchantSku"): ", ".join(error.get("errors") or [])
+            or data.get("status")
+            for error in data.get("errors", [])
+        }
+        return {"done": True, "failed_items": failed_items}
 
     # ==================== Helper Methods ====================
 
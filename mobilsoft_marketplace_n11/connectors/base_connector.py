@@ -5,7 +5,7 @@ N11 SOAP/REST API hybrid entegrasyonu
 Documentation: https://www.n11.com/tools-detail/api
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -14,6 +14,7 @@ import requests
 from zeep import Client as SoapClient
 from zeep.exceptions import Fault as SoapFault
 
+from odoo.addons.mobilsoft_marketplace_core.connectors import rate_limiter, registry
 from odoo.addons.mobilsoft_marketplace_core.connectors.base_connector import (
     BaseMarketplaceConnector,
 )
@@ -41,13 +42,43 @@ class N11Connector(BaseMarketplaceConnector):
         self._configure_session()
 
     def _init_soap_client(self):
-        """Initialize ZEEP SOAP client"""
+        """
+        Initialize ZEEP SOAP client
+
+        The parsed WSDL is reused by every connector of this channel in the
+        worker process instead of being downloaded on each call.
+        """
+        self.soap_client = registry.get_shared(
+            self.channel, "soap_client", self._build_soap_client
+        )
+
+    def _build_soap_client(self):
+        """Download and parse the N11 WSDL"""
         try:
-            self.soap_client = SoapClient(wsdl=self.SOAP_WSDL)
+            client = SoapClient(wsdl=self.SOAP_WSDL)
             _logger.info("SOAP client initialized successfully")
+            return client
         except Exception as e:
             _logger.error(f"Failed to initialize SOAP client: {str(e)}")
-            self.soap_client = None
+            return None
+
+    def _call_soap(self, operation: str, **kwargs):
+        """
+        Call a SOAP operation through the channel's rate limiter
+
+        zeep does its own HTTP, so the token is taken here the same way
+        _send_request does for REST calls, and the call is counted in the
+        connector stats.
+        """
+        waited = rate_limiter.acquire(
+            self._registry, self._channel_id, self._rate_limit, self._rate_burst
+        )
+        with self._stats_lock:
+            self.api_call_count += 1
+            self.throttle_wait += waited
+
+        _logger.info(f"SOAP Call: {operation}")
+        return getattr(self.soap_client.service, operation)(**kwargs)
 
     def _configure_session(self):
         """Configure requests session with N11 headers"""
@@ -71,7 +102,8 @@ class N11Connector(BaseMarketplaceConnector):
             # Simple SOAP call to test connection
             # N11 SOAP service doesn't have a simple "ping" so we test with GetServiceFields
             try:
-                response = self.soap_client.service.GetServiceFields(
+                response = self._call_soap(
+                    "GetServiceFields",
                     request={
                         "authentication": {
                             "userName": self.merchant_id,
@@ -122,14 +154,15 @@ class N11Connector(BaseMarketplaceConnector):
             _logger.info("Starting N11 order sync")
 
             if not last_sync:
-                last_sync = datetime.now() - timedelta(hours=24)
+                last_sync = self._get_order_sync_start()
 
             # Fetch orders via SOAP
             orders = self._fetch_n11_orders(last_sync)
 
+            order_payloads = []
             for order_data in orders:
                 try:
-                    marketplace_order = self._process_marketplace_order(
+                    order_payloads.append(
                         {
                             "channel_order_id": str(order_data.get("orderId")),
                             "order_date": self._parse_datetime(
@@ -142,22 +175,22 @@ class N11Connector(BaseMarketplaceConnector):
                                 order_data.get("shippingAddress")
                             ),
                             "amount_total": float(order_data.get("totalPrice", 0)),
+                            "lines": order_data.get("products", []),
                         }
                     )
 
-                    # Create order lines from products
-                    self._create_order_lines(
-                        marketplace_order, order_data.get("products", [])
-                    )
-
-                    created_count += 1
-
                 except Exception as e:
                     _logger.error(
                         f"Failed to process order {order_data.get('orderId')}: {str(e)}"
                     )
                     failed_count += 1
 
+            result = self._ingest_orders(order_payloads)
+            created_count = result["created"]
+            updated_count = result["updated"]
+            failed_count += result["failed"]
+            self._update_order_watermark(order_payloads, result["failed_ids"])
+
             self._update_sync_log(
                 "success",
                 records_processed=len(orders),
@@ -167,7 +200,8 @@ class N11Connector(BaseMarketplaceConnector):
             )
 
             _logger.info(
-                f"Order sync completed: {created_count} created, {failed_count} failed"
+                f"Order sync completed: {created_count} created, {updated_count} updated, "
+                f"{failed_count} failed"
             )
 
         except Exception as e:
@@ -178,116 +212,17 @@ class N11Connector(BaseMarketplaceConnector):
         """
         Sync inventory to N11
 
-        Update product stock on N11 based on Odoo inventory
+        Push stock of changed listings through the bulk inventory endpoint
         """
-        sync_log = self._create_sync_log("sync_inventory")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting N11 inventory sync")
-
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    qty = int(marketplace_product.product_id.qty_available)
-
-                    # Update stock via SOAP
-                    self._update_n11_stock(marketplace_product.channel_product_id, qty)
-
-                    marketplace_product.write(
-                        {
-                            "qty_available": qty,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync stock for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Inventory sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Inventory sync failed: {str(e)}")
-            self._log_error(f"Stok senkronizasyonu başarısız: {str(e)}")
+        return self._sync_inventory_batched()
 
     def sync_prices(self) -> dict[str, Any]:
         """
         Sync prices to N11
 
-        Update product prices on N11 based on Odoo prices
+        Push prices of changed listings through the bulk price endpoint
         """
-        sync_log = self._create_sync_log("sync_prices")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting N11 price sync")
-
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    price = (
-                        marketplace_product.sale_price
-                        or marketplace_product.product_id.list_price
-                    )
-
-                    # Update price via SOAP
-                    self._update_n11_price(
-                        marketplace_product.channel_product_id, float(price)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "sale_price": price,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync price for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Price sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Price sync failed: {str(e)}")
-            self._log_error(f"Fiyat senkronizasyonu başarısız: {str(e)}")
+        return self._sync_prices_batched()
 
     # ==================== N11 SOAP API Methods ====================
 
@@ -295,7 +230,9 @@ class N11Connector(BaseMarketplaceConnector):
         """
         Fetch orders from N11 via SOAP
 
-        N11 provides orders via RSS feed in SOAP response
+        N11 provides orders via RSS feed in SOAP response. All pages are
+        read using pagingData.pageCount; the shared SOAP client is not
+        used from several threads, so pages are fetched one by one.
         """
         try:
             if not self.soap_client:
@@ -305,28 +242,37 @@ class N11Connector(BaseMarketplaceConnector):
             # Request orders created after last_sync
             start_date = self._format_datetime(last_sync)
 
-            # N11 GetOrders SOAP call
-            response = self.soap_client.service.GetOrders(
-                request={
-                    "authentication": {
-                        "userName": self.merchant_id,
-                        "userPassword": self.api_key,
-                    },
-                    "pagingData": {
-                        "pageNumber": 1,
-                        "pageSize": 100,
-                    },
-                    "orderFilter": {
-                        "startDate": start_date,
-                    },
-                }
-            )
+            def fetch_page(page):
+                response = self._call_soap(
+                    "GetOrders",
+                    request={
+                        "authentication": {
+                            "userName": self.merchant_id,
+                            "userPassword": self.api_key,
+                        },
+                        "pagingData": {
+                            "pageNumber": page,
+                            "pageSize": 100,
+                        },
+                        "orderFilter": {
+                            "startDate": start_date,
+                        },
+                    }
+                )
+
+                orders = []
+                if hasattr(response, "orders") and response.orders:
+                    orders = self._parse_soap_orders(response.orders)
 
-            orders = []
+                paging = getattr(response, "pagingData", None)
+                page_count = getattr(paging, "pageCount", None) if paging else None
+                if page_count is not None:
+                    has_more = page < page_count
+                else:
+                    has_more = len(orders) >= 100
+                return orders, has_more, page_count
 
-            # Parse SOAP response
-            if hasattr(response, "orders") and response.orders:
-                orders = self._parse_soap_orders(response.orders)
+            orders = self._fetch_all_pages(fetch_page, first_page=1, concurrent=False)
 
             _logger.info(f"Fetched {len(orders)} orders from N11")
             return orders
@@ -338,35 +284,57 @@ class N11Connector(BaseMarketplaceConnector):
             _logger.error(f"Failed to fetch orders: {str(e)}")
             return []
 
-    def _update_n11_stock(self, product_id: str, quantity: int) -> bool:
-        """Update product stock on N11 via SOAP"""
-        try:
-            if not self.soap_client:
-                return False
+    def _push_inventory_batch(self, items: list[dict]) -> dict:
+        """
+        Update stock of up to BATCH_SIZE seller stock codes via SOAP
 
-            response = self.soap_client.service.SetProductInventory(
-                request={
-                    "authentication": {
-                        "userName": self.merchant_id,
-                        "userPassword": self.api_key,
-                    },
-                    "product": {
-                        "productId": product_id,
-                        "inventory": quantity,
-                    },
-                }
-            )
+        UpdateStockByStockSellerCode accepts a list of stock items and
+        answers synchronously, so there is no batch id to poll.
+        """
+        if not self.soap_client:
+            raise RuntimeError("SOAP client not available")
+
+        response = self._call_soap(
+            "UpdateStockByStockSellerCode",
+            request={
+                "authentication": {
+                    "userName": self.merchant_id,
+                    "userPassword": self.api_key,
+                },
+                "stockItems": {
+                    "stockItem": [
+                        {
+                            "sellerStockCode": item["key"],
+                            "quantity": item["quantity"],
+                        }
+                        for item in items
+                    ],
+                },
+            }
+        )
 
-            # Check response status
-            if hasattr(response, "isSuccessful") and response.isSuccessful:
-                return True
+        if hasattr(response, "isSuccessful") and response.isSuccessful:
+            return {}
 
-            _logger.warning(f"Stock update not successful for {product_id}")
-            return False
+        _logger.warning(f"Stock batch update not successful for {len(items)} items")
+        return {
+            "failed_items": {
+                item["key"]: "N11 stok güncellemesi başarısız" for item in items
+            }
+        }
 
-        except Exception as e:
-            _logger.error(f"Failed to update stock: {str(e)}")
-            return False
+    def _push_price_batch(self, items: list[dict]) -> dict:
+        """
+        Update prices via SOAP
+
+        N11 SOAP has no multi-product price call; items are sent one by one
+        and only the rejected ones are reported back.
+        """
+        failed_items = {}
+        for item in items:
+            if not self._update_n11_price(item["channel_product_id"], item["price"]):
+                failed_items[item["key"]] = "N11 fiyat güncellemesi başarısız"
+        return {"failed_items": failed_items}
 
     def _update_n11_price(self, product_id: str, price: float) -> bool:
         """Update product price on N11 via SOAP"""
@@ -374,7 +342,8 @@ class N11Connector(BaseMarketplaceConnector):
             if not self.soap_client:
                 return False
 
-            response = self.soap_client.service.SetProductPrice(
+            response = self._call_soap(
+                "SetProductPrice",
                 request={
                     "authentication": {
                         "userName": self.merchant_id,
@@ -5,7 +5,7 @@ Trendyol REST API v2.0 entegrasyonu
 Documentation: https://developer.trendyol.com/
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -23,6 +23,16 @@ class TrendyolConnector(BaseMarketplaceConnector):
 
     API_BASE_URL = "https://api.trendyol.com/v2"
 
+    # price-and-inventory accepts at most 1000 items per request
+    BATCH_SIZE = 1000
+
+    # Product updates go through the bulk products endpoint
+    SUPPORTS_CONTENT_PUSH = True
+
+    # Supplier API quota: 50 requests per 10 seconds
+    RATE_LIMIT = 5.0
+    RATE_BURST = 50
+
     def __init__(self, channel_record):
         """Initialize Trendyol connector"""
         super().__init__(channel_record)
@@ -86,15 +96,16 @@ class TrendyolConnector(BaseMarketplaceConnector):
             _logger.info("Starting Trendyol order sync")
 
             if not last_sync:
-                last_sync = datetime.now() - timedelta(hours=24)
+                last_sync = self._get_order_sync_start()
 
             # Fetch orders from Trendyol API
             orders = self._fetch_trendyol_orders(last_sync)
 
+            order_payloads = []
             for order_data in orders:
                 try:
                     # Process each order
-                    marketplace_order = self._process_marketplace_order(
+                    order_payloads.append(
                         {
                             "channel_order_id": str(order_data.get("orderId")),
                             "order_date": self._parse_datetime(
@@ -113,22 +124,22 @@ class TrendyolConnector(BaseMarketplaceConnector):
                                 order_data.get("shippingAddress")
                             ),
                             "amount_total": float(order_data.get("totalPrice", 0)),
+                            "lines": order_data.get("lines", []),
                         }
                     )
 
-                    # Create order lines
-                    self._create_order_lines(
-                        marketplace_order, order_data.get("lines", [])
-                    )
-
-                    created_count += 1
-
                 except Exception as e:
                     _logger.error(
                         f"Failed to process order {order_data.get('orderId')}: {str(e)}"
                     )
                     failed_count += 1
 
+            result = self._ingest_orders(order_payloads)
+            created_count = result["created"]
+            updated_count = result["updated"]
+            failed_count += result["failed"]
+            self._update_order_watermark(order_payloads, result["failed_ids"])
+
             self._update_sync_log(
                 "success",
                 records_processed=len(orders),
@@ -138,7 +149,8 @@ class TrendyolConnector(BaseMarketplaceConnector):
             )
 
             _logger.info(
-                f"Order sync completed: {created_count} created, {failed_count} failed"
+                f"Order sync completed: {created_count} created, {updated_count} updated, "
+                f"{failed_count} failed"
             )
 
         except Exception as e:
@@ -149,156 +161,44 @@ class TrendyolConnector(BaseMarketplaceConnector):
         """
         Sync inventory to Trendyol
 
-        Update product stock on Trendyol based on Odoo inventory
+        Push stock of changed listings through the bulk inventory endpoint
         """
-        sync_log = self._create_sync_log("sync_inventory")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Trendyol inventory sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    qty = marketplace_product.product_id.qty_available
-
-                    # Update stock on Trendyol
-                    self._update_trendyol_stock(
-                        marketplace_product.channel_product_id, int(qty)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "qty_available": qty,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync stock for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Inventory sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Inventory sync failed: {str(e)}")
-            self._log_error(f"Stok senkronizasyonu başarısız: {str(e)}")
+        return self._sync_inventory_batched()
 
     def sync_prices(self) -> dict[str, Any]:
         """
         Sync prices to Trendyol
 
-        Update product prices on Trendyol based on Odoo prices
+        Push prices of changed listings through the bulk price endpoint
         """
-        sync_log = self._create_sync_log("sync_prices")
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Trendyol price sync")
-
-            # Get all products for this channel
-            products = self.env["marketplace.product"].search(
-                [
-                    ("channel_id", "=", self.channel.id),
-                    ("active", "=", True),
-                ]
-            )
-
-            for marketplace_product in products:
-                try:
-                    price = (
-                        marketplace_product.sale_price
-                        or marketplace_product.product_id.list_price
-                    )
-
-                    # Update price on Trendyol
-                    self._update_trendyol_price(
-                        marketplace_product.channel_product_id, float(price)
-                    )
-
-                    marketplace_product.write(
-                        {
-                            "sale_price": price,
-                            "sync_status": "synced",
-                        }
-                    )
-
-                    updated_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to sync price for {marketplace_product.channel_sku}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            self._update_sync_log(
-                "success",
-                records_processed=len(products),
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(f"Price sync completed: {updated_count} updated")
-
-        except Exception as e:
-            _logger.error(f"Price sync failed: {str(e)}")
-            self._log_error(f"Fiyat senkronizasyonu başarısız: {str(e)}")
+        return self._sync_prices_batched()
 
     # ==================== Trendyol API Methods ====================
 
     def _fetch_trendyol_orders(self, last_sync: datetime) -> list[dict]:
-        """Fetch orders from Trendyol API"""
-        try:
-            # Format date for API
-            start_date = self._format_datetime(last_sync)
+        """
+        Fetch orders from Trendyol API
 
-            # Build request
+        The first page reports totalPages; the rest are fetched in parallel.
+        """
+        try:
             url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/orders"
             params = {
-                "startDate": start_date,
+                "startDate": self._format_datetime(last_sync),
                 "size": 200,
             }
 
-            all_orders = []
-            page = 0
-
-            # Pagination loop
-            while True:
-                params["page"] = page
-                response = self._make_api_call("GET", url, params=params)
-                data = response.json()
-
-                orders = data.get("content", [])
-                if not orders:
-                    break
-
-                all_orders.extend(orders)
-
-                # Check if there are more pages
-                if not data.get("hasNext", False):
-                    break
+            def fetch_page(page):
+                data = self._send_request(
+                    "GET", url, params=dict(params, page=page)
+                ).json()
+                return (
+                    data.get("content", []),
+                    data.get("hasNext", False),
+                    data.get("totalPages"),
+                )
 
-                page += 1
+            all_orders = self._fetch_all_pages(fetch_page, first_page=0)
 
             _logger.info(f"Fetched {len(all_orders)} orders from Trendyol")
             return all_orders
@@ -307,37 +207,80 @@ class TrendyolConnector(BaseMarketplaceConnector):
             _logger.error(f"Failed to fetch orders: {str(e)}")
             raise
 
-    def _update_trendyol_stock(self, product_id: str, quantity: int) -> bool:
-        """Update product stock on Trendyol"""
-        try:
-            url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/products/{product_id}/stock"
-
-            payload = {
-                "quantity": quantity,
-            }
-
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
+    def _push_inventory_batch(self, items: list[dict]) -> dict:
+        """Update stock of up to BATCH_SIZE barcodes in one request"""
+        return self._post_price_and_inventory(
+            [{"barcode": item["key"], "quantity": item["quantity"]} for item in items]
+        )
 
-        except Exception as e:
-            _logger.error(f"Failed to update stock for {product_id}: {str(e)}")
-            raise
+    def _push_price_batch(self, items: list[dict]) -> dict:
+        """Update prices of up to BATCH_SIZE barcodes in one request"""
+        return self._post_price_and_inventory(
+            [
+                {
+                    "barcode": item["key"],
+                    "salePrice": item["price"],
+                    "listPrice": max(item["list_price"], item["price"]),
+                }
+                for item in items
+            ]
+        )
 
-    def _update_trendyol_price(self, product_id: str, price: float) -> bool:
-        """Update product price on Trendyol"""
-        try:
-            url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/products/{product_id}/price"
+    def _push_content_batch(self, items: list[dict]) -> dict:
+        """
+        Update content of up to BATCH_SIZE changed products in one request
 
-            payload = {
-                "salePrice": price,
-            }
+        Trendyol's product update replaces the whole item, so each changed
+        product is sent with its full content; unchanged products are not
+        sent at all.
+        """
+        payload_items = []
+        for item in items:
+            content = item["content"]
+            payload_items.append(
+                {
+                    "barcode": item["key"],
+                    "title": content["title"],
+                    "description": content["description"],
+                    "categoryId": content["category"],
+                    "images": [{"url": url} for url in content["images"]],
+                    "attributes": [
+                        {"attributeName": name, "attributeValue": value}
+                        for name, value in content["attributes"].items()
+                    ],
+                }
+            )
+        url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/products"
+        response = self._make_api_call("PUT", url, json={"items": payload_items})
+        return {"batch_request_id": response.json().get("batchRequestId")}
 
-            response = self._make_api_call("PUT", url, json=payload)
-            return response.status_code == 200
+    def _post_price_and_inventory(self, payload_items: list[dict]) -> dict:
+        """
+        Send items to the price-and-inventory endpoint
 
-        except Exception as e:
-            _logger.error(f"Failed to update price for {product_id}: {str(e)}")
-            raise
+        Trendyol processes the request asynchronously and returns a
+        batchRequestId to query item results with.
+        """
+        url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/products/price-and-inventory"
+        response = self._make_api_call("POST", url, json={"items": payload_items})
+        return {"batch_request_id": response.json().get("batchRequestId")}
+
+    def _fetch_batch_result(self, batch_request_id: str, operation: str) -> dict:
+        """Query per-barcode results of a price-and-inventory or product update batch"""
+        url = f"{self.API_BASE_URL}/merchant/{self.merchant_id}/products/batch-requests/{batch_request_id}"
+        data = self._make_api_call("GET", url).json()
+
+        if data.get("status") not in ("COMPLETED", "FAILED"):
+            return {"done": False}
+
+        failed_items = {}
+        for item in data.get("items", []):
+            if item.get("status") == "SUCCESS":
+                continue
+            barcode = (item.get("requestItem") or {}).get("barcode")
+            failed_items[barcode] = ", ".join(item.get("failureReasons") or []) or item.get("status")
+
+        return {"done": True, "failed_items": failed_items}
 
     # ==================== Helper Methods ====================
 
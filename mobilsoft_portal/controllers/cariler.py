@@ -9,7 +9,7 @@ from datetime import date, timedelta
 
 from odoo import http
 from odoo.http import request
-from .helpers import get_company_ids, get_default_company_id, check_record_access
+from .helpers import get_company_ids, get_default_company_id, get_partner_balances
 
 _logger = logging.getLogger(__name__)
 
@@ -48,31 +48,10 @@ class MobilSoftCariler(http.Controller):
 
         partners = Partner.search(domain, limit=PAGE_SIZE, offset=offset, order='name asc')
 
-        # Bakiye bilgisi — alacak/borç
+        # Bakiye bilgisi — alacak/borç (sayfadaki tüm cariler için tek sorgu)
         partner_balances = {}
         try:
-            for p in partners:
-                receivable = sum(
-                    env['account.move.line'].sudo().search([
-                        ('partner_id', '=', p.id),
-                        ('account_id.account_type', '=', 'asset_receivable'),
-                        ('parent_state', '=', 'posted'),
-                        ('company_id', 'in', company_ids),
-                    ]).mapped('amount_residual')
-                )
-                payable = sum(
-                    env['account.move.line'].sudo().search([
-                        ('partner_id', '=', p.id),
-                        ('account_id.account_type', '=', 'liability_payable'),
-                        ('parent_state', '=', 'posted'),
-                        ('company_id', 'in', company_ids),
-                    ]).mapped('amount_residual')
-                )
-                partner_balances[p.id] = {
-                    'receivable': receivable,
-                    'payable': abs(payable),
-                    'net': receivable + payable,
-                }
+            partner_balances = get_partner_balances(partners.ids, company_ids)
         except Exception as e:
             _logger.warning('Cari bakiye hesaplama hatası: %s', e)
 
@@ -122,22 +101,7 @@ class MobilSoftCariler(http.Controller):
             return request.redirect('/mobilsoft/cariler')
 
         # Bakiye
-        receivable = sum(
-            env['account.move.line'].sudo().search([
-                ('partner_id', '=', partner_id),
-                ('account_id.account_type', '=', 'asset_receivable'),
-                ('parent_state', '=', 'posted'),
-                ('company_id', 'in', company_ids),
-            ]).mapped('amount_residual')
-        )
-        payable = sum(
-            env['account.move.line'].sudo().search([
-                ('partner_id', '=', partner_id),
-                ('account_id.account_type', '=', 'liability_payable'),
-                ('parent_state', '=', 'posted'),
-                ('company_id', 'in', company_ids),
-            ]).mapped('amount_residual')
-        )
+        balance = get_partner_balances([partner_id], company_ids)[partner_id]
 
         # Son faturalar
         invoices = env['account.move'].sudo().search([
@@ -156,9 +120,9 @@ class MobilSoftCariler(http.Controller):
         values = {
             'page_name': 'cariler',
             'partner': partner,
-            'receivable': receivable,
-            'payable': abs(payable),
-            'net_balance': receivable + payable,
+            'receivable': balance['receivable'],
+            'payable': balance['payable'],
+            'net_balance': balance['net'],
             'invoices': invoices,
             'orders': orders,
         }
@@ -207,7 +171,6 @@ class MobilSoftCariler(http.Controller):
     def cari_save(self, **kwargs):
         """Cari kaydet (yeni veya düzenle)."""
         env = request.env
-        company_ids = get_company_ids()
 
         partner_id = int(kwargs.get('partner_id', 0))
         name = kwargs.get('name', '').strip()
@@ -54,6 +54,41 @@ def is_admin_company():
     return request.env.company.id == ADMIN_COMPANY_ID
 
 
+def get_partner_balances(partner_ids, company_ids):
+    """
+    Carilerin alacak/borç bakiyelerini tek gruplu sorguyla hesaplar.
+    Yalnızca kapanmamış kalemler toplanır; kapanmış kalemlerin bakiyesi
+    zaten sıfırdır, böylece sorgu carinin geçmişi büyüdükçe yavaşlamaz.
+    Returns: dict — {partner_id: {'receivable', 'payable', 'net'}}
+    """
+    balances = {
+        partner_id: {'receivable': 0.0, 'payable': 0.0, 'net': 0.0}
+        for partner_id in partner_ids
+    }
+    if not balances:
+        return balances
+
+    groups = request.env['account.move.line'].sudo()._read_group(
+        [
+            ('partner_id', 'in', list(balances)),
+            ('account_type', 'in', ('asset_receivable', 'liability_payable')),
+            ('parent_state', '=', 'posted'),
+            ('reconciled', '=', False),
+            ('company_id', 'in', company_ids),
+        ],
+        groupby=['partner_id', 'account_type'],
+        aggregates=['amount_residual:sum'],
+    )
+    for partner, account_type, residual in groups:
+        balance = balances[partner.id]
+        if account_type == 'asset_receivable':
+            balance['receivable'] += residual
+        else:
+            balance['payable'] += abs(residual)
+        balance['net'] += residual
+    return balances
+
+
 def check_record_access(record):
     """Kayda erişim kontrolü. True ise erişim var."""
     if not record.exists():
@@ -1 +1,5 @@
 from . import connectors, controllers, models
+
+
+def post_init_hook(env):
+    env["res.partner"]._qcommerce_backfill_phone_keys()
@@ -1,20 +1,24 @@
 {
     "name": "MobilSoft Hızlı Teslimat - Core",
-    "version": "19.0.1.0.0",
+    "version": "19.0.1.0.1",
     "category": "Sales/Q-Commerce",
     "author": "MobilSoft",
-    "depends": ["base", "sale", "stock", "account", "mail"],
+    "depends": ["base", "sale", "stock", "account", "mail", "mobilsoft_webhook_inbox"],
     "data": [
         # Security
         "security/ir.model.access.csv",
+        # Data
+        "data/ir_cron.xml",
         # Views
         "views/qcommerce_channel_views.xml",
         "views/qcommerce_order_views.xml",
         "views/qcommerce_delivery_views.xml",
         "views/qcommerce_sync_log_views.xml",
+        "views/qcommerce_webhook_event_views.xml",
         "views/qcommerce_actions.xml",
         "views/menu.xml",
     ],
+    "post_init_hook": "post_init_hook",
     "installable": True,
     "auto_install": False,
     "application": False,
@@ -5,16 +5,25 @@ Tüm hızlı teslimat platformları için base connector.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
 import requests
 
-from odoo import fields
+from odoo import Command, fields
+
+from . import registry
 
 _logger = logging.getLogger(__name__)
 
+# Webhook olay zamanının aranacağı anahtarlar
+EVENT_TIME_KEYS = ("timestamp", "recordedAt", "eventTime", "occurredAt", "createdAt")
+
+# Sipariş durumlarının ileri yöndeki sırası (iptal ayrıca ele alınır)
+ORDER_STATUS_SEQUENCE = ("pending", "confirmed", "preparing", "ready", "on_way", "delivered")
+
 
 class BaseQCommerceConnector(ABC):
     """Q-Commerce Platform Connector Base Sınıfı"""
@@ -28,8 +37,8 @@ class BaseQCommerceConnector(ABC):
         self._configure_session()
 
     def _configure_session(self):
-        """HTTP session'ı yapılandır"""
-        self.session = requests.Session()
+        """HTTP session'ı yapılandır (worker süreci boyunca kanal başına paylaşılır)"""
+        self.session = registry.get_shared(self.channel, "session", requests.Session)
         self.session.timeout = 30
         self.session.headers.update(
             {
@@ -45,8 +54,13 @@ class BaseQCommerceConnector(ABC):
         pass
 
     @abstractmethod
-    def sync_orders(self, last_sync: datetime | None = None) -> dict[str, Any]:
-        """Platformdan siparişleri senkronize et"""
+    def _fetch_orders(self, since: datetime) -> list[dict]:
+        """Platformdan `since` sonrasında oluşturulan ham siparişleri getir"""
+        pass
+
+    @abstractmethod
+    def _prepare_order_vals(self, order_data: dict) -> dict:
+        """Ham platform siparişini qcommerce.order değerlerine çevir"""
         pass
 
     @abstractmethod
@@ -54,6 +68,196 @@ class BaseQCommerceConnector(ABC):
         """Platformdan kurye talep et"""
         pass
 
+    # ==================== Sipariş Alımı ====================
+
+    def sync_orders(self, last_sync: datetime | None = None) -> dict[str, Any]:
+        """
+        Platformdan siparişleri senkronize et (sync logu ile)
+
+        last_sync verilmezse kanalın sipariş imleci kullanılır.
+        """
+        sync_log = self._create_sync_log("sync_orders")
+        try:
+            result = self.intake_orders(last_sync)
+            sync_log.log_success(
+                records_processed=result["processed"],
+                records_created=result["created"],
+                records_updated=result["updated"],
+                records_failed=result["failed"],
+            )
+            _logger.info(
+                f"[{self.channel.name}] Order sync completed: {result['created']} created, "
+                f"{result['updated']} updated, {result['failed']} failed"
+            )
+            return result
+        except Exception as e:
+            _logger.error(f"Order sync failed: {str(e)}")
+            sync_log.log_error(f"Sipariş senkronizasyonu başarısız: {str(e)}")
+            return {"processed": 0, "created": 0, "updated": 0, "failed": 0}
+
+    def intake_orders(self, since: datetime | None = None) -> dict[str, Any]:
+        """
+        Yeni siparişleri çek, platform_order_id üzerinden upsert et ve
+        kanal otomatik kabul ediyorsa onayla
+
+        Sync logu yazmaz; sipariş alım döngüsü bunu birkaç saniyede bir
+        çağırır. Her sipariş için aşama süreleri (platform → alım, alım →
+        kayıt, platform → onay) saniye cinsinden saklanır.
+        """
+        if since is None:
+            since = self.channel._get_order_intake_start()
+
+        orders_data = self._fetch_orders(since)
+        received_ts = time.time()
+        result = self._upsert_orders(orders_data, received_ts)
+        self.channel._advance_order_cursor(result.pop("latest_order_date"))
+        return result
+
+    def _upsert_orders(self, orders_data: list[dict], received_ts: float) -> dict[str, Any]:
+        """
+        Siparişleri tek aramayla eşle, yenileri toplu oluştur
+
+        Aynı sayfa tekrar işlendiğinde sonuç değişmez: mevcut siparişlerin
+        yalnızca değişen alanları yazılır, satırlar yeniden oluşturulmaz.
+        """
+        QCommerceOrder = self.env["qcommerce.order"]
+        result = {
+            "processed": len(orders_data),
+            "created": 0,
+            "updated": 0,
+            "failed": 0,
+            "latest_order_date": None,
+        }
+        received_date = datetime.fromtimestamp(received_ts, timezone.utc).replace(tzinfo=None)
+
+        vals_by_platform_id = {}
+        for order_data in orders_data:
+            try:
+                vals = self._prepare_order_vals(order_data)
+                platform_order_id = vals.get("platform_order_id")
+                if not platform_order_id or platform_order_id == "None":
+                    raise ValueError("Platform sipariş ID boş")
+                vals["line_ids"] = [
+                    Command.create(self._prepare_order_line_vals(item))
+                    for item in order_data.get("items", [])
+                ]
+            except Exception as e:
+                _logger.error(f"Failed to prepare order {order_data.get('id')}: {str(e)}")
+                result["failed"] += 1
+                continue
+            vals["order_date"] = vals.get("order_date") or received_date
+            vals_by_platform_id[platform_order_id] = vals
+
+        if not vals_by_platform_id:
+            return result
+        result["latest_order_date"] = max(v["order_date"] for v in vals_by_platform_id.values())
+
+        existing = {
+            order.platform_order_id: order
+            for order in QCommerceOrder.search(
+                [("platform_order_id", "in", list(vals_by_platform_id))]
+            )
+        }
+
+        new_vals = []
+        for platform_order_id, vals in vals_by_platform_id.items():
+            order = existing.get(platform_order_id)
+            if not order:
+                vals.update(
+                    channel_id=self.channel.id,
+                    received_date=received_date,
+                    intake_latency=max(received_ts - self._to_timestamp(vals["order_date"]), 0),
+                )
+                new_vals.append(vals)
+                continue
+
+            changes = {}
+            for key, value in vals.items():
+                if key in ("name", "line_ids", "order_date"):
+                    continue
+                # Ham değer ile ORM değeri (ör. None / 0.0, id / kayıt) aynı biçimde karşılaştırılır
+                field = order._fields[key]
+                if field.convert_to_cache(value, order, validate=False) != field.convert_to_cache(
+                    order[key], order, validate=False
+                ):
+                    changes[key] = value
+            # Yerelde ilerlemiş durum platformdan gelen eski durumla geri alınmaz
+            if "status" in changes and not self._is_status_forward(
+                order.status, changes["status"]
+            ):
+                changes.pop("status")
+            if changes:
+                order.write(changes)
+                result["updated"] += 1
+
+        orders = self._create_orders(new_vals, result)
+        if not orders:
+            return result
+
+        orders.write({"processing_latency": time.time() - received_ts})
+        if self.channel.auto_accept_orders:
+            pending = orders.filtered(lambda o: o.status == "pending")
+            if pending:
+                pending.action_confirm()
+                _logger.info(f"[{self.channel.name}] {len(pending)} orders auto-confirmed")
+        return result
+
+    def _create_orders(self, vals_list: list[dict], result: dict) -> Any:
+        """Siparişleri toplu oluştur; hata olursa tek tek dene"""
+        QCommerceOrder = self.env["qcommerce.order"]
+        if not vals_list:
+            return QCommerceOrder
+
+        try:
+            with self.env.cr.savepoint():
+                orders = QCommerceOrder.create(vals_list)
+            result["created"] += len(orders)
+            return orders
+        except Exception as e:
+            _logger.warning(f"Batch order create failed, retrying one by one: {str(e)}")
+
+        order_ids = []
+        for vals in vals_list:
+            try:
+                with self.env.cr.savepoint():
+                    order_ids.append(QCommerceOrder.create(vals).id)
+            except Exception as e:
+                _logger.error(f"Failed to create order {vals.get('platform_order_id')}: {str(e)}")
+                result["failed"] += 1
+        result["created"] += len(order_ids)
+        return QCommerceOrder.browse(order_ids)
+
+    def _prepare_order_line_vals(self, item: dict) -> dict:
+        """Ham sipariş kalemini qcommerce.order.line değerlerine çevir"""
+        return {
+            "product_name": item.get("name", ""),
+            "platform_product_id": str(item.get("productId", "")),
+            "quantity": int(item.get("quantity", 1)),
+            "unit_price": float(item.get("price", 0)),
+            "notes": item.get("notes", ""),
+        }
+
+    @staticmethod
+    def _is_status_forward(current: str, new: str) -> bool:
+        """
+        Durum geçişi ileri mi
+
+        İptal, teslim edilmemiş her durumdan kabul edilir; diğer durumlar
+        yalnızca sıralamada ilerliyorsa uygulanır.
+        """
+        if current in ("delivered", "cancelled"):
+            return False
+        if new == "cancelled":
+            return True
+        if new not in ORDER_STATUS_SEQUENCE or current not in ORDER_STATUS_SEQUENCE:
+            return False
+        return ORDER_STATUS_SEQUENCE.index(new) > ORDER_STATUS_SEQUENCE.index(current)
+
+    @staticmethod
+    def _to_timestamp(value: datetime) -> float:
+        """Naive UTC datetime -> epoch saniye"""
+        return value.replace(tzinfo=timezone.utc).timestamp()
+
     # ==================== Yardımcı Metodlar ====================
 
     def _make_api_call(self, method: str, url: str, **kwargs) -> requests.Response:
@@ -82,7 +286,14 @@ class BaseQCommerceConnector(ABC):
         """Platform siparişini qcommerce.order olarak oluştur"""
         QCommerceOrder = self.env["qcommerce.order"]
 
-        platform_order_id = str(order_data.get("id") or order_data.get("orderId"))
+        platform_order_id = (
+            order_data.get("platform_order_id")
+            or order_data.get("id")
+            or order_data.get("orderId")
+        )
+        if not platform_order_id:
+            raise ValueError("Platform sipariş ID boş")
+        platform_order_id = str(platform_order_id)
 
         # Varsa güncelle, yoksa oluştur
         order = QCommerceOrder.search([("platform_order_id", "=", platform_order_id)])
@@ -102,18 +313,31 @@ class BaseQCommerceConnector(ABC):
 
         return order
 
+    def _get_event_time(self, data: dict) -> datetime | None:
+        """Webhook verisindeki platform zamanı (bulunamazsa None)"""
+        for key in EVENT_TIME_KEYS:
+            if data.get(key):
+                return self._parse_datetime(str(data[key]))
+        return None
+
     def _parse_datetime(self, date_str: str) -> datetime | None:
         """String tarihini datetime'a çevir"""
         if not date_str:
             return None
 
         try:
-            # ISO format
-            return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            # ISO format (Odoo naive UTC bekler)
+            parsed = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+            if parsed.tzinfo:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
         except:
             try:
-                # Unix timestamp
-                return datetime.fromtimestamp(int(date_str))
+                # Unix timestamp (milisaniye de olabilir)
+                timestamp = int(date_str)
+                if timestamp > 10**11:
+                    timestamp /= 1000
+                return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
             except:
                 return None
 
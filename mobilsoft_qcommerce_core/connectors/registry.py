@@ -0,0 +1,91 @@
+"""
+Q-Commerce Connector Kayıt Defteri (süreç başına)
+
+Connector nesneleri cursor/environment'a bağlıdır ve her çağrıda yeniden
+oluşturulur; pahalı parçalar (keep-alive HTTP session'ları) ve connector
+sınıfı çözümlemesi worker süreci boyunca saklanır. Kanalın bağlantı
+ayarları değiştiğinde paylaşılan nesneler yenilenir.
+"""
+
+from functools import lru_cache
+import importlib
+import logging
+import threading
+
+_logger = logging.getLogger(__name__)
+
+# Değişmesi yeni session gerektiren kanal alanları
+CONNECTION_FIELDS = (
+    "platform_type",
+    "api_key",
+    "api_secret",
+    "merchant_id",
+    "shop_id",
+)
+
+# (dbname, model, kanal id) -> (parmak izi, {isim: paylaşılan nesne})
+_shared = {}
+_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def resolve_connector_class(connector_path: str):
+    """"paket.modul.SinifAdi" yolunu süreç başına bir kez import et"""
+    module_path, class_name = connector_path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_path), class_name)
+
+
+def _channel_key(channel) -> tuple:
+    return (channel.env.cr.dbname, channel._name, channel.id)
+
+
+def _fingerprint(channel) -> int:
+    """Bağlantı ayarlarının özeti; değişirse paylaşılan nesneler geçersiz olur"""
+    return hash(tuple(channel[f] for f in CONNECTION_FIELDS if f in channel._fields))
+
+
+def get_shared(channel, name: str, factory):
+    """
+    Kanalın süreç başına paylaşılan `name` nesnesini döndür (yoksa oluştur)
+
+    factory None döndürürse sonuç saklanmaz.
+    """
+    key = _channel_key(channel)
+    fingerprint = _fingerprint(channel)
+
+    with _lock:
+        entry = _shared.get(key)
+        if entry and entry[0] == fingerprint and name in entry[1]:
+            return entry[1][name]
+
+    obj = factory()
+    if obj is None:
+        return None
+
+    with _lock:
+        entry = _shared.get(key)
+        if not entry or entry[0] != fingerprint:
+            if entry:
+                _close_all(entry[1])
+            entry = (fingerprint, {})
+            _shared[key] = entry
+        return entry[1].setdefault(name, obj)
+
+
+def invalidate(channel):
+    """Verilen kanal(lar)ın paylaşılan nesnelerini bırak"""
+    with _lock:
+        for record in channel:
+            entry = _shared.pop(_channel_key(record), None)
+            if entry:
+                _close_all(entry[1])
+
+
+def _close_all(objects: dict):
+    for obj in objects.values():
+        close = getattr(obj, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception as e:
+                _logger.debug(f"Paylaşılan connector nesnesi kapatılamadı: {str(e)}")
@@ -21,25 +21,51 @@ class QCommerceWebhookController(http.Controller):
         csrf=False,
     )
     def qcommerce_webhook(self, platform, **kw):
-        """Receive webhook from Q-Commerce platform (Getir, Yemeksepeti, Vigo)"""
-        try:
-            _logger.info(f"Webhook received for platform: {platform}")
+        """
+        Receive webhook from Q-Commerce platform (Getir, Yemeksepeti, Vigo)
 
-            Channel = request.env["qcommerce.channel"].sudo()
-            channel = Channel.search(
-                [("platform_type", "=", platform), ("active", "=", True)], limit=1
+        The request must carry the channel's webhook secret (see
+        webhook.inbox.mixin._verify_request). The event is then stored in
+        the webhook inbox and processed by cron, so the platform gets an
+        immediate answer and retries are no-ops.
+        """
+        try:
+            WebhookEvent = request.env["qcommerce.webhook.event"]
+            # Only the secret is read before the request is authenticated
+            channels = (
+                request.env["qcommerce.channel"]
+                .sudo()
+                .search_read(
+                    [("platform_type", "=", platform), ("active", "=", True)],
+                    ["webhook_secret"],
+                    limit=1,
+                )
             )
 
-            if not channel:
+            if not channels:
                 return {"status": "error", "message": "Channel not found"}
 
-            connector = channel._get_connector()
-            result = connector._process_webhook(kw)
+            if not WebhookEvent._verify_request(
+                channels[0]["webhook_secret"], request.httprequest
+            ):
+                _logger.warning(f"Webhook rejected for platform {platform}: invalid signature")
+                return {"status": "error", "message": "Invalid signature"}, 401
+
+            if not isinstance(kw, dict) or not kw:
+                return {"status": "error", "message": "Empty payload"}
+
+            channel = request.env["qcommerce.channel"].sudo().browse(channels[0]["id"])
+            created = WebhookEvent.sudo().enqueue(channel, kw)
+
+            _logger.info(
+                f"Webhook received for platform: {platform} "
+                f"({kw.get('eventType')}, {'queued' if created else 'duplicate'})"
+            )
 
             return {
                 "status": "success",
-                "message": f"Webhook processed for {platform}",
-                "result": result,
+                "message": f"Webhook accepted for {platform}",
+                "duplicate": not created,
             }
         except Exception as e:
             _logger.error(f"Webhook error: {str(e)}")
@@ -0,0 +1,15 @@
+"""
+Migration 19.0.1.0.1: mevcut partner'lara qcommerce_phone_key yaz.
+
+Müşteri eşleştirmesi yalnızca telefon anahtarıyla yapıldığından, anahtar
+alanı eklenmeden önce oluşmuş partner'lar için anahtar doldurulur.
+"""
+
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    if not version:
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env["res.partner"]._qcommerce_backfill_phone_keys()
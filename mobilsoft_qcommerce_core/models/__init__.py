@@ -1,7 +1,9 @@
 from . import (
     inherits,
     qcommerce_channel,
+    qcommerce_courier_position,
     qcommerce_delivery,
     qcommerce_order,
     qcommerce_sync_log,
+    qcommerce_webhook_event,
 )
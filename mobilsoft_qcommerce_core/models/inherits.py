@@ -1,10 +1,46 @@
 """
 Q-Commerce Model Genişletmeleri
 
-sale.order ve stock.picking modellerini genişlet.
+sale.order, stock.picking ve res.partner modellerini genişlet.
 """
 
+from collections import OrderedDict
+import logging
+import threading
+
+import psycopg2
+
 from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Süreç başına müşteri önbelleği: (dbname, şirket id, telefon anahtarı) -> partner id
+PARTNER_CACHE_SIZE = 20000
+_partner_cache = OrderedDict()
+_partner_cache_lock = threading.Lock()
+
+
+def _cache_get(key):
+    with _partner_cache_lock:
+        partner_id = _partner_cache.get(key)
+        if partner_id is not None:
+            _partner_cache.move_to_end(key)
+        return partner_id
+
+
+def _cache_set(key, partner_id):
+    with _partner_cache_lock:
+        _partner_cache[key] = partner_id
+        _partner_cache.move_to_end(key)
+        while len(_partner_cache) > PARTNER_CACHE_SIZE:
+            _partner_cache.popitem(last=False)
+
+
+def _cache_discard(keys):
+    with _partner_cache_lock:
+        for key in keys:
+            _partner_cache.pop(key, None)
 
 
 class SaleOrderQCommerceInherit(models.Model):
@@ -22,3 +58,207 @@ class StockPickingQCommerceInherit(models.Model):
     _inherit = "stock.picking"
 
     qcommerce_order_id = fields.Many2one("qcommerce.order", "Hızlı Teslimat Siparişi")
+
+
+class ResPartnerQCommerceInherit(models.Model):
+    """res.partner - Q-Commerce Müşteri Eşleştirmesi"""
+
+    _inherit = "res.partner"
+
+    qcommerce_phone_key = fields.Char(
+        "Hızlı Teslimat Telefon Anahtarı",
+        readonly=True,
+        copy=False,
+        help="Normalize edilmiş telefon (ülke kodu ve baştaki 0 olmadan); "
+        "hızlı teslimat müşterileri bu anahtarla eşleştirilir",
+    )
+
+    _qcommerce_phone_key_company_uniq = models.UniqueIndex(
+        "(COALESCE(company_id, 0), qcommerce_phone_key) WHERE qcommerce_phone_key IS NOT NULL",
+        "Bu telefon numarasıyla şirkette zaten bir hızlı teslimat müşterisi var!",
+    )
+
+    @api.model
+    def _qcommerce_phone_key(self, phone):
+        """+90 532 123 45 67, 0532..., 532... -> 5321234567"""
+        digits = "".join(filter(str.isdigit, phone or ""))
+        if len(digits) == 12 and digits.startswith("90"):
+            digits = digits[2:]
+        elif len(digits) == 11 and digits.startswith("0"):
+            digits = digits[1:]
+        return digits or None
+
+    @api.model
+    def _qcommerce_backfill_phone_keys(self):
+        """
+        Anahtarı olmayan mevcut partner'lara telefon anahtarı yaz
+
+        Normalizasyon _qcommerce_phone_key ile aynıdır ve SQL'de yapılır.
+        Aynı şirkette aynı anahtara sahip birden fazla partner varsa yalnızca
+        en eski kayıt anahtarı alır (benzersiz index).
+
+        :return: Güncellenen partner sayısı
+        """
+        self.flush_model(["phone", "company_id", "qcommerce_phone_key"])
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH normalized AS (
+                    SELECT id, COALESCE(company_id, 0) AS company_key,
+                           regexp_replace(phone, '[^0-9]', '', 'g') AS digits
+                      FROM res_partner
+                     WHERE qcommerce_phone_key IS NULL AND phone IS NOT NULL
+                ), keyed AS (
+                    SELECT DISTINCT ON (company_key, phone_key) id, company_key, phone_key
+                      FROM (
+                        SELECT id, company_key,
+                               CASE
+                                   WHEN length(digits) = 12 AND left(digits, 2) = '90'
+                                       THEN substr(digits, 3)
+                                   WHEN length(digits) = 11 AND left(digits, 1) = '0'
+                                       THEN substr(digits, 2)
+                                   ELSE NULLIF(digits, '')
+                               END AS phone_key
+                          FROM normalized
+                      ) AS k
+                     WHERE phone_key IS NOT NULL
+                     ORDER BY company_key, phone_key, id
+                )
+                UPDATE res_partner AS p
+                   SET qcommerce_phone_key = keyed.phone_key
+                  FROM keyed
+                 WHERE p.id = keyed.id
+                   AND NOT EXISTS (
+                        SELECT 1 FROM res_partner AS o
+                         WHERE o.qcommerce_phone_key = keyed.phone_key
+                           AND COALESCE(o.company_id, 0) = keyed.company_key
+                   )
+                """
+            )
+        )
+        count = self.env.cr.rowcount
+        self.invalidate_model(["qcommerce_phone_key"])
+        _logger.info(f"Hızlı teslimat telefon anahtarı {count} partner için dolduruldu")
+        return count
+
+    @api.model
+    def _qcommerce_resolve_partners(self, customers):
+        """
+        Müşterileri toplu olarak partner'a çöz
+
+        Sırasıyla süreç önbelleği ve telefon anahtarı (tek sorgu) denenir;
+        kalanlar tek create ile oluşturulur. Modül kurulmadan önceki
+        partner'ların anahtarı kurulumda doldurulur
+        (_qcommerce_backfill_phone_keys). Aynı anahtar bir sayfada birden
+        fazla geçse de tek partner kullanılır.
+
+        :param customers: (şirket id, telefon, ad, e-posta) listesi
+        :return: Aynı sırada partner id listesi (ad yoksa False)
+        """
+        dbname = self.env.cr.dbname
+        keys = [
+            (company_id or 0, self._qcommerce_phone_key(phone))
+            for company_id, phone, _name, _email in customers
+        ]
+        resolved = {}
+
+        # 1. Süreç önbelleği (silinmiş partner'lar tek sorguda elenir)
+        cached = {}
+        for key in set(keys):
+            if key[1]:
+                partner_id = _cache_get((dbname,) + key)
+                if partner_id:
+                    cached[key] = partner_id
+        if cached:
+            alive = set(self.browse(list(cached.values())).exists().ids)
+            stale = [key for key, partner_id in cached.items() if partner_id not in alive]
+            _cache_discard([(dbname,) + key for key in stale])
+            resolved.update(
+                (key, partner_id) for key, partner_id in cached.items() if partner_id in alive
+            )
+
+        # 2. Telefon anahtarıyla eşleşen partner'lar
+        missing = {key for key in keys if key[1] and key not in resolved}
+        if missing:
+            partners = self.with_context(active_test=False).search(
+                [("qcommerce_phone_key", "in", list({key[1] for key in missing}))]
+            )
+            for partner in partners:
+                key = (partner.company_id.id or 0, partner.qcommerce_phone_key)
+                if key in missing:
+                    resolved[key] = partner.id
+
+        # 3. Kalanları oluştur
+        to_create = {}
+        for (company_id, phone, name, email), key in zip(customers, keys):
+            if name and key[1] and key not in resolved and key not in to_create:
+                to_create[key] = {
+                    "name": name,
+                    "phone": phone,
+                    "email": email,
+                    "company_id": company_id or False,
+                    "qcommerce_phone_key": key[1],
+                }
+        if to_create:
+            resolved.update(self._qcommerce_create_partners(to_create))
+
+        for key, partner_id in resolved.items():
+            if key[1]:
+                _cache_set((dbname,) + key, partner_id)
+
+        partner_ids = []
+        for (company_id, _phone, name, email), key in zip(customers, keys):
+            if not name:
+                partner_ids.append(False)
+            elif key[1]:
+                partner_ids.append(resolved.get(key, False))
+            else:
+                partner_ids.append(self._qcommerce_partner_by_name(company_id, name, email))
+        return partner_ids
+
+    @api.model
+    def _qcommerce_partner_by_name(self, company_id, name, email):
+        """Telefonu olmayan müşteri: ad ile bul, yoksa oluştur"""
+        partner = self.search(
+            [("name", "=", name), ("company_id", "in", [company_id or False, False])],
+            limit=1,
+        )
+        if not partner:
+            partner = self.create(
+                {"name": name, "email": email, "company_id": company_id or False}
+            )
+        return partner.id
+
+    @api.model
+    def _qcommerce_create_partners(self, vals_by_key):
+        """
+        Eksik müşterileri toplu oluştur
+
+        Başka bir worker aynı anahtarı aynı anda oluşturduysa benzersiz
+        index çakışır; o durumda kayıtlar tek tek denenir ve çakışanlar
+        mevcut partner'a bağlanır.
+        """
+        keys = list(vals_by_key)
+        try:
+            with self.env.cr.savepoint():
+                partners = self.create([vals_by_key[key] for key in keys])
+            return dict(zip(keys, partners.ids))
+        except psycopg2.IntegrityError:
+            _logger.info("Hızlı teslimat müşterileri eşzamanlı oluşturuldu, tek tek çözülüyor")
+
+        resolved = {}
+        for key in keys:
+            try:
+                with self.env.cr.savepoint():
+                    resolved[key] = self.create(vals_by_key[key]).id
+            except psycopg2.IntegrityError:
+                partner = self.with_context(active_test=False).search(
+                    [
+                        ("qcommerce_phone_key", "=", key[1]),
+                        ("company_id", "=", key[0] or False),
+                    ],
+                    limit=1,
+                )
+                if partner:
+                    resolved[key] = partner.id
+        return resolved
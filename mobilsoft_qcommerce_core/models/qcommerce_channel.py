@@ -4,14 +4,21 @@ Q-Commerce Hızlı Teslimat Kanalı
 Getir, Yemeksepeti, Vigo gibi hızlı teslimat platformları için kanal modeli.
 """
 
+from collections import defaultdict
+from datetime import timedelta
 import json
 import logging
 
 from odoo import api, fields, models
 from odoo.exceptions import UserError, ValidationError
 
+from ..connectors import registry as connector_registry
+
 _logger = logging.getLogger(__name__)
 
+# İmleç yokken geriye bakılacak süre
+INTAKE_DEFAULT_LOOKBACK = timedelta(hours=24)
+
 
 class QCommerceChannel(models.Model):
     """Q-Commerce (Hızlı Teslimat) Kanal Modeli"""
@@ -44,6 +51,13 @@ class QCommerceChannel(models.Model):
     )
     api_key = fields.Char("API Key", required=True, help="API anahtar bilgisi")
     api_secret = fields.Char("API Secret", help="API secret (imza için)")
+    webhook_secret = fields.Char(
+        "Webhook Gizli Anahtarı",
+        groups="base.group_system",
+        copy=False,
+        help="Gelen webhook'lar bu anahtarla doğrulanır (X-Webhook-Signature "
+        "HMAC-SHA256 veya X-Webhook-Secret); boşsa webhook kabul edilmez",
+    )
     shop_id = fields.Char("Shop ID", help="Mağaza ID")
 
     # ==================== Teslimat Ayarları ====================
@@ -62,6 +76,18 @@ class QCommerceChannel(models.Model):
         "Maksimum Teslimat Süresi (Dakika)", default=60, help="Maksimum teslimat süresi"
     )
 
+    sla_warning_minutes = fields.Integer(
+        "SLA Uyarı Süresi (Dakika)",
+        default=5,
+        help="Aşama bitişine bu kadar dakika kalan siparişler riskli sayılır",
+    )
+
+    sla_user_id = fields.Many2one(
+        "res.users",
+        "SLA Sorumlusu",
+        help="Süresi aşılan siparişler için bu kullanıcıya aktivite açılır",
+    )
+
     auto_accept_orders = fields.Boolean(
         "Siparişleri Otomatik Kabul Et",
         default=True,
@@ -77,20 +103,43 @@ class QCommerceChannel(models.Model):
     # ==================== İstatistikler ====================
 
     total_orders = fields.Integer(
-        "Toplam Sipariş", compute="_compute_stats", store=True
+        "Toplam Sipariş", compute="_compute_stats"
     )
     total_deliveries = fields.Integer(
-        "Toplam Teslimat", compute="_compute_stats", store=True
+        "Toplam Teslimat", compute="_compute_stats"
     )
     pending_orders_count = fields.Integer(
-        "Beklemede", compute="_compute_stats", store=True
+        "Beklemede", compute="_compute_stats"
     )
     success_rate = fields.Float(
-        "Başarı Oranı (%)", compute="_compute_stats", store=True
+        "Başarı Oranı (%)", compute="_compute_stats"
     )
 
     last_sync = fields.Datetime("Son Senkronizasyon", help="Son senkronizasyon zamanı")
 
+    # ==================== Sipariş Alımı ====================
+
+    intake_enabled = fields.Boolean(
+        "Sürekli Sipariş Alımı",
+        default=False,
+        help="Siparişler cron beklenmeden birkaç saniyede bir çekilir",
+    )
+    intake_interval = fields.Integer(
+        "Sorgu Aralığı (saniye)",
+        default=5,
+        help="Sürekli alımda platformun sorgulanma aralığı",
+    )
+    order_cursor = fields.Datetime(
+        "Sipariş İmleci",
+        readonly=True,
+        help="Alınan en yeni siparişin tarihi; sonraki çekim buradan başlar",
+    )
+    order_cursor_overlap = fields.Integer(
+        "Çakışma Penceresi (saniye)",
+        default=120,
+        help="Geç düşen siparişleri kaçırmamak için imlecin bu kadar öncesinden başlanır",
+    )
+
     # ==================== İlişkiler ====================
 
     order_ids = fields.One2many("qcommerce.order", "channel_id", "Siparişler")
@@ -104,25 +153,34 @@ class QCommerceChannel(models.Model):
 
     # ==================== Hesaplama Alanları ====================
 
-    @api.depends("order_ids", "order_ids.status")
+    @api.depends("order_ids", "order_ids.status", "order_ids.delivery_id")
     def _compute_stats(self):
-        """Kanal istatistiklerini hesapla"""
-        for channel in self:
-            orders = channel.order_ids
-            deliveries = self.env["qcommerce.delivery"].search(
-                [("order_id.channel_id", "=", channel.id)]
-            )
-
-            channel.total_orders = len(orders)
-            channel.total_deliveries = len(deliveries)
-            channel.pending_orders_count = len(
-                orders.filtered(lambda o: o.status in ["pending", "confirmed"])
+        """
+        Kanal istatistiklerini hesapla
+
+        Alanlar saklanmaz, böylece sipariş yazan işlemler kanal satırını
+        kilitlemez. Sipariş ve teslimat kayıtları yüklenmez; tüm kanallar
+        için durum bazında tek bir SQL gruplaması ve teslimatlar için bir
+        sayım yapılır.
+        """
+        status_counts = defaultdict(lambda: defaultdict(int))
+        for channel, status, count in self.env["qcommerce.order"]._read_group(
+            [("channel_id", "in", self.ids)], ["channel_id", "status"], ["__count"]
+        ):
+            status_counts[channel][status] += count
+        delivery_counts = dict(
+            self.env["qcommerce.delivery"]._read_group(
+                [("channel_id", "in", self.ids)], ["channel_id"], ["__count"]
             )
+        )
 
-            successful = len(orders.filtered(lambda o: o.status == "delivered"))
-            channel.success_rate = (
-                (successful / len(orders) * 100) if len(orders) > 0 else 0
-            )
+        for channel in self:
+            counts = status_counts[channel]
+            total = sum(counts.values())
+            channel.total_orders = total
+            channel.total_deliveries = delivery_counts.get(channel, 0)
+            channel.pending_orders_count = counts["pending"] + counts["confirmed"]
+            channel.success_rate = (counts["delivered"] / total * 100) if total else 0
 
     # ==================== Constraint'ler ====================
 
@@ -152,9 +210,7 @@ class QCommerceChannel(models.Model):
         if not connector_path:
             raise UserError(f"{self.platform_type} için connector bulunamadı!")
 
-        module_path, class_name = connector_path.rsplit(".", 1)
-        module = __import__(module_path, fromlist=[class_name])
-        connector_class = getattr(module, class_name)
+        connector_class = connector_registry.resolve_connector_class(connector_path)
         return connector_class(self)
 
     def test_connection(self) -> bool:
@@ -168,16 +224,68 @@ class QCommerceChannel(models.Model):
             return False
 
     def sync_orders(self):
-        """Platformdan siparişleri senkronize et"""
+        """Platformdan siparişleri senkronize et (sipariş imlecinden itibaren)"""
         self.ensure_one()
         try:
             connector = self._get_connector()
-            result = connector.sync_orders(self.last_sync)
+            result = connector.sync_orders()
             self.last_sync = fields.Datetime.now()
             return result
         except Exception as e:
             _logger.error(f"Sipariş senkronizasyonu başarısız: {str(e)}")
 
+    def _get_order_intake_start(self):
+        """Sonraki çekimin başlangıcı: imleç - çakışma penceresi"""
+        self.ensure_one()
+        if not self.order_cursor:
+            return fields.Datetime.now() - INTAKE_DEFAULT_LOOKBACK
+        return self.order_cursor - timedelta(seconds=self.order_cursor_overlap)
+
+    def _advance_order_cursor(self, latest_order_date):
+        """İmleci alınan en yeni siparişe ilerlet (geri almaz)"""
+        self.ensure_one()
+        if latest_order_date and (
+            not self.order_cursor or latest_order_date > self.order_cursor
+        ):
+            self.order_cursor = latest_order_date
+
+    def action_reset_order_cursor(self):
+        """Sipariş imlecini sıfırla (sonraki çekim son 24 saatle başlar)"""
+        self.write({"order_cursor": False})
+
+    @api.model
+    def _cron_order_intake(self):
+        """
+        Sürekli sipariş alımı
+
+        Her çalışma, sorgu aralığı dolmuş kanalları bir kez yoklar (her
+        yoklama ayrı commit edilir) ve cron'u en yakın sonraki yoklama
+        zamanına yeniden tetikler; cron işçisi yoklamalar arasında beklerken
+        tutulmaz. Dakikalık zamanlama yalnızca yedektir. Webhook ile gelen
+        "sipariş oluşturuldu" olayları gelen kutusu üzerinden aynı alım
+        yolunu anında tetikler.
+        """
+        channels = self.search([("intake_enabled", "=", True)])
+        next_polls = []
+        for channel in channels:
+            interval = timedelta(seconds=max(channel.intake_interval, 1))
+            if channel.last_sync and channel.last_sync + interval > fields.Datetime.now():
+                next_polls.append(channel.last_sync + interval)
+                continue
+            try:
+                channel._get_connector().intake_orders()
+                channel.last_sync = fields.Datetime.now()
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error(f"Kanal {channel.name} sipariş alımı başarısız: {str(e)}")
+            next_polls.append(fields.Datetime.now() + interval)
+
+        if next_polls:
+            self.env.ref("mobilsoft_qcommerce_core.ir_cron_qcommerce_order_intake")._trigger(
+                at=min(next_polls)
+            )
+
     def action_sync_orders(self):
         """Action: Siparişleri senkronize et"""
         self.sync_orders()
@@ -0,0 +1,151 @@
+"""
+Q-Commerce Kurye Konum Takibi
+
+Kurye konum bildirimleri teslimat kaydına yazılmaz. Her bildirim yalnızca
+ekleme yapılan iz tablosuna, transaction sonunda tek bir çok satırlı INSERT
+ile yazılır; arayüz için teslimat başına yalnızca son konum ayrı bir
+tabloda tutulur.
+"""
+
+from contextlib import contextmanager
+from datetime import timedelta
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# İz kayıtlarının saklanacağı süre (gün)
+TRACK_RETENTION_DAYS = 7
+
+# Transaction boyunca biriken konum bildirimlerinin precommit anahtarı
+PING_BUFFER_KEY = "qcommerce.courier_pings"
+
+
+class QCommerceCourierTrack(models.Model):
+    """Kurye Konum İzi (yalnızca ekleme)"""
+
+    _name = "qcommerce.courier.track"
+    _description = "Q-Commerce Kurye Konum İzi"
+    _order = "recorded_at desc, id desc"
+    _log_access = False
+
+    delivery_id = fields.Many2one(
+        "qcommerce.delivery", "Teslimat", required=True, ondelete="cascade", readonly=True
+    )
+    latitude = fields.Float("Enlem", digits=(10, 7), readonly=True)
+    longitude = fields.Float("Boylam", digits=(10, 7), readonly=True)
+    recorded_at = fields.Datetime("Konum Zamanı", required=True, readonly=True)
+
+    _delivery_recorded_idx = models.Index("(delivery_id, recorded_at)")
+
+    @api.model
+    def _buffer_ping(self, delivery_id: int, latitude: float, longitude: float, recorded_at=None):
+        """
+        Konum bildirimini transaction sonuna kadar biriktir
+
+        Bildirimler commit öncesinde _flush_pings ile toplu yazılır.
+        """
+        data = self.env.cr.precommit.data
+        if PING_BUFFER_KEY not in data:
+            data[PING_BUFFER_KEY] = []
+            self.env.cr.precommit.add(self._flush_pings)
+        data[PING_BUFFER_KEY].append(
+            (delivery_id, latitude or 0.0, longitude or 0.0, recorded_at or fields.Datetime.now())
+        )
+
+    @contextmanager
+    def _ping_savepoint(self):
+        """
+        Blok hata ile çıkarsa içinde biriken bildirimleri tampondan at
+
+        precommit tamponu veritabanı savepoint'i geri alındığında
+        boşalmaz; bildirim biriktiren kod bir savepoint içinde
+        çalışıyorsa bu blokla sarılmalıdır.
+        """
+        buffered = len(self.env.cr.precommit.data.get(PING_BUFFER_KEY, []))
+        try:
+            yield
+        except Exception:
+            pings = self.env.cr.precommit.data.get(PING_BUFFER_KEY)
+            if pings is not None:
+                del pings[buffered:]
+            raise
+
+    def _flush_pings(self):
+        """Biriken bildirimleri iz tablosuna ekle, son konumları güncelle"""
+        pings = self.env.cr.precommit.data.pop(PING_BUFFER_KEY, [])
+        if not pings:
+            return
+
+        self.env.cr.execute(
+            SQL(
+                "INSERT INTO qcommerce_courier_track (delivery_id, latitude, longitude, recorded_at) VALUES %s",
+                SQL(", ").join(SQL("(%s, %s, %s, %s)", *ping) for ping in pings),
+            )
+        )
+
+        latest = {}
+        for ping in sorted(pings, key=lambda p: p[3]):
+            latest[ping[0]] = ping
+        self.env["qcommerce.courier.position"]._upsert_latest(list(latest.values()))
+
+    @api.model
+    def _cron_purge_track(self):
+        """Saklama süresini aşan iz kayıtlarını sil"""
+        limit_date = fields.Datetime.now() - timedelta(days=TRACK_RETENTION_DAYS)
+        self.env.cr.execute(
+            SQL("DELETE FROM qcommerce_courier_track WHERE recorded_at < %s", limit_date)
+        )
+        _logger.info(f"{self.env.cr.rowcount} kurye konum izi silindi")
+
+
+class QCommerceCourierPosition(models.Model):
+    """Kuryenin Son Konumu (teslimat başına tek satır)"""
+
+    _name = "qcommerce.courier.position"
+    _description = "Q-Commerce Kurye Son Konumu"
+    _rec_name = "delivery_id"
+    _log_access = False
+
+    delivery_id = fields.Many2one(
+        "qcommerce.delivery", "Teslimat", required=True, ondelete="cascade", readonly=True
+    )
+    latitude = fields.Float("Enlem", digits=(10, 7), readonly=True)
+    longitude = fields.Float("Boylam", digits=(10, 7), readonly=True)
+    recorded_at = fields.Datetime("Konum Zamanı", readonly=True)
+
+    _constraint_delivery_unique = models.Constraint(
+        "UNIQUE(delivery_id)",
+        "Bir teslimat için tek son konum tutulur!",
+    )
+
+    @api.model
+    def _upsert_latest(self, pings: list):
+        """
+        Son konumları tek sorguda yaz
+
+        Daha eski zamanlı bir bildirim mevcut konumun üzerine yazılmaz.
+        """
+        if not pings:
+            return
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO qcommerce_courier_position (delivery_id, latitude, longitude, recorded_at)
+                VALUES %s
+                ON CONFLICT (delivery_id) DO UPDATE
+                   SET latitude = EXCLUDED.latitude,
+                       longitude = EXCLUDED.longitude,
+                       recorded_at = EXCLUDED.recorded_at
+                 WHERE qcommerce_courier_position.recorded_at IS NULL
+                    OR qcommerce_courier_position.recorded_at <= EXCLUDED.recorded_at
+                """,
+                SQL(", ").join(SQL("(%s, %s, %s, %s)", *ping) for ping in pings),
+            )
+        )
+        self.invalidate_model()
+        self.env["qcommerce.delivery"].invalidate_model(
+            ["courier_latitude", "courier_longitude", "courier_position_date"]
+        )
@@ -8,9 +8,13 @@ import logging
 
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+# Sevkiyat ekranında listelenen (devam eden) teslimat durumları
+ACTIVE_DELIVERY_STATUSES = ("waiting", "assigned", "arrived", "in_progress")
+
 
 class QCommerceDelivery(models.Model):
     """Q-Commerce Teslimat"""
@@ -51,8 +55,18 @@ class QCommerceDelivery(models.Model):
     courier_name = fields.Char("Kurye Adı", tracking=True)
     courier_phone = fields.Char("Kurye Telefonu")
     courier_vehicle = fields.Char("Araç Bilgisi")
-    courier_latitude = fields.Float("Kurye Enlem")
-    courier_longitude = fields.Float("Kurye Boylam", help="Real-time konum")
+    courier_latitude = fields.Float(
+        "Kurye Enlem", digits=(10, 7), compute="_compute_courier_position"
+    )
+    courier_longitude = fields.Float(
+        "Kurye Boylam",
+        digits=(10, 7),
+        compute="_compute_courier_position",
+        help="Real-time konum",
+    )
+    courier_position_date = fields.Datetime(
+        "Son Konum Zamanı", compute="_compute_courier_position"
+    )
 
     # ==================== Tarihler ====================
 
@@ -69,12 +83,16 @@ class QCommerceDelivery(models.Model):
         compute="_compute_actual_delivery_minutes",
         store=True,
     )
+    remaining_minutes = fields.Integer(
+        "Kalan Süre (Dakika)", compute="_compute_dispatch_status"
+    )
+    delayed = fields.Boolean("Gecikmiş", compute="_compute_dispatch_status")
 
     # ==================== İlişkiler ====================
 
     order_id = fields.Many2one("qcommerce.order", "Sipariş", required=True)
     channel_id = fields.Many2one(
-        "qcommerce.channel", "Kanal", related="order_id.channel_id", store=True
+        "qcommerce.channel", "Kanal", related="order_id.channel_id", store=True, index=True
     )
 
     company_id = fields.Many2one(
@@ -93,6 +111,28 @@ class QCommerceDelivery(models.Model):
             else:
                 delivery.actual_delivery_minutes = 0
 
+    def _compute_courier_position(self):
+        """Son konumu teslimat kaydına yazmadan, tek sorguda oku"""
+        positions = {
+            position.delivery_id.id: position
+            for position in self.env["qcommerce.courier.position"].sudo().search(
+                [("delivery_id", "in", [rid for rid in self.ids if rid])]
+            )
+        }
+        for delivery in self:
+            position = positions.get(delivery.id)
+            delivery.courier_latitude = position.latitude if position else 0.0
+            delivery.courier_longitude = position.longitude if position else 0.0
+            delivery.courier_position_date = position.recorded_at if position else False
+
+    def _compute_dispatch_status(self):
+        """Kalan süre / gecikme; tüm kayıtlar için tek sorgu"""
+        status = self._get_dispatch_status([("id", "in", [rid for rid in self.ids if rid])])
+        for delivery in self:
+            values = status.get(delivery.id, {})
+            delivery.remaining_minutes = values.get("remaining_minutes", 0)
+            delivery.delayed = values.get("is_delayed", False)
+
     # ==================== Durum Değişiklikleri ====================
 
     def action_assign_courier(self, courier_data: dict):
@@ -134,33 +174,115 @@ class QCommerceDelivery(models.Model):
 
     # ==================== Yardımcı Metodlar ====================
 
-    def update_courier_location(self, latitude: float, longitude: float):
-        """Kurye konumunu güncelle (Real-time tracking)"""
-        self.write(
-            {
-                "courier_latitude": latitude,
-                "courier_longitude": longitude,
-            }
+    def update_courier_location(self, latitude: float, longitude: float, recorded_at=None):
+        """
+        Kurye konumunu güncelle (Real-time tracking)
+
+        Teslimat kaydı yazılmaz; konum iz tablosuna eklenmek üzere
+        biriktirilir ve commit öncesinde toplu yazılır.
+        """
+        Track = self.env["qcommerce.courier.track"].sudo()
+        for delivery in self:
+            Track._buffer_ping(delivery.id, latitude, longitude, recorded_at)
+
+    @api.model
+    def _get_dispatch_status(self, domain=None) -> dict:
+        """
+        Teslimatların kalan süre, gecikme ve son konum bilgisi
+
+        Varsayılan olarak devam eden tüm teslimatlar; sonuç tek SQL
+        sorgusuyla hesaplanır (sevkiyat ekranı için).
+
+        :return: {teslimat_id: {"remaining_minutes", "is_delayed", "latitude",
+                  "longitude", "position_date"}}
+        """
+        if domain is None:
+            domain = [("status", "in", ACTIVE_DELIVERY_STATUSES)]
+        self.flush_model(
+            [
+                "requested_date",
+                "delivered_date",
+                "estimated_delivery_minutes",
+                "actual_delivery_minutes",
+            ]
+        )
+        query = self._search(domain)
+        now = fields.Datetime.now()
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT d.id,
+                       CASE
+                           WHEN d.delivered_date IS NOT NULL
+                                OR COALESCE(d.estimated_delivery_minutes, 0) = 0 THEN 0
+                           ELSE GREATEST(
+                               0,
+                               d.estimated_delivery_minutes - TRUNC(
+                                   EXTRACT(EPOCH FROM (%(now)s - COALESCE(d.requested_date, %(now)s))) / 60
+                               )::int
+                           )
+                       END AS remaining_minutes,
+                       d.delivered_date IS NOT NULL AS delivered,
+                       COALESCE(d.actual_delivery_minutes, 0) > COALESCE(d.estimated_delivery_minutes, 0)
+                           AS late_delivered,
+                       p.latitude,
+                       p.longitude,
+                       p.recorded_at
+                  FROM qcommerce_delivery d
+             LEFT JOIN qcommerce_courier_position p ON p.delivery_id = d.id
+                 WHERE d.id IN (%(ids)s)
+                """,
+                now=now,
+                ids=query.subselect(),
+            )
         )
+        result = {}
+        for row in self.env.cr.dictfetchall():
+            result[row["id"]] = {
+                "remaining_minutes": row["remaining_minutes"],
+                "is_delayed": (
+                    row["late_delivered"] if row["delivered"] else row["remaining_minutes"] <= 0
+                ),
+                "latitude": row["latitude"] or 0.0,
+                "longitude": row["longitude"] or 0.0,
+                "position_date": row["recorded_at"],
+            }
+        return result
+
+    @api.model
+    def get_dispatch_board(self) -> list:
+        """Sevkiyat ekranı: devam eden teslimatlar, kalan süreye göre sıralı"""
+        status = self._get_dispatch_status()
+        deliveries = self.browse(list(status))
+        board = []
+        for delivery in deliveries:
+            values = status[delivery.id]
+            board.append(
+                {
+                    "id": delivery.id,
+                    "name": delivery.name,
+                    "order": delivery.order_id.display_name,
+                    "channel": delivery.channel_id.name,
+                    "status": delivery.status,
+                    "courier_name": delivery.courier_name,
+                    "remaining_minutes": values["remaining_minutes"],
+                    "is_delayed": values["is_delayed"],
+                    "latitude": values["latitude"],
+                    "longitude": values["longitude"],
+                    "position_date": fields.Datetime.to_string(values["position_date"])
+                    if values["position_date"]
+                    else False,
+                }
+            )
+        board.sort(key=lambda item: (not item["is_delayed"], item["remaining_minutes"]))
+        return board
 
     def get_delivery_time_remaining(self) -> int:
         """Kalan teslimat süresini dakika cinsinden döndür"""
-        if self.delivered_date:
-            return 0
-
-        if self.estimated_delivery_minutes:
-            elapsed = (
-                fields.Datetime.now() - (self.requested_date or fields.Datetime.now())
-            ).total_seconds() / 60
-            remaining = max(0, self.estimated_delivery_minutes - int(elapsed))
-            return remaining
-
-        return self.estimated_delivery_minutes or 0
+        self.ensure_one()
+        return self._get_dispatch_status([("id", "=", self.id)])[self.id]["remaining_minutes"]
 
     def is_delayed(self) -> bool:
         """Teslimat gecikmiş mi?"""
-        if self.delivered_date:
-            return self.actual_delivery_minutes > (self.estimated_delivery_minutes or 0)
-
-        remaining = self.get_delivery_time_remaining()
-        return remaining <= 0
+        self.ensure_one()
+        return self._get_dispatch_status([("id", "=", self.id)])[self.id]["is_delayed"]
@@ -4,14 +4,23 @@ Q-Commerce Hızlı Teslimat Siparişi
 Getir, Yemeksepeti, Vigo gibi platformlardan gelen siparişleri temsil eder.
 """
 
+from datetime import timedelta, timezone
 import json
 import logging
+import time
 
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 _logger = logging.getLogger(__name__)
 
+# Hazırlık aşamasındaki sipariş durumları (sonrası teslimat aşaması)
+PREPARATION_STATUSES = ("pending", "confirmed", "preparing")
+
+# SLA değerlendirmeleri arasındaki süre (saniye)
+SLA_EVAL_INTERVAL = 30
+
 
 class QCommerceOrder(models.Model):
     """Q-Commerce Siparişi"""
@@ -25,6 +34,9 @@ class QCommerceOrder(models.Model):
         'unique(platform_order_id)',
         'Bu platform sipariş ID zaten mevcut!',
     )
+    _active_orders_idx = models.Index(
+        "(channel_id, order_date) WHERE status NOT IN ('delivered', 'cancelled')"
+    )
 
     # ==================== Temel Alanlar ====================
 
@@ -54,6 +66,46 @@ class QCommerceOrder(models.Model):
     confirmed_date = fields.Datetime("Onay Tarihi")
     ready_date = fields.Datetime("Hazır Tarihi")
     delivered_date = fields.Datetime("Teslimat Tarihi")
+    received_date = fields.Datetime("Alım Zamanı", help="Siparişin platformdan alındığı an")
+
+    # ==================== Aşama Süreleri (SLA) ====================
+
+    intake_latency = fields.Float(
+        "Alım Süresi (sn)",
+        aggregator="avg",
+        readonly=True,
+        help="Platformda oluşturulmasından Odoo'ya alınmasına kadar geçen süre",
+    )
+    processing_latency = fields.Float(
+        "Kayıt Süresi (sn)",
+        aggregator="avg",
+        readonly=True,
+        help="Alımdan siparişin kaydedilmesine kadar geçen süre",
+    )
+    accept_latency = fields.Float(
+        "Onay Süresi (sn)",
+        aggregator="avg",
+        readonly=True,
+        help="Platformda oluşturulmasından onaylanmasına kadar geçen toplam süre",
+    )
+    sla_state = fields.Selection(
+        [
+            ("on_time", "Zamanında"),
+            ("at_risk", "Riskli"),
+            ("late", "Gecikmiş"),
+        ],
+        "SLA Durumu",
+        readonly=True,
+        help="Periyodik SLA değerlendirmesinin son sonucu",
+    )
+    sla_deadline = fields.Datetime(
+        "SLA Bitişi",
+        readonly=True,
+        help="Bulunulan aşamanın (hazırlık/teslimat) bitmesi gereken an",
+    )
+    sla_remaining_minutes = fields.Integer(
+        "SLA Kalan (Dakika)", compute="_compute_sla_remaining_minutes"
+    )
 
     # ==================== Müşteri Bilgileri ====================
 
@@ -93,7 +145,7 @@ class QCommerceOrder(models.Model):
 
     # ==================== İlişkiler ====================
 
-    channel_id = fields.Many2one("qcommerce.channel", "Kanal", required=True)
+    channel_id = fields.Many2one("qcommerce.channel", "Kanal", required=True, index=True)
     sale_order_id = fields.Many2one("sale.order", "Satış Siparişi")
     delivery_id = fields.Many2one("qcommerce.delivery", "Teslimat")
 
@@ -107,44 +159,189 @@ class QCommerceOrder(models.Model):
 
     # ==================== Hesaplama Alanları ====================
 
-    @api.depends("customer_name", "customer_phone")
+    @api.depends("customer_name", "customer_phone", "company_id")
     def _compute_partner_id(self):
-        """Müşteri partner kaydını otomatik oluştur/bul"""
+        """
+        Müşteri partner kaydını bul/oluştur
+
+        Eşleştirme ada göre değil, şirket bazında normalize telefona göre
+        yapılır; bir sayfadaki tüm siparişler tek seferde çözülür.
+        """
+        partner_ids = self.env["res.partner"]._qcommerce_resolve_partners(
+            [
+                (
+                    order.company_id.id,
+                    order.customer_phone,
+                    order.customer_name,
+                    order.customer_email,
+                )
+                for order in self
+            ]
+        )
+        for order, partner_id in zip(self, partner_ids):
+            order.partner_id = partner_id
+
+    @api.depends("sla_deadline", "status")
+    def _compute_sla_remaining_minutes(self):
+        """SLA bitişine kalan süre (aşılmışsa negatif)"""
+        now = fields.Datetime.now()
         for order in self:
-            if not order.customer_name:
-                order.partner_id = None
-                continue
-
-            partner = self.env["res.partner"].search(
-                [
-                    ("name", "=", order.customer_name),
-                    ("phone", "=", order.customer_phone),
-                ],
-                limit=1,
+            if order.sla_deadline and order.status not in ("delivered", "cancelled"):
+                order.sla_remaining_minutes = int(
+                    (order.sla_deadline - now).total_seconds() // 60
+                )
+            else:
+                order.sla_remaining_minutes = 0
+
+    # ==================== SLA Değerlendirme ====================
+
+    @api.model
+    def _evaluate_sla(self) -> int:
+        """
+        Devam eden tüm siparişlerin SLA durumunu tek SQL ile güncelle
+
+        Hazırlık aşamasında bitiş sipariş tarihi + kanalın hazırlık süresi,
+        sonrasında sipariş tarihi + maksimum teslimat süresidir. Bitişe
+        kanalın uyarı süresinden az kalan ya da kurye tahmini bitişi aşan
+        siparişler riskli, bitişi geçenler gecikmiş sayılır. Yalnızca durumu
+        veya bitişi değişen satırlar yazılır; bildirim yalnızca SLA durumu
+        riskli ya da gecikmiş olarak değiştiğinde üretilir.
+
+        :return: Durumu değişen sipariş sayısı
+        """
+        self.env["qcommerce.channel"].flush_model(
+            ["preparation_time_minutes", "max_delivery_time_minutes", "sla_warning_minutes"]
+        )
+        self.flush_model(["status", "order_date", "ready_date", "channel_id", "delivery_id"])
+        self.env["qcommerce.delivery"].flush_model(
+            ["status", "requested_date", "estimated_delivery_minutes"]
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH evaluated AS (
+                    SELECT o.id,
+                           o.sla_state AS previous_state,
+                           o.status IN %(preparation)s AS preparing,
+                           o.order_date + make_interval(mins => CASE
+                               WHEN o.status IN %(preparation)s THEN c.preparation_time_minutes
+                               ELSE c.max_delivery_time_minutes
+                           END) AS deadline,
+                           make_interval(mins => COALESCE(c.sla_warning_minutes, 0)) AS warning,
+                           CASE
+                               WHEN d.status NOT IN ('delivered', 'cancelled')
+                                    AND d.estimated_delivery_minutes > 0
+                               THEN COALESCE(d.requested_date, o.ready_date, o.order_date)
+                                    + make_interval(mins => d.estimated_delivery_minutes)
+                           END AS courier_eta
+                      FROM qcommerce_order o
+                      JOIN qcommerce_channel c ON c.id = o.channel_id
+                 LEFT JOIN qcommerce_delivery d ON d.id = o.delivery_id
+                     WHERE o.status NOT IN ('delivered', 'cancelled')
+                ), classified AS (
+                    SELECT id,
+                           previous_state,
+                           deadline,
+                           CASE
+                               WHEN deadline < %(now)s THEN 'late'
+                               WHEN deadline <= %(now)s + warning
+                                    OR (NOT preparing AND courier_eta > deadline) THEN 'at_risk'
+                               ELSE 'on_time'
+                           END AS state
+                      FROM evaluated
+                )
+                UPDATE qcommerce_order o
+                   SET sla_state = k.state,
+                       sla_deadline = k.deadline
+                  FROM classified k
+                 WHERE o.id = k.id
+                   AND (o.sla_state, o.sla_deadline) IS DISTINCT FROM (k.state, k.deadline)
+             RETURNING o.id, k.previous_state, k.state
+                """,
+                preparation=PREPARATION_STATUSES,
+                now=fields.Datetime.now(),
             )
-
-            if not partner:
-                partner = self.env["res.partner"].create(
+        )
+        transitions = self.env.cr.fetchall()
+        self.invalidate_model(["sla_state", "sla_deadline", "sla_remaining_minutes"])
+
+        alerts = {
+            order_id: state
+            for order_id, previous_state, state in transitions
+            if state != "on_time" and previous_state != state
+        }
+        if alerts:
+            self.browse(list(alerts))._notify_sla_transition(alerts)
+            _logger.info(f"SLA: {len(transitions)} sipariş durum değiştirdi, {len(alerts)} uyarı")
+        return len(transitions)
+
+    def _notify_sla_transition(self, states: dict):
+        """
+        Riskli/gecikmiş duruma geçen siparişleri bildir
+
+        Sohbete not düşülür; gecikmede kanalın SLA sorumlusuna aktivite açılır.
+        """
+        labels = dict(self._fields["sla_state"].selection)
+        activity_type = self.env.ref("mail.mail_activity_data_warning", raise_if_not_found=False)
+        model_id = self.env["ir.model"]._get_id(self._name)
+        activities = []
+        for order in self:
+            state = states[order.id]
+            phase = "Hazırlık" if order.status in PREPARATION_STATUSES else "Teslimat"
+            order.message_post(
+                body=f"{phase} SLA durumu: {labels[state]} (bitiş: {order.sla_deadline} UTC)",
+                subtype_xmlid="mail.mt_note",
+            )
+            if state == "late" and activity_type and order.channel_id.sla_user_id:
+                activities.append(
                     {
-                        "name": order.customer_name,
-                        "phone": order.customer_phone,
-                        "email": order.customer_email,
+                        "res_model_id": model_id,
+                        "res_id": order.id,
+                        "activity_type_id": activity_type.id,
+                        "summary": f"{phase} süresi aşıldı",
+                        "user_id": order.channel_id.sla_user_id.id,
+                        "date_deadline": fields.Date.context_today(self),
                     }
                 )
-
-            order.partner_id = partner
+        if activities:
+            self.env["mail.activity"].create(activities)
+
+    @api.model
+    def _cron_evaluate_sla(self):
+        """
+        SLA değerlendirmesi
+
+        Tek değerlendirme yapıp commit eder ve cron'u SLA_EVAL_INTERVAL
+        saniye sonrasına yeniden tetikler; cron işçisi beklerken tutulmaz.
+        Dakikalık zamanlama yalnızca yedektir.
+        """
+        try:
+            self._evaluate_sla()
+            self.env.cr.commit()
+        except Exception as e:
+            self.env.cr.rollback()
+            _logger.error(f"SLA değerlendirmesi başarısız: {str(e)}")
+        self.env.ref("mobilsoft_qcommerce_core.ir_cron_qcommerce_sla_evaluation")._trigger(
+            at=fields.Datetime.now() + timedelta(seconds=SLA_EVAL_INTERVAL)
+        )
 
     # ==================== Durum Değişiklikleri ====================
 
     def action_confirm(self):
-        """Siparişi onayla"""
-        self.write(
-            {
-                "status": "confirmed",
-                "confirmed_date": fields.Datetime.now(),
-            }
-        )
-        _logger.info(f"Sipariş {self.name} onaylandı")
+        """Siparişi onayla ve platform → onay süresini kaydet"""
+        now = fields.Datetime.now()
+        now_ts = time.time()
+        for order in self:
+            order.write(
+                {
+                    "status": "confirmed",
+                    "confirmed_date": now,
+                    "accept_latency": max(
+                        now_ts - order.order_date.replace(tzinfo=timezone.utc).timestamp(), 0
+                    ),
+                }
+            )
+        _logger.info(f"Sipariş {', '.join(self.mapped('name'))} onaylandı")
 
     def action_mark_preparing(self):
         """Siparişi hazırlanıyor olarak işaretle"""
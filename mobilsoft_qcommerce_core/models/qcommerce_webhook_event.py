@@ -0,0 +1,36 @@
+from odoo import fields, models
+
+
+class QCommerceWebhookEvent(models.Model):
+    """Q-Commerce Webhook Gelen Kutusu"""
+
+    _name = "qcommerce.webhook.event"
+    _inherit = ["webhook.inbox.mixin"]
+    _description = "Q-Commerce Webhook Olayı"
+
+    _order_ref_keys = ("orderId", "order_id", "orderNumber", "platformOrderId")
+    _order_pull_event_types = ("order.created",)
+    _inbox_cron_xmlid = "mobilsoft_qcommerce_core.ir_cron_qcommerce_webhook_inbox"
+
+    channel_id = fields.Many2one(
+        "qcommerce.channel",
+        "Kanal",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+
+    _constraint_channel_dedup_key_uniq = models.Constraint(
+        "UNIQUE(channel_id, dedup_key)",
+        "Bu olay zaten alındı!",
+    )
+
+    def _process_event(self, connector):
+        # Konum bildirimleri precommit tamponunda; savepoint ile birlikte atılmalı
+        with self.env["qcommerce.courier.track"]._ping_savepoint():
+            super()._process_event(connector)
+
+    def _pull_orders(self, connector):
+        # Sipariş imlecinden itibaren tek çekim
+        connector.intake_orders()
+        return True
@@ -5,7 +5,7 @@ Getir Çarşı ve Getir Yemek entegrasyonu
 Documentation: https://integrations.getir.com/
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 from typing import Any, Dict, List, Optional
 
@@ -66,99 +66,42 @@ class GetirConnector(BaseQCommerceConnector):
             _logger.error(f"Getir connection test failed: {str(e)}")
             return False
 
-    def sync_orders(self, last_sync: datetime | None = None) -> dict[str, Any]:
-        """
-        Getir'den siparişleri senkronize et
-
-        Son senkronizasyondan beri gelen tüm siparişleri getir
-        """
-        sync_log = self._create_sync_log("sync_orders")
-        created_count = 0
-        updated_count = 0
-        failed_count = 0
-
-        try:
-            _logger.info("Starting Getir order sync")
-
-            if not last_sync:
-                last_sync = datetime.now() - timedelta(hours=24)
-
-            # Getir'den siparişleri getir
-            orders = self._fetch_getir_orders(last_sync)
-
-            for order_data in orders:
-                try:
-                    # Sipariş bilgilerini hazırla
-                    order_dict = {
-                        "name": f"GR-{order_data.get('id')}",
-                        "platform_order_id": str(order_data.get("id")),
-                        "order_date": self._parse_datetime(
-                            order_data.get("createdAt", "")
-                        ),
-                        "customer_name": order_data.get("customer", {}).get("name", ""),
-                        "customer_phone": self._sanitize_phone(
-                            order_data.get("customer", {}).get("phone", "")
-                        ),
-                        "customer_email": order_data.get("customer", {}).get(
-                            "email", ""
-                        ),
-                        "delivery_address": self._format_address(
-                            order_data.get("deliveryAddress", {})
-                        ),
-                        "delivery_zone": order_data.get("deliveryZone", ""),
-                        "latitude": order_data.get("location", {}).get("latitude"),
-                        "longitude": order_data.get("location", {}).get("longitude"),
-                        "amount_subtotal": float(order_data.get("subtotal", 0)),
-                        "amount_delivery": float(order_data.get("deliveryFee", 0)),
-                        "amount_discount": float(order_data.get("discount", 0)),
-                        "amount_total": float(order_data.get("total", 0)),
-                        "payment_method": self._map_payment_method(
-                            order_data.get("paymentMethod")
-                        ),
-                        "notes": order_data.get("notes", ""),
-                        "special_requests": order_data.get("specialRequests", ""),
-                        "status": self._map_status(order_data.get("status")),
-                    }
-
-                    # Siparişi işle
-                    marketplace_order = self._process_qcommerce_order(order_dict)
-
-                    # Sipariş hatlarını oluştur
-                    self._create_order_lines(
-                        marketplace_order, order_data.get("items", [])
-                    )
-
-                    # Getir otomatik sipariş kabulü aktifse, siparişi onayla
-                    if (
-                        self.channel.auto_accept_orders
-                        and marketplace_order.status == "pending"
-                    ):
-                        marketplace_order.action_confirm()
-                        _logger.info(f"Order {marketplace_order.name} auto-confirmed")
-
-                    created_count += 1
-
-                except Exception as e:
-                    _logger.error(
-                        f"Failed to process order {order_data.get('id')}: {str(e)}"
-                    )
-                    failed_count += 1
-
-            # Sync log'u güncelle
-            sync_log.log_success(
-                records_processed=len(orders),
-                records_created=created_count,
-                records_updated=updated_count,
-                records_failed=failed_count,
-            )
-
-            _logger.info(
-                f"Order sync completed: {created_count} created, {failed_count} failed"
-            )
+    def _fetch_orders(self, since: datetime) -> list[dict]:
+        """Getir'den `since` sonrasında oluşturulan siparişleri getir"""
+        return self._fetch_getir_orders(since)
 
-        except Exception as e:
-            _logger.error(f"Order sync failed: {str(e)}")
-            sync_log.log_error(f"Sipariş senkronizasyonu başarısız: {str(e)}")
+    def _prepare_order_vals(self, order_data: dict) -> dict:
+        """Getir siparişini qcommerce.order değerlerine çevir"""
+        return {
+            "name": f"GR-{order_data.get('id')}",
+            "platform_order_id": str(order_data.get("id")),
+            "order_date": self._parse_datetime(
+                order_data.get("createdAt", "")
+            ),
+            "customer_name": order_data.get("customer", {}).get("name", ""),
+            "customer_phone": self._sanitize_phone(
+                order_data.get("customer", {}).get("phone", "")
+            ),
+            "customer_email": order_data.get("customer", {}).get(
+                "email", ""
+            ),
+            "delivery_address": self._format_address(
+                order_data.get("deliveryAddress", {})
+            ),
+            "delivery_zone": order_data.get("deliveryZone", ""),
+            "latitude": order_data.get("location", {}).get("latitude"),
+            "longitude": order_data.get("location", {}).get("longitude"),
+            "amount_subtotal": float(order_data.get("subtotal", 0)),
+            "amount_delivery": float(order_data.get("deliveryFee", 0)),
+            "amount_discount": float(order_data.get("discount", 0)),
+            "amount_total": float(order_data.get("total", 0)),
+            "payment_method": self._map_payment_method(
+                order_data.get("paymentMethod")
+            ),
+            "notes": order_data.get("notes", ""),
+            "special_requests": order_data.get("specialRequests", ""),
+            "status": self._map_status(order_data.get("status")),
+        }
 
     def request_courier(self, order: Any) -> bool:
         """
@@ -341,33 +284,14 @@ class GetirConnector(BaseQCommerceConnector):
 
         return status_map.get(getir_status, "pending")
 
-    def _create_order_lines(self, order: Any, items: list[dict]):
-        """Sipariş hatlarını oluştur"""
-        QCommerceOrderLine = self.env["qcommerce.order.line"]
-
-        for item in items:
-            try:
-                QCommerceOrderLine.create(
-                    {
-                        "order_id": order.id,
-                        "product_name": item.get("name", ""),
-                        "platform_product_id": str(item.get("productId", "")),
-                        "quantity": int(item.get("quantity", 1)),
-                        "unit_price": float(item.get("price", 0)),
-                        "notes": item.get("notes", ""),
-                    }
-                )
-            except Exception as e:
-                _logger.error(f"Failed to create order line: {str(e)}")
-
     def _process_webhook(self, webhook_data: dict) -> dict:
         """Getir webhook'unu işle"""
         try:
             event_type = webhook_data.get("eventType")
 
             if event_type == "order.created":
-                # Yeni sipariş oluşturuldu
-                self.sync_orders()
+                # Yeni sipariş oluşturuldu: imleçten itibaren hemen çek
+                self.intake_orders()
                 return {"status": "processed"}
 
             elif event_type == "order.status_changed":
@@ -418,7 +342,10 @@ class GetirConnector(BaseQCommerceConnector):
 
                 if order and order.delivery_id:
                     order.delivery_id.update_courier_location(
-                        location.get("latitude", 0), location.get("longitude", 0)
+                        location.get("latitude", 0),
+                        location.get("longitude", 0),
+                        recorded_at=self._get_event_time(location)
+                        or self._get_event_time(webhook_data),
                     )
 
                 return {"status": "processed"}
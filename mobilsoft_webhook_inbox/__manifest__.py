@@ -0,0 +1,21 @@
+{
+    "name": "MobilSoft Webhook Gelen Kutusu",
+    "version": "19.0.1.0.0",
+    "category": "Hidden",
+    "summary": "Pazaryeri ve hızlı teslimat webhook'ları için ortak gelen kutusu",
+    "author": "MobilSoft",
+    "website": "https://www.jokergrubu.com",
+    "depends": ["base"],
+    "data": [],
+    "installable": True,
+    "application": False,
+    "license": "LGPL-3",
+    "description": """
+    Webhook olaylarını işlenmeden saklayan ve cron ile sırayla işleyen
+    ortak soyut model (webhook.inbox.mixin).
+
+    - Olay kimliği / payload özeti ile tekrar eden olayların elenmesi
+    - Sipariş bazında sıranın korunması
+    - Sipariş oluşturma olaylarının tek toplu çekimle karşılanması
+    """,
+}
@@ -0,0 +1 @@
+from . import webhook_inbox_mixin
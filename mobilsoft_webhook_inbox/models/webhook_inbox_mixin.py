@@ -0,0 +1,264 @@
+import hashlib
+import hmac
+import json
+import logging
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Kalıcı olarak 'failed' durumuna düşmeden önceki deneme sayısı
+WEBHOOK_MAX_ATTEMPTS = 5
+
+# Cron başına işlenecek en fazla olay
+WEBHOOK_BATCH_SIZE = 200
+
+# Platform olay kimliğinin aranacağı payload anahtarları
+EVENT_ID_KEYS = ("eventId", "event_id", "webhookId", "messageId")
+
+# Ham gövdenin HMAC-SHA256 imzası / imza göndermeyen platformlar için anahtar
+SIGNATURE_HEADER = "X-Webhook-Signature"
+SECRET_HEADER = "X-Webhook-Secret"
+
+
+class WebhookInboxMixin(models.AbstractModel):
+    """
+    Webhook Gelen Kutusu
+
+    Webhook istekleri işlenmeden olduğu gibi buraya yazılır (yalnızca
+    ekleme); aynı olay tekrar gelirse dedup_key sayesinde yok sayılır.
+    Cron, bekleyen olayları geliş sırasıyla ve sipariş bazında sırayı
+    koruyarak işler.
+
+    Alt modeller channel_id alanını, UNIQUE(channel_id, dedup_key)
+    kısıtını ve aşağıdaki sınıf özniteliklerini tanımlar.
+    """
+
+    _name = "webhook.inbox.mixin"
+    _description = "Webhook Gelen Kutusu"
+    _order = "id desc"
+    _rec_name = "dedup_key"
+
+    # Sıralamanın korunacağı sipariş kimliği anahtarları
+    _order_ref_keys = ("orderId", "order_id", "orderNumber")
+    # Tek bir imleç tabanlı sipariş çekimiyle karşılanan olay tipleri
+    _order_pull_event_types = ()
+    # Gelen kutusunu işleyen cron (modül.xml_id)
+    _inbox_cron_xmlid = None
+
+    event_type = fields.Char("Olay Tipi", readonly=True)
+    dedup_key = fields.Char("Tekil Anahtar", required=True, readonly=True)
+    order_ref = fields.Char("Sipariş Referansı", readonly=True, index=True)
+    payload = fields.Text("Payload (JSON)", readonly=True)
+    state = fields.Selection(
+        [
+            ("pending", "Bekliyor"),
+            ("done", "İşlendi"),
+            ("failed", "Başarısız"),
+        ],
+        string="Durum",
+        default="pending",
+        required=True,
+        index=True,
+    )
+    attempt_count = fields.Integer("Deneme", default=0)
+    processed_date = fields.Datetime("İşlenme Zamanı")
+    last_error = fields.Text("Son Hata")
+
+    @api.model
+    def _make_dedup_key(self, payload: dict) -> str:
+        """Platform olay kimliği, yoksa payload'ın SHA-256 özeti"""
+        for key in EVENT_ID_KEYS:
+            if payload.get(key):
+                return f"id:{payload[key]}"
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return "sha256:" + hashlib.sha256(canonical.encode()).hexdigest()
+
+    @api.model
+    def _get_order_ref(self, payload: dict):
+        for key in self._order_ref_keys:
+            if payload.get(key):
+                return str(payload[key])
+        return None
+
+    @api.model
+    def _verify_request(self, secret, httprequest) -> bool:
+        """
+        Webhook isteğinin kanalın gizli anahtarıyla gönderildiğini doğrula
+
+        X-Webhook-Signature varsa ham gövdenin HMAC-SHA256 özeti (hex,
+        isteğe bağlı "sha256=" öneki) karşılaştırılır; yoksa
+        X-Webhook-Secret başlığı anahtarın kendisi olmalıdır. Anahtarı
+        tanımlı olmayan kanalın webhook'ları kabul edilmez.
+        """
+        if not secret:
+            return False
+        signature = httprequest.headers.get(SIGNATURE_HEADER)
+        if signature:
+            expected = hmac.new(
+                secret.encode(), httprequest.get_data(), hashlib.sha256
+            ).hexdigest()
+            return hmac.compare_digest(
+                signature.strip().lower().removeprefix("sha256=").encode(),
+                expected.encode(),
+            )
+        return hmac.compare_digest(
+            httprequest.headers.get(SECRET_HEADER, "").encode(), secret.encode()
+        )
+
+    @api.model
+    def _trigger_inbox_cron(self):
+        self.env.ref(self._inbox_cron_xmlid)._trigger()
+
+    @api.model
+    def enqueue(self, channel, payload: dict) -> bool:
+        """
+        Olayı gelen kutusuna yaz
+
+        Tek bir INSERT ... ON CONFLICT DO NOTHING; tekrar eden olay için
+        hata üretmez.
+
+        :return: Olay yeni ise True, tekrar ise False
+        """
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO %s
+                    (channel_id, event_type, dedup_key, order_ref, payload,
+                     state, attempt_count, create_uid, create_date, write_uid, write_date)
+                VALUES (%s, %s, %s, %s, %s, 'pending', 0, %s, now() at time zone 'UTC',
+                        %s, now() at time zone 'UTC')
+                ON CONFLICT (channel_id, dedup_key) DO NOTHING
+                RETURNING id
+                """,
+                SQL.identifier(self._table),
+                channel.id,
+                payload.get("eventType"),
+                self._make_dedup_key(payload),
+                self._get_order_ref(payload),
+                json.dumps(payload, default=str),
+                self.env.uid,
+                self.env.uid,
+            )
+        )
+        created = bool(self.env.cr.fetchone())
+        if created:
+            self._trigger_inbox_cron()
+        return created
+
+    def _get_payload(self) -> dict:
+        self.ensure_one()
+        try:
+            return json.loads(self.payload or "{}")
+        except json.JSONDecodeError:
+            return {}
+
+    def action_retry(self):
+        """Başarısız olayları yeniden kuyruğa al"""
+        self.filtered(lambda e: e.state == "failed").write(
+            {"state": "pending", "attempt_count": 0}
+        )
+        self._trigger_inbox_cron()
+
+    def _pull_orders(self, connector) -> bool:
+        """
+        Kanalın yeni siparişlerini imleçten itibaren tek seferde çek (hook)
+
+        _order_pull_event_types tanımlayan alt model bunu override eder:
+        çekimi yapıp True döner, başarısız olursa istisna fırlatır (olaylar
+        yeniden denenir). Varsayılan uygulama toplu çekim yapmaz ve False
+        döner; olaylar bu durumda _process_event ile tek tek işlenir.
+        """
+        _logger.warning(
+            "%s toplu sipariş çekimi tanımlamıyor; olaylar tek tek işleniyor",
+            self._name,
+        )
+        return False
+
+    def _process_event(self, connector):
+        """Tek olayı işle; hata, çağıranın savepoint'ini geri alır"""
+        self.ensure_one()
+        connector._process_webhook(self._get_payload())
+
+    def _mark_done(self):
+        self.write(
+            {
+                "state": "done",
+                "processed_date": fields.Datetime.now(),
+                "last_error": False,
+            }
+        )
+
+    def _mark_failed(self, error):
+        for event in self:
+            attempts = event.attempt_count + 1
+            event.write(
+                {
+                    "attempt_count": attempts,
+                    "last_error": str(error),
+                    "state": "failed" if attempts >= WEBHOOK_MAX_ATTEMPTS else "pending",
+                }
+            )
+            _logger.warning(
+                "Webhook olayı işlenemedi (%s, deneme %s): %s",
+                event.dedup_key,
+                attempts,
+                error,
+            )
+
+    def _process_events(self, connector):
+        """
+        Bir kanalın olaylarını id sırasıyla işle
+
+        Sipariş oluşturma olaylarının tamamı tek bir imleç tabanlı çekimle
+        karşılanır; 200 olay 200 ayrı çekim değil, bir çekimdir. Aynı
+        siparişe ait önceki olay işlenemezse sonrakiler bu turda atlanır;
+        sipariş bazında sıra bozulmaz.
+        """
+        events = self.sorted("id")
+        pull_events = events.filtered(
+            lambda e: e.event_type in self._order_pull_event_types
+        )
+        blocked_orders = set()
+        if pull_events:
+            try:
+                with self.env.cr.savepoint():
+                    pulled = self._pull_orders(connector)
+                if pulled:
+                    pull_events._mark_done()
+                else:
+                    pull_events = self.browse()
+            except Exception as e:
+                pull_events._mark_failed(e)
+                blocked_orders.update(ref for ref in pull_events.mapped("order_ref") if ref)
+
+        for event in events - pull_events:
+            if event.order_ref and event.order_ref in blocked_orders:
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    event._process_event(connector)
+                event._mark_done()
+            except Exception as e:
+                event._mark_failed(e)
+                if event.order_ref:
+                    blocked_orders.add(event.order_ref)
+
+    @api.model
+    def _cron_process_inbox(self):
+        """Bekleyen webhook olaylarını kanal bazında toplu işle"""
+        events = self.search(
+            [("state", "=", "pending")], order="id", limit=WEBHOOK_BATCH_SIZE
+        )
+        if len(events) == WEBHOOK_BATCH_SIZE:
+            # Kalanlar için cron'u hemen yeniden tetikle
+            self._trigger_inbox_cron()
+        for channel in events.channel_id:
+            try:
+                connector = channel._get_connector()
+                events.filtered(lambda e: e.channel_id == channel)._process_events(connector)
+                self.env.cr.commit()
+            except Exception as e:
+                self.env.cr.rollback()
+                _logger.error("Kanal %s webhook kuyruğu işlenemedi: %s", channel.name, e)
@@ -2686,14 +2686,30 @@ class XmlProductSource(models.Model):
     # PRICE CALCULATION
     # ══════════════════════════════════════════════════════════════════════════
 
+    def _get_currency_rate(self, currency):
+        """Para biriminin şirket para birimine göre güncel kuru (currency_per_TRY).
+
+        Banka entegrasyonu kuruluysa süreç içi önbellekli kur servisi
+        kullanılır; ürün başına ORM sorgusu yapılmaz.
+        """
+        Currency = self.env['res.currency']
+        if hasattr(Currency, '_get_cached_rate'):
+            return Currency._get_cached_rate(
+                currency.id, self.env.company.id, fields.Date.context_today(self),
+            )
+        return currency.rate
+
     def _usd_to_try(self, amount_usd):
         """USD → TRY dönüşümü (Odoo güncel kuru ile)."""
-        usd = self.env['res.currency'].search([('name', '=', 'USD')], limit=1)
-        try_cur = self.env['res.currency'].search([('name', '=', 'TRY')], limit=1)
-        if not usd or not try_cur or not usd.rate:
+        usd = self.env.ref('base.USD', raise_if_not_found=False)
+        try_cur = self.env.ref('base.TRY', raise_if_not_found=False)
+        if not usd or not try_cur:
+            return amount_usd
+        rate = self._get_currency_rate(usd)
+        if not rate:
             return amount_usd
-        # usd.rate = USD_per_TRY → TRY_per_USD = 1/usd.rate
-        return float(amount_usd) / usd.rate
+        # rate = USD_per_TRY → TRY_per_USD = 1/rate
+        return float(amount_usd) / rate
 
     def _cost_to_company_currency(self, cost_price):
         """Maliyet fiyatını şirket para birimine (TRY) çevir."""
@@ -2706,7 +2722,7 @@ class XmlProductSource(models.Model):
         if self.cost_currency_id.id == company_cur.id:
             return cost
         # Dönüşüm: cost_currency → TRY
-        rate = self.cost_currency_id.rate  # currency_per_TRY
+        rate = self._get_currency_rate(self.cost_currency_id)  # currency_per_TRY
         if not rate:
             return cost
         return cost / rate  # cost / (USD_per_TRY) = cost_TRY